@@ -6,10 +6,10 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(ROOT_DIR)
 
 import streamlit as st
-import pandas as pd
-from pathlib import Path
 
+from app.data_access import load_table
 from src.config.settings import PREDICTIONS_DIR
+from src.utils.io import table_exists
 
 st.set_page_config(
     page_title="Football Predictor – Primeira Liga",
@@ -23,10 +23,8 @@ with open("app/assets/style.css") as f:
 st.title("⚽ Football Predictor – Primeira Liga Portuguesa")
 st.subheader("Previsões estatísticas baseadas em Machine Learning")
 
-pred_path = Path(PREDICTIONS_DIR) / "predictions_next_round.csv"
-
-if pred_path.exists():
-    df = pd.read_csv(pred_path)
+if table_exists(PREDICTIONS_DIR, "predictions_next_round"):
+    df = load_table(PREDICTIONS_DIR, "predictions_next_round")
     st.success("Previsões da próxima jornada carregadas com sucesso")
     st.dataframe(df)
 else:
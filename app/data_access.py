@@ -0,0 +1,100 @@
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from src.config.settings import PROCESSED_DIR
+from src.features.team_aggregates import KEY_COLUMNS, TABLE_NAME as TEAM_AGGREGATES
+from src.utils.io import Filter, read_table, read_table_page, table_exists, table_version
+
+
+# Camada de dados partilhada pelas páginas da app.
+#
+# O Streamlit volta a correr o script inteiro em cada interação (ex.: mudar
+# a equipa no selectbox). As tabelas ficam em cache (st.cache_data, comum a
+# todas as sessões) com chave (caminho, colunas, versão do ficheiro): só são
+# lidas outra vez do disco quando os dados são atualizados.
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _load_table(directory: str, name: str, columns: Optional[Tuple[str, ...]],
+                filters: Optional[Tuple[Filter, ...]], version: tuple) -> pd.DataFrame:
+    # `version` só serve de chave: um ficheiro novo invalida a entrada
+    return read_table(
+        Path(directory),
+        name,
+        columns=list(columns) if columns else None,
+        filters=list(filters) if filters else None,
+    )
+
+
+def load_table(
+    directory: Path,
+    name: str,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[List[Filter]] = None,
+) -> pd.DataFrame:
+    """
+    read_table com cache; `columns` e `filters` (ex.: uma época) limitam o
+    que é lido e guardado.
+    """
+    return _load_table(
+        str(directory),
+        name,
+        tuple(columns) if columns else None,
+        _freeze(filters),
+        table_version(directory, name),
+    )
+
+
+def _freeze(filters: Optional[List[Filter]]) -> Optional[Tuple[Filter, ...]]:
+    """Filtros como tuplos (chave de cache)."""
+    if not filters:
+        return None
+    return tuple((col, op, tuple(value) if op == "in" else value) for col, op, value in filters)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _load_page(directory: str, name: str, columns: Tuple[str, ...], filters, any_of,
+               offset: int, limit: int, version: tuple) -> Tuple[pd.DataFrame, int]:
+    return read_table_page(
+        Path(directory),
+        name,
+        columns=list(columns),
+        filters=list(filters or []),
+        any_of=list(any_of or []),
+        offset=offset,
+        limit=limit,
+    )
+
+
+def load_page(
+    directory: Path,
+    name: str,
+    columns: Sequence[str],
+    filters: Optional[List[Filter]] = None,
+    any_of: Optional[List[Filter]] = None,
+    offset: int = 0,
+    limit: int = 50,
+) -> Tuple[pd.DataFrame, int]:
+    """read_table_page com cache: (linhas da página, nº total de linhas filtradas)."""
+    return _load_page(
+        str(directory), name, tuple(columns), _freeze(filters), _freeze(any_of),
+        offset, limit, table_version(directory, name),
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_team_aggregates(version: tuple) -> pd.DataFrame:
+    table = read_table(PROCESSED_DIR, TEAM_AGGREGATES)
+    return table.set_index(KEY_COLUMNS).sort_index()
+
+
+def load_team_aggregates() -> pd.DataFrame:
+    """Agregados por equipa/época indexados por (team, season, venue)."""
+    return _load_team_aggregates(table_version(PROCESSED_DIR, TEAM_AGGREGATES))
+
+
+def tables_exist(directory: Path, names: List[str]) -> bool:
+    return all(table_exists(directory, name) for name in names)
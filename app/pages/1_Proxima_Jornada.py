@@ -1,18 +1,26 @@
 import streamlit as st
-import pandas as pd
-from pathlib import Path
 
+from app.data_access import load_table
 from src.config.settings import PREDICTIONS_DIR
+from src.domain.business_rules import MARKET_LABELS, derive_signals
+from src.utils.io import table_exists
 
 st.title("📅 Próxima Jornada – Previsões")
 
-pred_path = Path(PREDICTIONS_DIR) / "predictions_next_round.csv"
-
-if not pred_path.exists():
+if not table_exists(PREDICTIONS_DIR, "predictions_next_round"):
     st.error("Ainda não existem previsões. Corre generate_predictions.py")
     st.stop()
 
-df = pd.read_csv(pred_path)
+df = load_table(PREDICTIONS_DIR, "predictions_next_round", columns=[
+    "match_id", "home_team", "away_team",
+    "predicted_corners_home", "predicted_corners_away",
+    "predicted_shots_home", "predicted_shots_away",
+    "predicted_yellow_cards_home", "predicted_yellow_cards_away",
+])
+
+# Sinais over/under (Poisson) para todos os jogos, mercados e linhas de uma vez
+signals = derive_signals(df)
+signals = signals[signals["suggestion"] != "none"]
 
 for _, row in df.iterrows():
     st.markdown(f"### {row['home_team']} vs {row['away_team']}")
@@ -28,4 +36,14 @@ for _, row in df.iterrows():
         st.metric("Remates (Fora)", f"{row['predicted_shots_away']:.2f}")
         st.metric("Cartões (Fora)", f"{row['predicted_yellow_cards_away']:.2f}")
 
+    match_signals = signals[signals["match_id"] == row["match_id"]]
+    if not match_signals.empty:
+        with st.expander("Sinais over/under"):
+            st.dataframe(
+                match_signals.assign(market=match_signals["market"].map(MARKET_LABELS))[
+                    ["market", "line", "expected", "p_over", "p_under", "suggestion"]
+                ].round(3),
+                hide_index=True,
+            )
+
     st.markdown("---")
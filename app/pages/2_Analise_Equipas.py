@@ -1,30 +1,47 @@
-import streamlit as st
 import pandas as pd
-from pathlib import Path
+import streamlit as st
 
-from src.config.settings import RAW_DIR
+from app.data_access import load_table, load_team_aggregates, tables_exist
+from src.config.settings import PROCESSED_DIR, RAW_DIR
+from src.features.team_aggregates import STAT_METRICS, TABLE_NAME as TEAM_AGGREGATES
 
 st.title("📊 Análise de Equipas")
 
-matches_path = Path(RAW_DIR) / "matches.csv"
-stats_path = Path(RAW_DIR) / "match_stats.csv"
-
-if not matches_path.exists() or not stats_path.exists():
-    st.error("Faltam dados brutos. Corre update_data.py")
+if not tables_exist(RAW_DIR, ["matches"]) or not tables_exist(PROCESSED_DIR, [TEAM_AGGREGATES]):
+    st.error("Faltam dados. Corre update_data.py e build_features.py")
     st.stop()
 
-matches = pd.read_csv(matches_path)
-stats = pd.read_csv(stats_path)
+aggregates = load_team_aggregates()
+
+seasons = sorted(aggregates.index.get_level_values("season").unique(), reverse=True)
+season = st.selectbox("Época", seasons)
 
-teams = sorted(matches["home_team"].unique())
+teams = sorted(aggregates.xs(season, level="season").index.get_level_values("team").unique())
 team = st.selectbox("Escolhe uma equipa", teams)
 
+# Jogos só da época escolhida (partição Parquet)
+matches = load_table(RAW_DIR, "matches", filters=[("season", "==", season)])
 team_matches = matches[(matches["home_team"] == team) | (matches["away_team"] == team)]
-team_stats = stats[stats["match_id"].isin(team_matches["match_id"])]
 
-st.subheader(f"Jogos do {team}")
+st.subheader(f"Jogos do {team} ({season})")
 st.dataframe(team_matches)
 
-st.subheader("Estatísticas agregadas")
-agg = team_stats.mean(numeric_only=True)
-st.dataframe(agg.to_frame("Média"))
+# Agregados: consulta direta por (equipa, época)
+team_agg = aggregates.loc[(team, season)]
+
+st.subheader("Estatísticas agregadas (médias por jogo)")
+cols = st.columns(3)
+for col, venue, label in zip(cols, ["all", "home", "away"], ["Total", "Casa", "Fora"]):
+    if venue in team_agg.index:
+        row = team_agg.loc[venue]
+        col.metric(f"Jogos ({label})", int(row["matches"]))
+        col.metric(f"Pontos por jogo ({label})", f"{row['points']:.2f}")
+
+stats = ["goals"] + list(STAT_METRICS)
+table = pd.DataFrame({
+    (label, side_label): [team_agg.loc[venue, f"{stat}_{side}"] for stat in stats]
+    for venue, label in [("all", "Total"), ("home", "Casa"), ("away", "Fora")]
+    if venue in team_agg.index
+    for side, side_label in [("for", "A favor"), ("against", "Contra")]
+}, index=stats)
+st.dataframe(table.round(2))
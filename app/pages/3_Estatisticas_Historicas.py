@@ -1,23 +1,60 @@
+import math
+from dataclasses import fields
+
 import streamlit as st
-import pandas as pd
-from pathlib import Path
 
+from app.data_access import load_page, load_table, tables_exist
 from src.config.settings import RAW_DIR
+from src.domain.schemas import MatchStats
 
 st.title("📚 Estatísticas Históricas da Liga")
 
-matches_path = Path(RAW_DIR) / "matches.csv"
-stats_path = Path(RAW_DIR) / "match_stats.csv"
-
-if not matches_path.exists() or not stats_path.exists():
+if not tables_exist(RAW_DIR, ["matches", "match_stats"]):
     st.error("Faltam dados brutos. Corre update_data.py")
     st.stop()
 
-matches = pd.read_csv(matches_path)
-stats = pd.read_csv(stats_path)
+# Só as colunas necessárias aos filtros (pequeno e em cache)
+index = load_table(RAW_DIR, "matches", columns=["season", "round_number", "home_team", "away_team"])
+
+ID_COLUMNS = ["season", "round_number", "date", "home_team", "away_team", "home_score", "away_score"]
+STAT_COLUMNS = [f.name for f in fields(MatchStats)]
+DEFAULT_COLUMNS = ["corners_home", "corners_away", "shots_home", "shots_away",
+                   "yellow_cards_home", "yellow_cards_away", "xg_home", "xg_away"]
+
+with st.sidebar:
+    st.header("Filtros")
+    season = st.selectbox("Época", ["Todas"] + sorted(index["season"].dropna().unique(), reverse=True))
+    scope = index if season == "Todas" else index[index["season"] == season]
+
+    teams = sorted(set(scope["home_team"].dropna()) | set(scope["away_team"].dropna()))
+    team = st.selectbox("Equipa", ["Todas"] + teams)
+    rounds = sorted(int(r) for r in scope["round_number"].dropna().unique())
+    round_number = st.selectbox("Jornada", ["Todas"] + rounds)
+
+    stat_columns = st.multiselect("Estatísticas", STAT_COLUMNS, default=DEFAULT_COLUMNS)
+    page_size = st.selectbox("Linhas por página", [25, 50, 100], index=1)
+
+filters = []
+if season != "Todas":
+    filters.append(("season", "==", season))
+if round_number != "Todas":
+    filters.append(("round_number", "==", round_number))
+any_of = [("home_team", "==", team), ("away_team", "==", team)] if team != "Todas" else None
+
+# Primeira página só para saber o total; a página pedida é lida a seguir
+_, total = load_page(RAW_DIR, "match_stats", ["season"], filters, any_of, 0, 1)
+n_pages = max(1, math.ceil(total / page_size))
+page = st.number_input(f"Página (de {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
 
-st.subheader("Jogos")
-st.dataframe(matches)
+df, total = load_page(
+    RAW_DIR,
+    "match_stats",
+    ID_COLUMNS + stat_columns,
+    filters,
+    any_of,
+    offset=(page - 1) * page_size,
+    limit=page_size,
+)
 
-st.subheader("Estatísticas")
-st.dataframe(stats)
+st.caption(f"{total} jogos · página {page} de {n_pages}")
+st.dataframe(df, hide_index=True)
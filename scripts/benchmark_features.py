@@ -0,0 +1,46 @@
+import argparse
+import time
+
+import pandas as pd
+
+from src.features.feature_builder import FeatureBuilder
+from src.utils.synthetic import make_synthetic_league
+
+
+def benchmark(max_seasons: int, legacy_max_seasons: int, point_in_time: bool = False):
+    """
+    Compara o engine vetorizado com o cálculo original (iterrows) em dados
+    sintéticos com 1..max_seasons épocas e valida que as features são iguais.
+    """
+    print(f"{'épocas':>6} {'jogos':>6} {'iterrows (s)':>13} {'vetorizado (s)':>15} {'speedup':>8}")
+
+    for n_seasons in range(1, max_seasons + 1):
+        matches, stats = make_synthetic_league(n_seasons=n_seasons)
+
+        fb = FeatureBuilder(matches, stats, engine="vectorized")
+        start = time.perf_counter()
+        fast = fb.build_features(fb.df, point_in_time)
+        t_fast = time.perf_counter() - start
+
+        if n_seasons <= legacy_max_seasons:
+            fb_legacy = FeatureBuilder(matches, stats, engine="iterrows")
+            start = time.perf_counter()
+            slow = fb_legacy.build_features(fb_legacy.df, point_in_time)
+            t_slow = time.perf_counter() - start
+
+            pd.testing.assert_frame_equal(fast, slow, check_dtype=False)
+            print(f"{n_seasons:>6} {len(matches):>6} {t_slow:>13.2f} {t_fast:>15.4f} {t_slow / t_fast:>7.0f}x")
+        else:
+            print(f"{n_seasons:>6} {len(matches):>6} {'-':>13} {t_fast:>15.4f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do FeatureBuilder")
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--legacy-seasons", type=int, default=3,
+                        help="Nº máximo de épocas para correr também o engine iterrows")
+    parser.add_argument("--point-in-time", action="store_true",
+                        help="Features apenas com o histórico anterior a cada jogo")
+    args = parser.parse_args()
+
+    benchmark(args.seasons, args.legacy_seasons, args.point_in_time)
@@ -0,0 +1,79 @@
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.data_ingestion.flashscore_scraper import FlashscoreScraper
+from src.data_ingestion.http_client import HttpClient, fetch_concurrently
+
+
+STATS_PAGE = """
+<html><body>
+  <div class="stat__row">
+    <div class="stat__homeValue">6</div>
+    <div class="stat__category">Cantos</div>
+    <div class="stat__awayValue">3</div>
+  </div>
+  <div class="stat__row">
+    <div class="stat__homeValue">14</div>
+    <div class="stat__category">Remates</div>
+    <div class="stat__awayValue">9</div>
+  </div>
+</body></html>
+"""
+
+
+def start_stand_in_server(latency: float) -> ThreadingHTTPServer:
+    """Servidor HTTP local que imita uma página de estatísticas do Flashscore com latência fixa."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = STATS_PAGE.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(n_matches: int, workers: int, latency: float):
+    server = start_stand_in_server(latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"/jogo/{i:06d}/" for i in range(n_matches)]
+
+    print(f"{n_matches} jogos, latência simulada {latency * 1000:.0f} ms")
+    baseline = None
+    for n_workers in (1, workers):
+        with HttpClient(max_per_host=n_workers, requests_per_second=None) as client:
+            scraper = FlashscoreScraper(client)
+            scraper.BASE_URL = base_url
+
+            start = time.perf_counter()
+            results = fetch_concurrently(scraper.get_match_stats, urls, max_workers=n_workers)
+            elapsed = time.perf_counter() - start
+
+        assert len(results) == n_matches
+        baseline = baseline or elapsed
+        print(f"  workers={n_workers:<3} {elapsed:6.2f}s  ({baseline / elapsed:.1f}x)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da ingestão concorrente")
+    parser.add_argument("--matches", type=int, default=306)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="segundos por pedido")
+    args = parser.parse_args()
+
+    run(args.matches, args.workers, args.latency)
@@ -0,0 +1,112 @@
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.config.settings import HTTP_CACHE_DIR
+from src.data_ingestion.html_parsing import extract_next_data, parse_stat_rows
+
+
+def synthetic_pages():
+    """Páginas de exemplo (Flashscore e Sofascore) com tamanho realista, se não houver páginas guardadas."""
+    filler = "".join(f'<div class="event__match"><span>{i}</span></div>' for i in range(3000))
+    rows = "".join(
+        f'<div class="stat__row"><div class="stat__homeValue">{i}</div>'
+        f'<div class="stat__category">Estatística {i}</div>'
+        f'<div class="stat__awayValue">{i + 1}</div></div>'
+        for i in range(40)
+    )
+    flash = f"<html><body>{filler}{rows}{filler}</body></html>"
+
+    stats = [{"statisticsItems": [{"name": f"Stat {i}", "home": i, "away": i + 1} for i in range(40)]}]
+    blob = json.dumps({"props": {"pageProps": {"event": {"statistics": stats}}}})
+    sofa = f'<html><body>{filler}<script id="__NEXT_DATA__" type="application/json">{blob}</script></body></html>'
+    return {"flashscore_sintetica": flash, "sofascore_sintetica": sofa}
+
+
+def load_pages(folder: Path):
+    """Páginas guardadas pela cache HTTP (ou qualquer pasta com ficheiros HTML)."""
+    pages = {}
+    for path in sorted(folder.rglob("*")):
+        if path.suffix in (".body", ".html") and path.is_file():
+            pages[path.name] = path.read_text(encoding="utf-8", errors="replace")
+    return pages
+
+
+def _peak_rss_bytes() -> int:
+    """
+    Pico de RSS do processo. No Linux lê VmHWM (por processo, começa do zero
+    depois do exec); o ru_maxrss herda o pico do processo pai através do
+    fork/exec e esconderia o crescimento feito no filho.
+    """
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    unit = 1 if sys.platform == "darwin" else 1024  # ru_maxrss: bytes no macOS, KB nos restantes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+
+
+def _rss_growth(fn, html: str) -> int:
+    """
+    Quanto sobe o pico de RSS do processo ao fazer o parsing (bytes). O RSS
+    inclui as alocações em C do lxml, que o tracemalloc não vê.
+    """
+    baseline = _peak_rss_bytes()
+    fn(html)
+    return _peak_rss_bytes() - baseline
+
+
+def peak_rss(fn, html: str) -> int:
+    """Crescimento do pico de RSS num processo novo, para que medições anteriores não o escondam."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(_rss_growth, fn, html).result()
+
+
+def measure(fn, html: str, repeat: int):
+    """Tempo médio por página e crescimento do pico de RSS."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    return (time.perf_counter() - start) / repeat, peak_rss(fn, html)
+
+
+def _before(html: str):
+    """Caminho original: árvore completa com html.parser."""
+    soup = BeautifulSoup(html, "html.parser")
+    soup.find("script", id="__NEXT_DATA__")
+    soup.select(".stat__row")
+
+
+def _after(html: str):
+    if "__NEXT_DATA__" in html:
+        extract_next_data(html)
+    else:
+        parse_stat_rows(html)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark do parsing HTML dos scrapers")
+    parser.add_argument("--pages", type=Path, default=HTTP_CACHE_DIR,
+                        help="Pasta com páginas guardadas (por omissão a cache HTTP)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages) if args.pages.exists() else {}
+    if not pages:
+        print(f"Sem páginas em {args.pages}; a usar páginas sintéticas")
+        pages = synthetic_pages()
+
+    print(f"{'página':<28} {'KB':>6} {'antes ms':>9} {'depois ms':>10} {'RSS antes KB':>13} {'RSS depois KB':>14}")
+    for name, html in pages.items():
+        t_before, m_before = measure(_before, html, args.repeat)
+        t_after, m_after = measure(_after, html, args.repeat)
+        print(f"{name[:28]:<28} {len(html) / 1024:>6.0f} {t_before * 1000:>9.1f} {t_after * 1000:>10.1f} "
+              f"{m_before / 1024:>13.0f} {m_after / 1024:>14.0f}")
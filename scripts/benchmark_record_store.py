@@ -0,0 +1,82 @@
+import argparse
+import time
+import tracemalloc
+from dataclasses import fields
+
+import pandas as pd
+
+from src.domain.record_store import RecordStore, record_values
+from src.domain.schemas import TABLE_DTYPES, MatchInfo, MatchStats
+from src.utils.io import _with_dtypes
+from src.utils.synthetic import make_synthetic_league
+
+
+def _match_records(n_seasons: int):
+    """Colunas dos jogos sintéticos como listas Python (o que o scraper entrega)."""
+    matches, stats = make_synthetic_league(n_seasons=n_seasons)
+    df = matches.merge(stats, on="match_id")
+    info = {f.name: df[f.name].tolist() for f in fields(MatchInfo)}
+    values = {f.name: df[f.name].tolist() for f in fields(MatchStats)}
+    return len(df), info, values
+
+
+def _records(n, info, values):
+    """Gera (MatchInfo, MatchStats) jogo a jogo, como a ingestão."""
+    for i in range(n):
+        yield (
+            MatchInfo(**{name: col[i] for name, col in info.items()}),
+            MatchStats(**{name: col[i] for name, col in values.items()}),
+        )
+
+
+def _list_of_dicts(records) -> pd.DataFrame:
+    rows = [{**record_values(m), **record_values(stats)} for m, stats in records]
+    return _with_dtypes(pd.DataFrame(rows), "match_stats")
+
+
+def _record_store(records) -> pd.DataFrame:
+    store = RecordStore(TABLE_DTYPES["match_stats"])
+    for m, stats in records:
+        store.append(m, stats)
+    return store.to_frame()
+
+
+def _measure(fn, records):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn(records)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, peak / 2**20, elapsed
+
+
+def benchmark(seasons):
+    """
+    Pico de memória (tracemalloc) e tempo para acumular as linhas de
+    match_stats de n épocas e obter o DataFrame final: lista de dicts
+    (caminho antigo) vs RecordStore. Valida que as tabelas são iguais.
+    """
+    print(f"{'épocas':>6} {'jogos':>6} {'dicts (MB)':>11} {'store (MB)':>11} {'redução':>8} {'dicts (s)':>10} {'store (s)':>10}")
+
+    for n_seasons in seasons:
+        n, info, values = _match_records(n_seasons)
+
+        legacy, peak_legacy, t_legacy = _measure(_list_of_dicts, _records(n, info, values))
+        del legacy
+        columnar, peak_store, t_store = _measure(_record_store, _records(n, info, values))
+
+        expected = _with_dtypes(pd.DataFrame([{**record_values(m), **record_values(s)}
+                                              for m, s in _records(n, info, values)]), "match_stats")
+        pd.testing.assert_frame_equal(expected, columnar)
+
+        print(f"{n_seasons:>6} {n:>6} {peak_legacy:>11.1f} {peak_store:>11.1f} "
+              f"{peak_legacy / peak_store:>7.1f}x {t_legacy:>10.2f} {t_store:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pico de memória: lista de dicts vs RecordStore")
+    parser.add_argument("--seasons", type=int, nargs="+", default=[1, 5, 20])
+    args = parser.parse_args()
+
+    benchmark(args.seasons)
@@ -1,5 +1,45 @@
+import argparse
+
+from src.config.settings import PROCESSED_DIR, RAW_DIR
 from src.features.feature_builder import FeatureBuilder
+from src.features.feature_store import FeatureStore
+from src.features.team_aggregates import update_team_aggregates
+from src.utils.io import read_table, remove_table
+
+
+def build_features(full: bool = False):
+    """Atualiza features_train (só os jogos novos, ou tudo com full=True) e os agregados por equipa."""
+    store = FeatureStore()
+    if full:
+        store.reset()
+
+    new_rows = store.sync_from_raw()
+    print(f"✔ features_train atualizado ({len(new_rows)} jogos novos)")
+
+    update_team_aggregates()
+
+
+def build_next_round_features():
+    """
+    features_next_round: jogos de data/raw/matches ainda sem resultado, com
+    o histórico de todos os jogos terminados. Sem jogos por jogar (fim de
+    época) a tabela é removida.
+    """
+    matches = read_table(RAW_DIR, "matches")
+    played = matches["home_score"].notna() & matches["away_score"].notna()
+    if played.all():
+        remove_table(PROCESSED_DIR, "features_next_round")
+        print("✔ Sem jogos por jogar: features_next_round removido")
+        return
+
+    FeatureBuilder(matches[played]).build_next_round_features(matches[~played])
+
 
 if __name__ == "__main__":
-    fb = FeatureBuilder()
-    fb.build_all_features()
+    parser = argparse.ArgumentParser(description="Gera features_train.csv e features_next_round.csv")
+    parser.add_argument("--full", action="store_true",
+                        help="Reconstrói todas as features em vez de processar só os jogos novos")
+    args = parser.parse_args()
+
+    build_features(full=args.full)
+    build_next_round_features()
@@ -0,0 +1,64 @@
+import argparse
+import json
+import threading
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+import requests
+
+from src.config.settings import SERVICE_HOST, SERVICE_PORT
+
+
+def run(base_url: str, n_requests: int, concurrency: int):
+    """
+    `concurrency` clientes em paralelo, cada um com a sua sessão keep-alive,
+    fazem no total `n_requests` pedidos GET /predict com jogos aleatórios.
+    """
+    teams = requests.get(f"{base_url}/teams", timeout=10).json()
+    rng = np.random.default_rng(0)
+    pairs = [tuple(rng.choice(teams, size=2, replace=False)) for _ in range(n_requests)]
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    next_index = iter(range(n_requests))
+
+    def _client():
+        session = requests.Session()
+        while True:
+            with lock:
+                i = next(next_index, None)
+            if i is None:
+                return
+            home, away = pairs[i]
+            start = time.perf_counter()
+            response = session.get(f"{base_url}/predict?{urlencode({'home': home, 'away': away})}", timeout=10)
+            ms = (time.perf_counter() - start) * 1000
+            with lock:
+                (latencies if response.ok else errors).append(ms)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=_client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies)
+    print(f"{len(latencies)} pedidos ok, {len(errors)} erros, {concurrency} clientes, {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} pedidos/s)")
+    if latencies.size:
+        print(f"cliente: p50 {np.percentile(latencies, 50):.2f} ms · p99 {np.percentile(latencies, 99):.2f} ms")
+    print("servidor:", json.dumps(requests.get(f"{base_url}/stats", timeout=10).json()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço de previsões")
+    parser.add_argument("--url", default=f"http://{SERVICE_HOST}:{SERVICE_PORT}")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    run(args.url, args.requests, args.concurrency)
@@ -0,0 +1,20 @@
+import argparse
+
+from src.config.settings import TRAIN_N_JOBS
+from src.models.backtest import run_backtest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest walk-forward por jornada")
+    parser.add_argument("--season", action="append", help="Época a avaliar (repetível; por omissão todas)")
+    parser.add_argument("--line", type=float, default=9.5, help="Linha de cantos dos sinais")
+    parser.add_argument("--min-train", type=int, default=50, help="Mínimo de jogos de treino por jornada")
+    parser.add_argument("--n-jobs", type=int, default=TRAIN_N_JOBS)
+    args = parser.parse_args()
+
+    report = run_backtest(seasons=args.season, line=args.line, min_train=args.min_train, n_jobs=args.n_jobs)
+    if report.empty:
+        print("Sem jornadas com dados de treino suficientes")
+    else:
+        print(report.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+        rate = report["corners_hits"].sum() / max(report["corners_signals"].sum(), 1)
+        print(f"\n✔ {len(report)} jornadas avaliadas; taxa de acerto global dos sinais de cantos: {rate:.1%}")
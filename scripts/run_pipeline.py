@@ -0,0 +1,37 @@
+import argparse
+import logging
+import time
+
+from src.config.settings import MODEL_MODE, PIPELINE_MAX_WORKERS
+from src.pipeline.dag import PipelineRunner, default_stages
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Corre ingest → build_features → treino → previsões, saltando etapas sem alterações"
+    )
+    parser.add_argument("--force", nargs="+", default=[],
+                        help="Etapas a correr mesmo sem alterações (ex.: --force build_features)")
+    parser.add_argument("--skip", nargs="+", default=[],
+                        help="Etapas a não correr, usando os outputs existentes (ex.: --skip ingest update_data sem rede)")
+    parser.add_argument("--workers", type=int, default=PIPELINE_MAX_WORKERS,
+                        help="Etapas independentes em paralelo (ex.: as três famílias de modelos)")
+    parser.add_argument("--mode", choices=["per_target", "multi_output"], default=MODEL_MODE)
+    parser.add_argument("--dry-run", action="store_true", help="Mostra o que correria, sem correr nada")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    start = time.perf_counter()
+    runner = PipelineRunner(default_stages(args.mode), max_workers=args.workers)
+    results = runner.run(force=args.force, skip=args.skip, dry_run=args.dry_run)
+
+    print(f"\n{'etapa':<16} {'estado':<8} {'tempo (s)':>10}")
+    for r in results:
+        print(f"{r.name:<16} {r.status:<8} {r.seconds:>10.2f}" + (f"  {r.error}" if r.error else ""))
+
+    failed = [r.name for r in results if r.status in ("failed", "blocked")]
+    total = time.perf_counter() - start
+    if failed:
+        raise SystemExit(f"\nPipeline com falhas ({', '.join(failed)}) em {total:.2f}s")
+    else:
+        print(f"\n✔ Pipeline concluído em {total:.2f}s")
@@ -0,0 +1,21 @@
+import argparse
+
+from src.config.settings import LEAGUES, MODEL_MODE, SEASONS, SHARD_MAX_WORKERS
+from src.pipeline.shards import STAGES, make_shards, run_shards
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline ingest → features → train → predict por (liga, época)")
+    parser.add_argument("--leagues", nargs="+", choices=list(LEAGUES), default=list(LEAGUES))
+    parser.add_argument("--seasons", nargs="+", default=SEASONS)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES),
+                        help="Etapas a correr (ex.: --stages features train predict)")
+    parser.add_argument("--workers", type=int, default=SHARD_MAX_WORKERS,
+                        help="Shards processados em paralelo (1 = sequencial)")
+    parser.add_argument("--mode", choices=["per_target", "multi_output"], default=MODEL_MODE)
+    args = parser.parse_args()
+
+    shards = make_shards({league: LEAGUES[league] for league in args.leagues}, args.seasons)
+    report = run_shards(shards, args.stages, max_workers=args.workers, mode=args.mode)
+
+    print(report.round(2).to_string(na_rep="falhou"))
+    print(f"\n✔ {report.notna().all(axis=1).sum()}/{len(shards)} shards processados")
@@ -0,0 +1,29 @@
+import argparse
+import logging
+
+from src.config.settings import MODEL_MODE, SERVICE_HOST, SERVICE_MAX_BATCH, SERVICE_MAX_WAIT_MS, SERVICE_PORT
+from src.models.prediction_service import PredictionService, make_server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de previsões")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--mode", choices=["per_target", "multi_output"], default=MODEL_MODE)
+    parser.add_argument("--max-batch", type=int, default=SERVICE_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=SERVICE_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    service = PredictionService(mode=args.mode, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    service.warm_up()
+
+    server = make_server(service, args.host, args.port)
+    print(f"✔ Serviço de previsões em http://{args.host}:{args.port} ({len(service.teams)} equipas)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(service.stats.summary())
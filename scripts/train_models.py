@@ -1,4 +1,19 @@
+import argparse
+
+from src.config.settings import MODEL_MODE, TRAIN_N_JOBS
+from src.models.incremental import update_models
 from src.models.train_pipeline import train_all_models
 
 if __name__ == "__main__":
-    train_all_models()
+    parser = argparse.ArgumentParser(description="Treina todos os modelos")
+    parser.add_argument("--n-jobs", type=int, default=TRAIN_N_JOBS,
+                        help="Nº de cores a usar (1 = sequencial)")
+    parser.add_argument("--mode", choices=["per_target", "multi_output"], default=MODEL_MODE)
+    parser.add_argument("--incremental", action="store_true",
+                        help="Atualiza os modelos só com os jogos novos (warm start)")
+    args = parser.parse_args()
+
+    if args.incremental:
+        update_models()
+    else:
+        train_all_models(n_jobs=args.n_jobs, mode=args.mode)
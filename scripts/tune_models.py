@@ -0,0 +1,16 @@
+import argparse
+
+from src.config.settings import TRAIN_N_JOBS, TUNING_CANDIDATES, TUNING_CV_SPLITS, TUNING_ETA
+from src.models.tuning import FAMILIES, tune_models
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pesquisa de hiperparâmetros (successive halving)")
+    parser.add_argument("--family", action="append", choices=list(FAMILIES),
+                        help="Família a afinar (repetível; por omissão todas)")
+    parser.add_argument("--candidates", type=int, default=TUNING_CANDIDATES)
+    parser.add_argument("--eta", type=int, default=TUNING_ETA)
+    parser.add_argument("--splits", type=int, default=TUNING_CV_SPLITS, help="Nº de folds temporais")
+    parser.add_argument("--n-jobs", type=int, default=TRAIN_N_JOBS)
+    args = parser.parse_args()
+
+    tune_models(args.family, args.candidates, args.eta, args.splits, args.n_jobs)
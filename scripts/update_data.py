@@ -1,29 +1,58 @@
+import pandas as pd
+
+from src.config.settings import RAW_DIR
+from src.data_ingestion.entity_resolution import EntityResolver
 from src.data_ingestion.flashscore_match_list_scraper import FlashscoreMatchListScraper
 from src.data_ingestion.match_collector import MatchCollector
-import pandas as pd
+from src.utils.io import read_table, table_exists, write_table
+
 
 def update_data():
+    """
+    Estatísticas dos jogos da próxima jornada (Flashscore), com as equipas
+    e os jogos resolvidos para os nomes e match_id de data/raw/matches.
+    Guarda a tabela next_round_stats em data/raw.
+    """
     match_list_scraper = FlashscoreMatchListScraper()
-    collector = MatchCollector()
+    known = read_table(RAW_DIR, "matches") if table_exists(RAW_DIR, "matches") else None
+
+    # Nomes canónicos das equipas: os de data/raw/matches
+    teams = pd.concat([known["home_team"], known["away_team"]]).unique() if known is not None else ()
+    resolver = EntityResolver(teams)
+    collector = MatchCollector(resolver=resolver)
 
     matches = match_list_scraper.get_next_round_matches()
 
-    rows = []
-    for m in matches:
-        stats = collector.collect_stats(
-            flash_url=m["flash_url"],
-            sofa_url=None  # podemos mapear automaticamente mais tarde
-        )
+    # match_id do jogo em data/raw/matches (mesma chave do resto dos dados)
+    if known is not None:
+        match_ids = resolver.match_fixtures(matches, known, source="flashscore", key="flash_url")
+    else:
+        match_ids = [None] * len(matches)
+
+    # sofa_url=None: as estatísticas Sofascore destes jogos chegam por
+    # match_id na ingestão (update_pipeline)
+    # finished=False: jogos da próxima jornada, sempre revalidados na cache
+    all_stats = collector.collect_many([(m["flash_url"], None) for m in matches], finished=False)
 
+    rows = []
+    for m, match_id, stats in zip(matches, match_ids, all_stats):
         rows.append({
-            "home_team": m["home_team"],
-            "away_team": m["away_team"],
+            "match_id": match_id,
+            "home_team": resolver.resolve_team(m["home_team"], "flashscore") or m["home_team"],
+            "away_team": resolver.resolve_team(m["away_team"], "flashscore") or m["away_team"],
             "flash_url": m["flash_url"],
             **stats
         })
 
     df = pd.DataFrame(rows)
-    df.to_csv("data/raw/match_stats.csv", index=False)
+    write_table(df, RAW_DIR, "next_round_stats", partition_cols=())
+
+    resolver.save()
+    missing = resolver.report()
+    print(f"✔ next_round_stats: {len(df)} jogos "
+          f"({len(missing['fixtures'])} sem match_id, {len(missing['teams'])} equipas e "
+          f"{len(missing['stats'])} estatísticas por resolver)")
+
 
 if __name__ == "__main__":
     update_data()
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # Diretórios base
@@ -9,9 +10,81 @@ INTERIM_DIR = DATA_DIR / "interim"
 PROCESSED_DIR = DATA_DIR / "processed"
 PREDICTIONS_DIR = DATA_DIR / "predictions"
 
+# Artefactos dos modelos (resolvido a partir de BASE_DIR, não do diretório atual)
+ARTIFACTS_DIR = BASE_DIR / "src" / "models" / "artifacts"
+
 # Liga / contexto
 LEAGUE = "Primeira Liga"
 SEASONS = ["2022-2023", "2023-2024"]
 
 # (Opcional) ID da liga no Sofascore
 PRIMEIRA_LIGA_ID = 1234  # substituir pelo real
+
+# Formato de armazenamento das tabelas ("parquet" ou "csv").
+# Em "parquet" é sempre exportada também a versão CSV.
+STORAGE_FORMAT = "parquet"
+
+# Ingestão concorrente (scrapers)
+HTTP_MAX_WORKERS = 8            # threads para obter estatísticas de jogos
+HTTP_MAX_PER_HOST = 4           # pedidos simultâneos por host
+HTTP_REQUESTS_PER_SECOND = 5.0  # por host (None = sem limite)
+HTTP_TIMEOUT = 20               # segundos
+
+# Cache HTTP em disco (scrapers)
+HTTP_CACHE_DIR = DATA_DIR / "http_cache"
+HTTP_CACHE_MAX_BYTES = 500 * 1024 * 1024
+HTTP_CACHE_TTL_FINISHED = float("inf")  # jogos terminados não mudam
+HTTP_CACHE_TTL_FIXTURES = 15 * 60       # calendário: revalidar (ETag/Last-Modified) após 15 min
+
+# Backend de parsing HTML dos scrapers ("lxml" ou "html.parser")
+HTML_PARSER = "lxml"
+
+# Treino: nº de cores disponíveis para treinar os modelos em paralelo
+TRAIN_N_JOBS = os.cpu_count() or 1
+
+# Modelos usados no treino/previsão:
+# "per_target" = um artefacto por alvo (6); "multi_output" = um único artefacto
+MODEL_MODE = "per_target"
+
+# Treino incremental (após cada jornada)
+INCREMENTAL_TREES_PER_UPDATE = 25  # árvores novas por atualização das RandomForest
+INCREMENTAL_FULL_REFIT_EVERY = 10  # nº de atualizações entre retreinos completos
+
+# Backtest (scripts/run_backtest.py): snapshots de modelos por jornada
+# guardados em cache; os menos usados recentemente são apagados acima deste nº
+BACKTEST_MAX_SNAPSHOTS = 80
+
+# Pesquisa de hiperparâmetros (scripts/tune_models.py)
+TUNING_CV_SPLITS = 4     # folds temporais (janela crescente)
+TUNING_ETA = 3           # successive halving: fica 1/ETA dos candidatos por ronda
+TUNING_CANDIDATES = 27   # candidatos iniciais por família
+
+# Serviço de previsões (scripts/serve_predictions.py)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_MAX_BATCH = 64      # jogos por chamada vetorizada
+SERVICE_MAX_WAIT_MS = 2.0   # espera máxima para juntar pedidos num micro-batch
+
+# Simulação Monte Carlo das previsões (intervalos e probabilidades)
+SIMULATION_SAMPLES = 100_000   # amostras conjuntas por jogo
+SIMULATION_INTERVAL = 0.9      # intervalo de confiança (quantis 5% e 95%)
+
+# Pipeline por shards (liga, época): scripts/run_shards.py
+# Liga -> ID no Sofascore; cada liga é processada para cada época de SEASONS
+LEAGUES = {
+    LEAGUE: PRIMEIRA_LIGA_ID,
+    "Liga Portugal 2": 239,
+    "La Liga": 8,
+}
+SHARDS_DIR = DATA_DIR / "shards"            # data/shards/<liga>/<época>/{raw,processed,...}
+SHARD_MAX_WORKERS = os.cpu_count() or 1     # shards processados em paralelo
+
+# Pipeline com dependências (scripts/run_pipeline.py)
+PIPELINE_STATE_DIR = DATA_DIR / "pipeline"   # hashes das etapas já corridas
+PIPELINE_MAX_WORKERS = os.cpu_count() or 1   # etapas independentes em paralelo
+
+# Resolução de entidades entre fontes (equipas, estatísticas e jogos)
+ENTITY_CACHE_PATH = DATA_DIR / "entity_resolution.json"  # equipas/jogos já resolvidos
+TEAM_MATCH_THRESHOLD = 0.85          # semelhança mínima entre nomes de equipas
+TEAM_MATCH_MARGIN = 0.05             # vantagem mínima sobre a 2.ª equipa mais parecida
+FIXTURE_DATE_TOLERANCE_DAYS = 1      # diferença máxima de data entre fontes (fusos horários)
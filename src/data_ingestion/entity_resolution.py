@@ -0,0 +1,333 @@
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import fields
+from difflib import SequenceMatcher
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from src.config.settings import (
+    ENTITY_CACHE_PATH,
+    FIXTURE_DATE_TOLERANCE_DAYS,
+    TEAM_MATCH_MARGIN,
+    TEAM_MATCH_THRESHOLD,
+)
+from src.domain.schemas import MatchStats
+
+
+logger = logging.getLogger(__name__)
+
+
+# Estatísticas canónicas: nomes de MatchStats sem o sufixo _home/_away
+STAT_NAMES = sorted({f.name[:-len("_home")] for f in fields(MatchStats) if f.name.endswith("_home")})
+
+# Nome canónico -> nomes usados pelas fontes (Flashscore PT, Sofascore EN)
+STAT_ALIASES: Dict[str, List[str]] = {
+    "xg": ["Golos esperados (xG)", "Golos esperados", "Expected goals", "xG"],
+    "possession": ["Posse de bola", "Ball possession"],
+    "shots": ["Remates", "Tentativas de golo", "Total shots"],
+    "shots_on_target": ["Remates à baliza", "Shots on target"],
+    "shots_off_target": ["Remates fora", "Remates para fora", "Shots off target"],
+    "shots_blocked": ["Remates bloqueados", "Blocked shots"],
+    "shots_inside_box": ["Remates dentro da área", "Shots inside box"],
+    "shots_outside_box": ["Remates fora da área", "Shots outside box"],
+    "big_chances": ["Grandes oportunidades", "Big chances"],
+    "corners": ["Cantos", "Corner kicks", "Corners"],
+    "passes_completed": ["Passes certos", "Accurate passes"],
+    "passes_total": ["Passes", "Total passes"],
+    "yellow_cards": ["Cartões amarelos", "Yellow cards"],
+    "xgot": ["Golos esperados na baliza (xGOT)", "xGOT", "Expected goals on target"],
+    "hit_woodwork": ["Bolas nos ferros", "Remates aos ferros", "Hit woodwork"],
+    "headed_goals": ["Golos de cabeça", "Headed goals"],
+    "touches_in_box": ["Toques na área adversária", "Touches in penalty area"],
+    "accurate_through_balls": ["Passes em profundidade certos", "Accurate through balls"],
+    "offsides": ["Foras de jogo", "Offsides"],
+    "free_kicks": ["Livres", "Free kicks"],
+    "long_passes_completed": ["Passes longos certos", "Accurate long balls"],
+    "long_passes_total": ["Passes longos", "Long balls"],
+    "crosses_completed": ["Cruzamentos certos", "Accurate crosses"],
+    "crosses_total": ["Cruzamentos", "Crosses"],
+    "xa": ["Assistências esperadas (xA)", "Expected assists"],
+    "throw_ins": ["Lançamentos laterais", "Lançamentos", "Throw-ins"],
+    "fouls": ["Faltas", "Fouls"],
+    "tackles_won": ["Desarmes ganhos", "Tackles won"],
+    "tackles_total": ["Desarmes", "Total tackles", "Tackles"],
+    "duels_won": ["Duelos ganhos", "Duels won", "Duels"],
+    "clearances": ["Alívios", "Clearances"],
+    "interceptions": ["Interceções", "Intercepções", "Interceptions"],
+    "errors_shot": ["Erros que originaram remate", "Errors lead to a shot"],
+    "errors_goal": ["Erros que originaram golo", "Errors lead to a goal"],
+    "saves": ["Defesas do guarda-redes", "Defesas", "Goalkeeper saves"],
+    "xgot_faced": ["xGOT enfrentado", "xGOT faced"],
+    "goals_prevented": ["Golos evitados", "Goals prevented"],
+}
+
+# Grupos de nomes da mesma equipa nas várias fontes. O nome usado fica o
+# que existir em data/raw/matches (ver EntityResolver.add_teams).
+TEAM_ALIASES: List[List[str]] = [
+    ["Sporting CP", "Sporting", "Sporting Lisboa", "Sporting Clube de Portugal"],
+    ["FC Porto", "Porto"],
+    ["SL Benfica", "Benfica"],
+    ["SC Braga", "Braga", "Sporting Braga"],
+    ["Vitória SC", "Vitória Guimarães", "Vitória de Guimarães", "Guimarães"],
+    ["Estrela da Amadora", "Estrela", "CF Estrela da Amadora"],
+    ["AVS", "AVS Futebol SAD", "Vilaverdense"],
+]
+
+# Palavras ignoradas na comparação aproximada de nomes de equipas
+TEAM_STOPWORDS = {
+    "fc", "sc", "cf", "cd", "ud", "gd", "ac", "sad", "afc", "club", "clube", "futebol", "football", "de", "da", "do",
+}
+
+# Palavras que distinguem equipas do mesmo clube (equipa B, sub-23, feminino)
+TEAM_QUALIFIERS = {"b", "ii", "u19", "u21", "u23", "sub", "19", "21", "23", "feminino", "fem", "women", "w"}
+
+
+@lru_cache(maxsize=65536)
+def normalize(text: str) -> str:
+    """Chave de comparação: sem acentos, minúsculas, só letras/dígitos separados por espaços."""
+    ascii_text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode()
+    return " ".join(re.findall(r"[a-z0-9]+", ascii_text.lower()))
+
+
+def _tokens(key: str) -> frozenset:
+    tokens = frozenset(key.split())
+    return (tokens - TEAM_STOPWORDS) or tokens
+
+
+def team_similarity(name: str, canonical: str) -> float:
+    """
+    Semelhança (0..1) entre um nome normalizado de uma fonte e um nome
+    canónico normalizado:
+    - qualificadores diferentes (B, II, U23, ...) são equipas diferentes: 0;
+    - se as palavras do nome estão todas no canónico (ex.: "sporting" e
+      "sporting cp") a semelhança é >= 0.9. O contrário não conta: palavras
+      a mais no nome ("vitoria setubal" vs "vitoria sc") indicam outra equipa;
+    - caso contrário, o rácio do difflib.
+    """
+    tn, tc = _tokens(name), _tokens(canonical)
+    if (tn ^ tc) & TEAM_QUALIFIERS:
+        return 0.0
+    if tn and tn <= tc:
+        return 0.9 + 0.1 * len(tn) / len(tc)
+    return SequenceMatcher(None, " ".join(sorted(tn)), " ".join(sorted(tc))).ratio()
+
+
+class EntityResolver:
+    """
+    Resolução de entidades entre fontes (Flashscore, Sofascore):
+
+    - equipas: nome de uma fonte -> nome canónico (o de data/raw/matches),
+      por índice de aliases (exato) e, se falhar, por semelhança aproximada
+      com os candidatos que partilham palavras do nome. Só é aceite se a
+      melhor equipa ficar pelo menos `margin` acima da segunda;
+    - estatísticas: chave de uma fonte -> nome de MatchStats (só aliases
+      exatos: "shots on target" e "shots off target" são quase iguais);
+    - jogos: jogo de uma fonte -> match_id, pelas equipas resolvidas e data.
+
+    As equipas e jogos resolvidos ficam em cache no disco (`cache_path`):
+    nas execuções seguintes são lookups num dict. O que não foi resolvido
+    fica em `missing` (ver report).
+    """
+
+    def __init__(
+        self,
+        teams: Iterable[str] = (),
+        cache_path: Path = ENTITY_CACHE_PATH,
+        threshold: float = TEAM_MATCH_THRESHOLD,
+        margin: float = TEAM_MATCH_MARGIN,
+    ):
+        self.cache_path = Path(cache_path)
+        self.threshold = threshold
+        self.margin = margin
+        self._lock = threading.Lock()
+
+        self._cache: Dict[str, Dict[str, Dict[str, str]]] = {"teams": {}, "fixtures": {}}
+        if self.cache_path.exists():
+            self._cache.update(json.loads(self.cache_path.read_text(encoding="utf-8")))
+        self.missing: Dict[str, set] = {"teams": set(), "stats": set(), "fixtures": set()}
+
+        self._stats = {normalize(stat): stat for stat in STAT_NAMES}
+        for stat, aliases in STAT_ALIASES.items():
+            for alias in aliases:
+                self._stats[normalize(alias)] = stat
+
+        self._teams: Dict[str, str] = {}      # nome normalizado -> canónico
+        self._by_token: Dict[str, set] = {}   # palavra -> nomes normalizados canónicos
+        self._canonical: set = set()
+        self.add_teams(teams)
+
+    # ---------------------------------------------------------
+    # Índices
+    # ---------------------------------------------------------
+
+    def add_teams(self, teams: Iterable[str]):
+        """Junta nomes canónicos ao índice (e os aliases de TEAM_ALIASES que lhes correspondem)."""
+        for team in teams:
+            if pd.isna(team) or team in self._canonical:
+                continue
+            key = normalize(team)
+            self._canonical.add(team)
+            self._teams[key] = team
+            for token in _tokens(key):
+                self._by_token.setdefault(token, set()).add(key)
+
+        for group in TEAM_ALIASES:
+            target = next((self._teams[normalize(name)] for name in group if normalize(name) in self._teams), None)
+            if target is not None:
+                for name in group:
+                    self._teams.setdefault(normalize(name), target)
+
+    def _fuzzy_team(self, key: str) -> Optional[str]:
+        """
+        Melhor equipa canónica para `key`, ou None se abaixo do limiar ou sem
+        margem sobre a segunda (ex.: "sporting" com "Sporting CP" e
+        "Sporting Braga" como candidatos: ambíguo, não é resolvido).
+        """
+        candidates = set().union(*(self._by_token.get(t, set()) for t in _tokens(key))) or set(self._teams)
+        best: Dict[str, float] = {}
+        for candidate in candidates:
+            team = self._teams[candidate]
+            best[team] = max(best.get(team, 0.0), team_similarity(key, candidate))
+
+        scored = sorted(best.values(), reverse=True)
+        if not scored or scored[0] < self.threshold:
+            return None
+        if len(scored) > 1 and scored[0] - scored[1] < self.margin:
+            return None  # ambíguo
+        return max(best, key=best.get)
+
+    # ---------------------------------------------------------
+    # Resolução
+    # ---------------------------------------------------------
+
+    def resolve_team(self, name: str, source: str) -> Optional[str]:
+        """Nome canónico de uma equipa de `source` (None se não resolvida)."""
+        key = normalize(name)
+        cached = self._cache["teams"].get(source, {}).get(name)
+        # Entradas da cache que as regras atuais rejeitam (ex.: "FC Porto B"
+        # -> "FC Porto" de versões anteriores) voltam a ser resolvidas
+        if cached in self._canonical and (
+            self._teams.get(key) == cached or team_similarity(key, normalize(cached)) >= self.threshold
+        ):
+            return cached
+
+        team = self._teams.get(key) or self._fuzzy_team(key)
+        with self._lock:
+            if team is None:
+                self.missing["teams"].add((source, name))
+                self._cache["teams"].get(source, {}).pop(name, None)
+            else:
+                self._cache["teams"].setdefault(source, {})[name] = team
+        return team
+
+    def resolve_stat(self, key: str, source: str) -> Optional[str]:
+        """Nome de MatchStats (sem _home/_away) de uma chave de estatística de `source`."""
+        stat = self._stats.get(normalize(key))
+        if stat is None:
+            with self._lock:
+                self.missing["stats"].add((source, key))
+        return stat
+
+    def canonical_stats(self, stats: Dict[str, dict], source: str) -> Dict[str, dict]:
+        """{chave da fonte: {home, away}} -> {estatística de MatchStats: {home, away}}."""
+        out = {}
+        for key, values in stats.items():
+            stat = self.resolve_stat(key, source)
+            if stat is not None:
+                out[stat] = values
+        return out
+
+    def _fixture_index(self, matches: pd.DataFrame) -> Dict[tuple, list]:
+        """(casa, fora) -> [(data, já jogado, match_id), ...] por ordem de data."""
+        self.add_teams(pd.concat([matches["home_team"], matches["away_team"]]).unique())
+        matches = matches.assign(_kickoff=pd.to_datetime(matches["date"], errors="coerce"))
+        matches = matches.sort_values("_kickoff", kind="mergesort")
+        played = matches["home_score"].notna() if "home_score" in matches else pd.Series(False, index=matches.index)
+
+        index: Dict[tuple, list] = {}
+        for home, away, kickoff, is_played, match_id in zip(
+            matches["home_team"], matches["away_team"], matches["_kickoff"], played, matches["match_id"].astype(str)
+        ):
+            index.setdefault((home, away), []).append((kickoff, bool(is_played), match_id))
+        return index
+
+    def match_fixtures(
+        self,
+        fixtures: List[dict],
+        matches: pd.DataFrame,
+        source: str,
+        key: str,
+        tolerance_days: int = FIXTURE_DATE_TOLERANCE_DAYS,
+    ) -> List[Optional[str]]:
+        """
+        match_id (de `matches`, ex.: data/raw/matches) de cada jogo de
+        `fixtures` (dicts com home_team, away_team, `key` e opcionalmente
+        date). Os jogos são indexados uma vez por (casa, fora); com data
+        escolhe-se o mais próximo até `tolerance_days` dias, sem data o
+        primeiro ainda por jogar entre as duas equipas. Jogos já na cache
+        não voltam a ser comparados.
+        """
+        known_ids = set(matches["match_id"].astype(str))
+        cache = self._cache["fixtures"].setdefault(source, {})
+        index = None
+        match_ids = []
+        for fixture in fixtures:
+            fixture_key = str(fixture[key])
+            if cache.get(fixture_key) in known_ids:
+                match_ids.append(cache[fixture_key])
+                continue
+
+            if index is None:
+                index = self._fixture_index(matches)
+
+            home = self.resolve_team(fixture["home_team"], source)
+            away = self.resolve_team(fixture["away_team"], source)
+            candidates = index.get((home, away), [])
+
+            match_id = None
+            date = pd.to_datetime(fixture.get("date"), errors="coerce")
+            if not pd.isna(date):
+                gaps = [(abs((when - date).days), mid) for when, _, mid in candidates if not pd.isna(when)]
+                if gaps and min(gaps)[0] <= tolerance_days:
+                    match_id = min(gaps)[1]
+            else:
+                upcoming = [mid for _, is_played, mid in candidates if not is_played]
+                match_id = upcoming[0] if upcoming else None
+
+            if match_id is None:
+                self.missing["fixtures"].add((source, fixture_key))
+            else:
+                cache[fixture_key] = match_id
+            match_ids.append(match_id)
+
+        return match_ids
+
+    # ---------------------------------------------------------
+    # Persistência e relatório
+    # ---------------------------------------------------------
+
+    def save(self):
+        """Guarda as equipas e jogos resolvidos (substituição atómica)."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+        with self._lock:
+            tmp.write_text(json.dumps(self._cache, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.cache_path)
+
+    def report(self) -> Dict[str, List[str]]:
+        """Entidades não resolvidas, por tipo: ["fonte: valor", ...]."""
+        with self._lock:
+            report = {kind: sorted(f"{source}: {value}" for source, value in values)
+                      for kind, values in self.missing.items()}
+        for kind, values in report.items():
+            if values:
+                logger.warning(f"{len(values)} {kind} sem correspondência: {', '.join(values[:10])}"
+                               + (" ..." if len(values) > 10 else ""))
+        return report
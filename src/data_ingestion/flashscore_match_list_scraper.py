@@ -1,5 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
+from src.config.settings import HTTP_CACHE_TTL_FIXTURES
+from src.data_ingestion.html_parsing import make_soup
+from src.data_ingestion.http_client import HttpClient, get_default_client
 
 class FlashscoreMatchListScraper:
     BASE_URL = "https://www.flashscore.pt"
@@ -9,12 +10,15 @@ class FlashscoreMatchListScraper:
         "Accept-Language": "pt-PT,pt;q=0.9"
     }
 
+    def __init__(self, http: HttpClient | None = None):
+        self.http = http or get_default_client()
+
     def get_next_round_matches(self):
         url = f"{self.BASE_URL}/futebol/portugal/primeira-liga/calendario/"
-        resp = requests.get(url, headers=self.headers)
+        resp = self.http.get(url, headers=self.headers, ttl=HTTP_CACHE_TTL_FIXTURES)
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = make_soup(resp.text)
 
         rounds = soup.select(".event__round")
         matches = soup.select(".event__match")
@@ -1,5 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
+from src.config.settings import HTTP_CACHE_TTL_FINISHED
+from src.data_ingestion.html_parsing import parse_stat_rows
+from src.data_ingestion.http_client import HttpClient, get_default_client
 
 class FlashscoreScraper:
     BASE_URL = "https://www.flashscore.pt"
@@ -9,29 +10,28 @@ class FlashscoreScraper:
         "Accept-Language": "pt-PT,pt;q=0.9"
     }
 
-    def get_match_stats(self, match_url: str) -> dict:
+    def __init__(self, http: HttpClient | None = None):
+        self.http = http or get_default_client()
+
+    def get_match_stats(self, match_url: str, finished: bool = True) -> dict:
         """
         Extrai estatísticas de um jogo do Flashscore.
         match_url é o caminho relativo, ex: '/jogo/xxxxxx/#/resumo-de-jogo/estatisticas-de-jogo/0'
+        Jogos terminados ficam em cache sem expirar; os restantes são sempre revalidados.
         """
         url = self.BASE_URL + match_url
-        resp = requests.get(url, headers=self.headers)
+        ttl = HTTP_CACHE_TTL_FINISHED if finished else 0
+        resp = self.http.get(url, headers=self.headers, ttl=ttl)
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
         stats = {}
 
-        for row in soup.select(".stat__row"):
-            category = row.select_one(".stat__category")
-            home = row.select_one(".stat__homeValue")
-            away = row.select_one(".stat__awayValue")
-
-            if category and home and away:
-                key = category.text.strip().lower().replace(" ", "_")
-                stats[key] = {
-                    "home": self._safe_int(home.text),
-                    "away": self._safe_int(away.text)
-                }
+        for category, home, away in parse_stat_rows(resp.text):
+            key = category.strip().lower().replace(" ", "_")
+            stats[key] = {
+                "home": self._safe_int(home),
+                "away": self._safe_int(away)
+            }
 
         return stats
 
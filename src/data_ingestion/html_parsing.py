@@ -0,0 +1,92 @@
+import json
+import re
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.config.settings import HTML_PARSER
+
+try:
+    import lxml.html
+except ImportError:  # lxml é opcional: sem ele usa-se o html.parser do bs4
+    lxml = None
+
+
+NEXT_DATA_RE = re.compile(
+    r"<script[^>]*\bid=[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Seleção de elementos por classe CSS em XPath (equivalente a ".classe")
+_CLASS_XPATH = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+STAT_ROW_XPATH = f"//*[{_CLASS_XPATH.format('stat__row')}]"
+# Idem para o SoupStrainer: durante o parse o bs4 compara o atributo class
+# inteiro, pelo que class_="stat__row" falharia em class="stat__row outra"
+STAT_ROW_CLASS_RE = re.compile(r"(?:^|\s)stat__row(?:\s|$)")
+
+
+def resolve_parser(parser: Optional[str] = None) -> str:
+    """Backend efetivo: "lxml" só se estiver instalado, caso contrário "html.parser"."""
+    parser = parser or HTML_PARSER
+    if parser == "lxml" and lxml is None:
+        return "html.parser"
+    return parser
+
+
+def make_soup(html: str, parser: Optional[str] = None, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """BeautifulSoup com o backend configurado (lxml é várias vezes mais rápido)."""
+    return BeautifulSoup(html, resolve_parser(parser), parse_only=parse_only)
+
+
+def extract_next_data(html: str, parser: Optional[str] = None) -> Optional[dict]:
+    """
+    JSON do <script id="__NEXT_DATA__"> (Sofascore). Extrai o blob com uma
+    expressão regular, sem construir a árvore HTML; só se a regex falhar é
+    que a página é analisada por completo.
+    """
+    match = NEXT_DATA_RE.search(html)
+    if match:
+        raw = match.group(1)
+    else:
+        script = make_soup(html, parser).find("script", id="__NEXT_DATA__")
+        if not script:
+            return None
+        raw = script.text
+
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def _text(element, css_class: str) -> Optional[str]:
+    found = element.xpath(f".//*[{_CLASS_XPATH.format(css_class)}]")
+    return found[0].text_content() if found else None
+
+
+def parse_stat_rows(html: str, parser: Optional[str] = None) -> List[Tuple[str, str, str]]:
+    """
+    Linhas .stat__row do Flashscore como (categoria, valor casa, valor fora).
+    Com lxml usa XPath direto sobre a árvore; com html.parser só são
+    construídos os elementos .stat__row (SoupStrainer).
+    """
+    parser = resolve_parser(parser)
+    rows = []
+
+    if parser == "lxml":
+        for row in lxml.html.fromstring(html).xpath(STAT_ROW_XPATH):
+            category = _text(row, "stat__category")
+            home = _text(row, "stat__homeValue")
+            away = _text(row, "stat__awayValue")
+            if category is not None and home is not None and away is not None:
+                rows.append((category, home, away))
+        return rows
+
+    soup = make_soup(html, parser, parse_only=SoupStrainer(class_=STAT_ROW_CLASS_RE))
+    for row in soup.select(".stat__row"):
+        category = row.select_one(".stat__category")
+        home = row.select_one(".stat__homeValue")
+        away = row.select_one(".stat__awayValue")
+        if category and home and away:
+            rows.append((category.text, home.text, away.text))
+    return rows
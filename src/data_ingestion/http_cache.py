@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.config.settings import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES
+
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalhos guardados com cada resposta (validação condicional e decoding)
+KEPT_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: bytes
+    headers: Dict[str, str]
+    encoding: Optional[str]
+    stored_at: float
+    ttl: float
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        if math.isinf(self.ttl):
+            return True
+        return (now or time.time()) - self.stored_at < self.ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Cabeçalhos para um pedido condicional (If-None-Match / If-Modified-Since)."""
+        headers = {}
+        if self.headers.get("ETag"):
+            headers["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+
+class ResponseCache:
+    """
+    Cache em disco de respostas HTTP, endereçada pelo hash (sha256) do URL.
+
+    Cada entrada tem um corpo (<hash>.body) e metadados (<hash>.json) com o
+    TTL, os validadores (ETag/Last-Modified) e o sha256 do corpo. Quando o
+    tamanho total passa `max_bytes`, as entradas usadas há mais tempo são
+    removidas (LRU).
+
+    A mesma pasta pode ser partilhada por vários processos (os shards): os
+    ficheiros são escritos num temporário e trocados com os.replace, pelo
+    que nunca se lê um ficheiro a meio; um corpo e metadados de escritas
+    diferentes (sha256 não confere) contam como falha da cache. Entradas
+    escritas por outro processo são lidas do disco e entram no índice.
+    """
+
+    def __init__(self, cache_dir: Path = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()  # do menos para o mais recente
+        self._total = 0
+        self._load_index()
+
+    # ---------------------------------------------------------
+    # Índice LRU
+    # ---------------------------------------------------------
+
+    def _load_index(self):
+        bodies = sorted(self.cache_dir.glob("*/*.body"), key=lambda p: p.stat().st_mtime)
+        for body in bodies:
+            size = body.stat().st_size
+            self._sizes[body.stem] = size
+            self._total += size
+
+    def _paths(self, key: str):
+        folder = self.cache_dir / key[:2]
+        return folder / f"{key}.body", folder / f"{key}.json"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _evict(self):
+        while self._total > self.max_bytes and self._sizes:
+            key, size = self._sizes.popitem(last=False)
+            self._total -= size
+            for path in self._paths(key):
+                path.unlink(missing_ok=True)
+            logger.debug(f"Cache HTTP: removida entrada {key}")
+
+    # ---------------------------------------------------------
+    # API
+    # ---------------------------------------------------------
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        key = self.key(url)
+        body_path, meta_path = self._paths(key)
+
+        with self._lock:
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                body = body_path.read_bytes()
+            except (OSError, ValueError):
+                # Pode ter sido removida por outro processo
+                self._total -= self._sizes.pop(key, 0)
+                return None
+            digest = hashlib.sha256(body).hexdigest()
+            if meta.get("sha256", digest) != digest:
+                # Corpo e metadados de escritas concorrentes diferentes
+                return None
+
+            self._total += len(body) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(body)
+            self._evict()
+            try:
+                os.utime(body_path)  # persiste a ordem LRU entre execuções
+            except OSError:
+                pass
+
+        return CachedResponse(
+            url=url,
+            body=body,
+            headers=meta["headers"],
+            encoding=meta.get("encoding"),
+            stored_at=meta["stored_at"],
+            ttl=float(meta["ttl"]),
+        )
+
+    def put(self, url: str, body: bytes, headers: Dict[str, str], encoding: Optional[str], ttl: float):
+        key = self.key(url)
+        body_path, meta_path = self._paths(key)
+        meta = {
+            "url": url,
+            "headers": {h: headers[h] for h in KEPT_HEADERS if h in headers},
+            "encoding": encoding,
+            "stored_at": time.time(),
+            "ttl": "inf" if math.isinf(ttl) else ttl,
+            "sha256": hashlib.sha256(body).hexdigest(),
+        }
+
+        with self._lock:
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(body_path, body)
+            self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+            self._total += len(body) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(body)
+            self._evict()
+
+    def refresh(self, entry: CachedResponse):
+        """Marca uma entrada como revalidada (resposta 304) sem reescrever o corpo."""
+        _, meta_path = self._paths(self.key(entry.url))
+        with self._lock:
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return
+            meta["stored_at"] = entry.stored_at = time.time()
+            self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
@@ -0,0 +1,226 @@
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.config.settings import (
+    HTTP_MAX_PER_HOST,
+    HTTP_MAX_WORKERS,
+    HTTP_REQUESTS_PER_SECOND,
+    HTTP_TIMEOUT,
+)
+from src.data_ingestion.http_cache import CachedResponse, ResponseCache
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RateLimiter:
+    """Espaça os pedidos a um host para no máximo `rate` pedidos por segundo."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HttpClient:
+    """
+    Cliente HTTP partilhado pelos scrapers.
+
+    - uma requests.Session (keep-alive) por thread, com pool de ligações;
+      as sessões de threads que já terminaram (pools descartados) são
+      fechadas, e close() (ou `with HttpClient() as http:`) fecha todas
+    - limite de pedidos simultâneos por host
+    - rate limiting por host
+    - cache opcional em disco (ResponseCache): pedidos com `ttl` são servidos
+      da cache enquanto frescos e revalidados com ETag/Last-Modified depois;
+      com offline=True só a cache é usada (útil para repetir parsers)
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = HTTP_MAX_PER_HOST,
+        requests_per_second: Optional[float] = HTTP_REQUESTS_PER_SECOND,
+        timeout: float = HTTP_TIMEOUT,
+        cache: Optional[ResponseCache] = None,
+        offline: bool = False,
+    ):
+        self.max_per_host = max_per_host
+        self.requests_per_second = requests_per_second
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: Dict[threading.Thread, requests.Session] = {}
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_rates: Dict[str, RateLimiter] = {}
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions[threading.current_thread()] = session
+            self.close_finished_sessions()
+        return session
+
+    def close_finished_sessions(self):
+        """Fecha as sessões (e ligações) de threads que já terminaram."""
+        with self._lock:
+            finished = [t for t in self._sessions if not t.is_alive()]
+            sessions = [self._sessions.pop(t) for t in finished]
+        for session in sessions:
+            session.close()
+
+    def close(self):
+        """Fecha todas as sessões; o cliente pode continuar a ser usado (abre sessões novas)."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._local = threading.local()
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _host_limits(self, url: str) -> Tuple[threading.BoundedSemaphore, RateLimiter]:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+                self._host_rates[host] = RateLimiter(self.requests_per_second)
+            return self._host_slots[host], self._host_rates[host]
+
+    def _fetch(self, url: str, headers: Optional[dict], **kwargs) -> requests.Response:
+        slots, rate = self._host_limits(url)
+        kwargs.setdefault("timeout", self.timeout)
+
+        with slots:
+            rate.wait()
+            return self._session().get(url, headers=headers, **kwargs)
+
+    @staticmethod
+    def _from_cache(entry: CachedResponse) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = entry.url
+        resp._content = entry.body
+        resp.headers = CaseInsensitiveDict(entry.headers)
+        resp.encoding = entry.encoding
+        return resp
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        ttl: Optional[float] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        GET com limites por host. Se `ttl` (segundos, pode ser infinito) for
+        indicado e houver cache, a resposta é reutilizada/guardada na cache.
+        """
+        if self.cache is None or ttl is None:
+            if self.offline:
+                raise LookupError(f"Modo offline sem cache para {url}")
+            return self._fetch(url, headers, **kwargs)
+
+        entry = self.cache.get(url)
+        if entry is not None and (self.offline or entry.is_fresh()):
+            return self._from_cache(entry)
+        if self.offline:
+            raise LookupError(f"Sem resposta em cache para {url} (modo offline)")
+
+        conditional = dict(headers or {})
+        if entry is not None:
+            conditional.update(entry.validators())
+
+        resp = self._fetch(url, conditional, **kwargs)
+
+        if resp.status_code == 304 and entry is not None:
+            self.cache.refresh(entry)
+            return self._from_cache(entry)
+
+        if resp.status_code == 200:
+            self.cache.put(url, resp.content, dict(resp.headers), resp.encoding, ttl)
+
+        return resp
+
+
+_default_client: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def get_default_client() -> HttpClient:
+    """Cliente HTTP partilhado por todo o processo (criado na primeira utilização)."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient(cache=ResponseCache())
+            atexit.register(_default_client.close)
+        return _default_client
+
+
+def fetch_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = HTTP_MAX_WORKERS,
+    describe: Callable[[T], str] = str,
+    http: Optional[HttpClient] = None,
+) -> List[Tuple[T, R]]:
+    """
+    Aplica `fn` a cada item num pool de threads limitado e devolve os pares
+    (item, resultado) pela ordem original. Falhas ficam isoladas: são
+    registadas e o item é ignorado, tal como no ciclo sequencial.
+    Se `http` for indicado, as sessões abertas pelas threads do pool são
+    fechadas quando o pool termina.
+    """
+    items = list(items)
+
+    def _safe(item):
+        try:
+            return True, fn(item)
+        except Exception as e:
+            logger.error(f"Erro ao obter {describe(item)}: {e}")
+            return False, None
+
+    if max_workers <= 1:
+        outcomes = [_safe(item) for item in items]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            outcomes = list(pool.map(_safe, items))
+        if http is not None:
+            http.close_finished_sessions()
+
+    return [(item, result) for item, (ok, result) in zip(items, outcomes) if ok]
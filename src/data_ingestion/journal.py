@@ -0,0 +1,74 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set
+
+import pandas as pd
+
+from src.domain.record_store import RecordStore
+
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionJournal:
+    """
+    Journal append-only (JSON lines) das linhas já obtidas numa ingestão.
+
+    Cada linha é escrita (e sincronizada em disco) assim que o jogo termina,
+    pelo que uma ingestão interrompida pode ser retomada saltando os
+    `key` já presentes. Uma última linha truncada por um crash é ignorada.
+
+    Com `dtypes` (ex.: TABLE_DTYPES["match_stats"]), to_frame lê as linhas
+    diretamente para um RecordStore com esses dtypes, sem lista de dicts.
+    """
+
+    def __init__(self, path: Path, key: str = "match_id", dtypes: Optional[Dict[str, str]] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.key = key
+        self.dtypes = dtypes
+        self._lock = threading.Lock()
+
+    def _records(self) -> Iterator[dict]:
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Linha {line_number} inválida em {self.path} (ignorada)")
+
+    def done_ids(self) -> Set[str]:
+        return {record[self.key] for record in self._records()}
+
+    def append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def to_frame(self) -> pd.DataFrame:
+        """Todas as linhas do journal; para chaves repetidas fica a mais recente."""
+        if self.dtypes is None:
+            df = pd.DataFrame(list(self._records()))
+        else:
+            df = RecordStore.from_records(self.dtypes, self._records()).to_frame()
+        if df.empty:
+            return df
+        return df.drop_duplicates(subset=self.key, keep="last").reset_index(drop=True)
+
+    def compact(self):
+        """Reescreve o journal sem duplicados (substituição atómica)."""
+        df = self.to_frame()
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        df.to_json(tmp, orient="records", lines=True, force_ascii=False)
+        os.replace(tmp, self.path)
+
+    def reset(self):
+        self.path.unlink(missing_ok=True)
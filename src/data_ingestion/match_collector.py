@@ -1,24 +1,82 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.config.settings import HTTP_MAX_WORKERS
+from src.data_ingestion.entity_resolution import EntityResolver
 from src.data_ingestion.flashscore_scraper import FlashscoreScraper
-from src.data_ingestion.sofascore_scraper import SofascoreScraper
+from src.data_ingestion.http_client import HttpClient, fetch_concurrently, get_default_client
+from src.data_ingestion.sofascore_client import SofascoreScraper
+
+
+def _number(value):
+    """Valor de uma estatística como número ("55%" -> 55, "1.23" -> 1.23); None se não for numérico."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    text = str(value).strip().rstrip("%").replace(",", ".")
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def flatten_stats(stats: Dict[str, dict]) -> dict:
+    """{estatística: {home, away}} -> colunas de MatchStats ({estatística}_home / _away)."""
+    row = {}
+    for stat, values in stats.items():
+        row[f"{stat}_home"] = _number(values.get("home"))
+        row[f"{stat}_away"] = _number(values.get("away"))
+    return row
+
 
 class MatchCollector:
-    def __init__(self):
-        self.flash = FlashscoreScraper()
-        self.sofa = SofascoreScraper()
+    def __init__(self, http: Optional[HttpClient] = None, resolver: Optional[EntityResolver] = None):
+        # Os dois scrapers partilham as mesmas sessões e limites por host
+        self.http = http or get_default_client()
+        self.flash = FlashscoreScraper(self.http)
+        self.sofa = SofascoreScraper(self.http)
+        self.resolver = resolver or EntityResolver()
 
-    def collect_stats(self, flash_url: str, sofa_url: str | None = None):
+    def collect_stats(self, flash_url: str, sofa_url: str | None = None, finished: bool = True) -> dict:
+        """
+        Estatísticas de um jogo como colunas de MatchStats. As chaves de
+        cada fonte (em português no Flashscore, em inglês no Sofascore) são
+        resolvidas para os mesmos nomes; chaves sem correspondência ficam
+        no relatório do resolver.
+        """
         # Flashscore primeiro
         try:
-            stats = self.flash.get_match_stats(flash_url)
+            stats = self.resolver.canonical_stats(self.flash.get_match_stats(flash_url, finished), "flashscore")
         except:
             stats = {}
 
-        # Sofascore fallback
+        # Sofascore fallback: só preenche estatísticas em falta no Flashscore
         if sofa_url:
             try:
-                sofa_stats = self.sofa.get_match_stats(sofa_url)
-                stats.update(sofa_stats)
+                sofa_stats = self.resolver.canonical_stats(self.sofa.get_match_stats(sofa_url, finished), "sofascore")
+                for stat, values in sofa_stats.items():
+                    current = stats.get(stat, {})
+                    stats[stat] = {side: current.get(side) if current.get(side) is not None else values.get(side)
+                                   for side in ("home", "away")}
             except:
                 pass
 
-        return stats
+        return flatten_stats(stats)
+
+    def collect_many(
+        self,
+        urls: List[Tuple[str, Optional[str]]],
+        max_workers: int = HTTP_MAX_WORKERS,
+        finished: bool = True,
+    ) -> List[dict]:
+        """
+        collect_stats para vários jogos em paralelo. `urls` é uma lista de
+        pares (flash_url, sofa_url); o resultado mantém a mesma ordem.
+        """
+        results = fetch_concurrently(
+            lambda pair: self.collect_stats(*pair, finished=finished),
+            urls,
+            max_workers=max_workers,
+            describe=lambda pair: f"stats de {pair[0]}",
+            http=self.http,
+        )
+        return [stats for _, stats in results]
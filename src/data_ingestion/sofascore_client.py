@@ -1,6 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+import re
+from dataclasses import fields
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src.config.settings import HTTP_CACHE_TTL_FINISHED, HTTP_CACHE_TTL_FIXTURES
+from src.data_ingestion.entity_resolution import EntityResolver
+from src.data_ingestion.html_parsing import extract_next_data
+from src.data_ingestion.http_client import HttpClient, get_default_client
+from src.domain.schemas import MatchInfo, MatchStats
+
 
 class SofascoreScraper:
     BASE_URL = "https://www.sofascore.com"
@@ -10,20 +18,17 @@ class SofascoreScraper:
         "Referer": "https://www.sofascore.com/"
     }
 
-    def get_match_stats(self, match_url: str) -> dict:
+    def __init__(self, http: HttpClient | None = None):
+        self.http = http or get_default_client()
+
+    def get_match_stats(self, match_url: str, finished: bool = True) -> dict:
         url = self.BASE_URL + match_url
-        resp = requests.get(url, headers=self.headers)
+        ttl = HTTP_CACHE_TTL_FINISHED if finished else 0
+        resp = self.http.get(url, headers=self.headers, ttl=ttl)
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        script = soup.find("script", id="__NEXT_DATA__")
-
-        if not script:
-            return {}
-
-        try:
-            data = json.loads(script.text)
-        except:
+        data = extract_next_data(resp.text)
+        if data is None:
             return {}
 
         try:
@@ -41,3 +46,134 @@ class SofascoreScraper:
                 }
 
         return parsed
+
+
+# Estatísticas "certos de um total": o total vem no mesmo item (homeTotal/awayTotal)
+TOTAL_OF = {
+    "passes_completed": "passes_total",
+    "long_passes_completed": "long_passes_total",
+    "crosses_completed": "crosses_total",
+    "final_third_passes_completed": "final_third_passes_total",
+    "tackles_won": "tackles_total",
+}
+
+
+def _item_value(item: dict, side: str):
+    """Valor numérico de um item de estatísticas da API ("55%", "20/45 (44%)" -> 55, 20)."""
+    value = item.get(f"{side}Value")
+    if value is not None:
+        return value
+    match = re.match(r"\s*(-?\d+(?:[.,]\d+)?)", str(item.get(side, "")))
+    return float(match.group(1).replace(",", ".")) if match else None
+
+
+def _season_labels(season: str) -> set:
+    """Nomes possíveis de uma época na API: "2022-2023" -> {"22/23", "2022/2023", ...}."""
+    start, _, end = season.partition("-")
+    labels = {season, season.replace("-", "/")}
+    if start and end:
+        labels.add(f"{start[-2:]}/{end[-2:]}")
+    return labels
+
+
+class SofascoreClient:
+    """
+    Cliente da API JSON do Sofascore, usado na ingestão (update_pipeline):
+    jogos de uma liga por época e estatísticas de um jogo por match_id (o
+    id do evento no Sofascore). Usa o HttpClient partilhado (limites por
+    host e cache em disco); as chaves das estatísticas são resolvidas para
+    os nomes de MatchStats pelo EntityResolver.
+    """
+    API_URL = "https://api.sofascore.com/api/v1"
+
+    headers = SofascoreScraper.headers
+
+    def __init__(self, http: HttpClient | None = None, resolver: Optional[EntityResolver] = None):
+        self.http = http or get_default_client()
+        self.resolver = resolver or EntityResolver()
+
+    def _get_json(self, path: str, ttl: float) -> dict:
+        resp = self.http.get(self.API_URL + path, headers=self.headers, ttl=ttl)
+        resp.raise_for_status()
+        return resp.json()
+
+    def get_season_id(self, season: str, league_id: int) -> int:
+        data = self._get_json(f"/unique-tournament/{league_id}/seasons", HTTP_CACHE_TTL_FIXTURES)
+        labels = _season_labels(season)
+        for item in data.get("seasons", []):
+            if item.get("year") in labels or item.get("name") in labels:
+                return item["id"]
+        raise LookupError(f"Época {season} não encontrada no Sofascore (liga {league_id})")
+
+    def _events(self, league_id: int, season_id: int, direction: str) -> List[dict]:
+        """
+        Todas as páginas de jogos numa direção ("last" ou "next"). Só um 404
+        (sem jogos nessa direção / depois da última página) ou hasNextPage
+        falso terminam a paginação; qualquer outro erro (rede, HTTP, JSON)
+        é propagado, para que a lista de jogos nunca fique cortada em silêncio.
+        """
+        events, page = [], 0
+        while True:
+            resp = self.http.get(
+                f"{self.API_URL}/unique-tournament/{league_id}/season/{season_id}/events/{direction}/{page}",
+                headers=self.headers,
+                ttl=HTTP_CACHE_TTL_FIXTURES,
+            )
+            if resp.status_code == 404:
+                break
+            resp.raise_for_status()
+
+            data = resp.json()
+            events.extend(data.get("events", []))
+            if not data.get("hasNextPage"):
+                break
+            page += 1
+        return events
+
+    def get_matches_by_season(self, season: str, league_id: int) -> List[MatchInfo]:
+        """Jogos (terminados e por jogar) de uma liga numa época, por ordem de data."""
+        season_id = self.get_season_id(season, league_id)
+        events = {}
+        for direction in ("last", "next"):
+            for event in self._events(league_id, season_id, direction):
+                events[event["id"]] = event
+
+        matches = []
+        for event in sorted(events.values(), key=lambda e: e.get("startTimestamp", 0)):
+            finished = event.get("status", {}).get("type") == "finished"
+            kickoff = datetime.fromtimestamp(event.get("startTimestamp", 0), tz=timezone.utc)
+            matches.append(MatchInfo(
+                match_id=str(event["id"]),
+                season=season,
+                round_number=event.get("roundInfo", {}).get("round"),
+                date=kickoff.strftime("%Y-%m-%d"),
+                home_team=event["homeTeam"]["name"],
+                away_team=event["awayTeam"]["name"],
+                home_score=event.get("homeScore", {}).get("current") if finished else None,
+                away_score=event.get("awayScore", {}).get("current") if finished else None,
+            ))
+        return matches
+
+    def get_match_stats(self, match_id: str, finished: bool = True) -> MatchStats:
+        """
+        Estatísticas do jogo inteiro (período "ALL") como MatchStats; as que
+        a API não tem ficam a None. Jogos terminados ficam em cache sem
+        expirar; os restantes são sempre revalidados.
+        """
+        ttl = HTTP_CACHE_TTL_FINISHED if finished else 0
+        data = self._get_json(f"/event/{match_id}/statistics", ttl)
+
+        values: Dict[str, object] = {f.name: None for f in fields(MatchStats)}
+        periods = data.get("statistics", [])
+        period = next((p for p in periods if p.get("period") == "ALL"), periods[0] if periods else {})
+        for group in period.get("groups", []):
+            for item in group.get("statisticsItems", []):
+                stat = self.resolver.resolve_stat(item.get("name", ""), "sofascore")
+                if stat is None:
+                    continue
+                for side in ("home", "away"):
+                    values[f"{stat}_{side}"] = _item_value(item, side)
+                    total = TOTAL_OF.get(stat)
+                    if total and item.get(f"{side}Total") is not None and values[f"{total}_{side}"] is None:
+                        values[f"{total}_{side}"] = item[f"{side}Total"]
+        return MatchStats(**values)
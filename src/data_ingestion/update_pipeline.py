@@ -1,62 +1,117 @@
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import pandas as pd
 
-from src.config.settings import RAW_DIR, SEASONS
+from src.config.settings import HTTP_MAX_WORKERS, PROCESSED_DIR, RAW_DIR, SEASONS
+from src.data_ingestion.http_client import fetch_concurrently
+from src.data_ingestion.journal import IngestionJournal
 from src.data_ingestion.sofascore_client import SofascoreClient
-from src.domain.schemas import MatchInfo, MatchStats
+from src.domain.record_store import RecordStore, record_values
+from src.domain.schemas import TABLE_DTYPES, MatchInfo, MatchStats
+from src.features.team_aggregates import update_team_aggregates
+from src.utils.io import write_table
 
 
 logger = logging.getLogger(__name__)
 
 
-def update_data_for_league(league_id: int) -> None:
+def _stats_row(m: MatchInfo, stats: MatchStats) -> dict:
+    return {
+        "match_id": m.match_id,
+        "season": m.season,
+        "round_number": m.round_number,
+        "date": m.date,
+        "home_team": m.home_team,
+        "away_team": m.away_team,
+        "home_score": m.home_score,
+        "away_score": m.away_score,
+        # Flatten de MatchStats
+        **record_values(stats),
+    }
+
+
+def update_data_for_league(
+    league_id: int,
+    max_workers: int = HTTP_MAX_WORKERS,
+    resume: bool = True,
+    seasons: List[str] = SEASONS,
+    raw_dir: Path = RAW_DIR,
+    processed_dir: Path = PROCESSED_DIR,
+) -> None:
     """
     Orquestra o update de dados:
-    - Vai buscar jogos por época
-    - Vai buscar estatísticas de cada jogo
-    - Guarda em CSVs em data/raw
+    - Vai buscar jogos por época (`seasons`)
+    - Vai buscar estatísticas de cada jogo (até `max_workers` em paralelo;
+      max_workers=1 mantém o modo sequencial)
+    - Guarda as tabelas em `raw_dir` (Parquet por época + CSV)
+    - Recalcula os agregados por equipa/época (`processed_dir`)
+
+    Cada jogo terminado é escrito num journal (`raw_dir`/_journal) assim que
+    as suas estatísticas chegam. Com resume=True, os match_id já no journal
+    não voltam a ser pedidos; resume=False recomeça do zero. As tabelas
+    finais são geradas a partir do journal e substituídas de forma atómica.
+
+    As linhas são acumuladas em RecordStore (colunas com os dtypes de
+    TABLE_DTYPES) em vez de listas de dicts, o que limita a memória de
+    back-fills com várias épocas.
     """
     client = SofascoreClient()
-    raw_path = Path(RAW_DIR)
+    raw_path = Path(raw_dir)
     raw_path.mkdir(parents=True, exist_ok=True)
 
-    all_matches: List[MatchInfo] = []
-    all_stats_rows = []
+    matches_journal = IngestionJournal(raw_path / "_journal" / "matches.jsonl", dtypes=TABLE_DTYPES["matches"])
+    stats_journal = IngestionJournal(raw_path / "_journal" / "match_stats.jsonl", dtypes=TABLE_DTYPES["match_stats"])
+    if not resume:
+        matches_journal.reset()
+        stats_journal.reset()
 
-    for season in SEASONS:
-        matches = client.get_matches_by_season(season=season, league_id=league_id)
-        all_matches.extend(matches)
+    done = stats_journal.done_ids()
+    # Jogos por terminar não entram no journal (as stats ainda vão mudar)
+    pending = RecordStore(TABLE_DTYPES["match_stats"])
+
+    def _fetch(m: MatchInfo) -> Optional[MatchStats]:
+        stats = client.get_match_stats(m.match_id, finished=m.home_score is not None)
+        if m.home_score is None:
+            return stats
+        stats_journal.append(_stats_row(m, stats))
+        return None
 
+    for season in seasons:
+        matches = client.get_matches_by_season(season=season, league_id=league_id)
         for m in matches:
-            try:
-                stats = client.get_match_stats(m.match_id)
-            except Exception as e:
-                logger.error(f"Erro ao obter stats para match_id={m.match_id}: {e}")
-                continue
-
-            row = {
-                "match_id": m.match_id,
-                "season": m.season,
-                "round_number": m.round_number,
-                "date": m.date,
-                "home_team": m.home_team,
-                "away_team": m.away_team,
-                "home_score": m.home_score,
-                "away_score": m.away_score,
-                # Flatten de MatchStats
-                **stats.__dict__,
-            }
-            all_stats_rows.append(row)
+            matches_journal.append(record_values(m))
+
+        todo = [m for m in matches if m.match_id not in done]
+        logger.info(f"Época {season}: {len(matches) - len(todo)} jogos já no journal, {len(todo)} por obter")
+
+        fetched = fetch_concurrently(
+            _fetch,
+            todo,
+            max_workers=max_workers,
+            describe=lambda m: f"stats para match_id={m.match_id}",
+            http=client.http,
+        )
+        for m, stats in fetched:
+            if stats is not None:
+                pending.append(m, stats)
 
     # Guardar jogos
-    matches_df = pd.DataFrame([m.__dict__ for m in all_matches])
-    matches_df.to_csv(raw_path / "matches.csv", index=False)
+    matches_df = matches_journal.to_frame()
+    write_table(matches_df, raw_path, "matches")
 
     # Guardar stats
-    stats_df = pd.DataFrame(all_stats_rows)
-    stats_df.to_csv(raw_path / "match_stats.csv", index=False)
+    stats_df = pd.concat([stats_journal.to_frame(), pending.to_frame()], ignore_index=True)
+    write_table(stats_df, raw_path, "match_stats")
+
+    matches_journal.compact()
+    stats_journal.compact()
+
+    # Tabela agregada por equipa/época usada na página de análise de equipas
+    update_team_aggregates(raw_path, processed_dir)
+
+    # Estatísticas da API sem correspondência em MatchStats
+    client.resolver.report()
 
-    logger.info(f"Guardados {len(all_matches)} jogos e {len(all_stats_rows)} linhas de stats em {RAW_DIR}")
+    logger.info(f"Guardados {len(matches_df)} jogos e {len(stats_df)} linhas de stats em {raw_path}")
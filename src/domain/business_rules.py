@@ -1,5 +1,9 @@
 from dataclasses import dataclass
-from typing import Literal
+from typing import Dict, Literal, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.special import pdtr, pdtrc
 
 from src.domain.schemas import MatchPrediction
 
@@ -14,31 +18,107 @@ class BettingSignal:
     rationale: str
 
 
+# Mercados: nome -> (coluna prevista casa, coluna prevista fora)
+MARKETS = {
+    "corners": ("predicted_corners_home", "predicted_corners_away"),
+    "shots": ("predicted_shots_home", "predicted_shots_away"),
+    "cards": ("predicted_yellow_cards_home", "predicted_yellow_cards_away"),
+}
+
+MARKET_LABELS = {"corners": "Total Cantos", "shots": "Total Remates", "cards": "Total Cartões"}
+
+DEFAULT_LINES = {
+    "corners": np.arange(6.5, 14.0, 1.0),
+    "shots": np.arange(16.5, 32.0, 1.0),
+    "cards": np.arange(2.5, 7.0, 1.0),
+}
+
+SUGGESTIONS = ["none", "over", "under"]
+
+# Probabilidade mínima (over ou under) para sugerir uma aposta
+MIN_PROBABILITY = 0.6
+
+
+def poisson_over_under(expected: np.ndarray, lines: np.ndarray):
+    """
+    P(total > linha) e P(total < linha) com total ~ Poisson(expected), para
+    todas as combinações jogo x linha (arrays n x k). Em linhas inteiras a
+    diferença para 1 é a probabilidade de empate com a linha (push).
+    """
+    lam = np.asarray(expected, dtype=float)[:, None]
+    lines = np.asarray(lines, dtype=float)[None, :]
+
+    p_over = pdtrc(np.floor(lines), lam)       # P(X > floor(linha))
+    p_under = pdtr(np.ceil(lines) - 1, lam)    # P(X <= ceil(linha) - 1)
+    return p_over, p_under
+
+
+def derive_signals(
+    predictions: pd.DataFrame,
+    lines: Dict[str, Sequence[float]] = DEFAULT_LINES,
+    min_probability: float = MIN_PROBABILITY,
+) -> pd.DataFrame:
+    """
+    Sinais para todos os jogos de `predictions` (colunas de MatchPrediction)
+    e todas as linhas de cada mercado de `lines`, numa tabela longa com uma
+    linha por jogo, mercado e linha: total esperado, p_over, p_under e a
+    sugestão ("over"/"under" se a probabilidade >= min_probability).
+
+    O total de cada mercado é tratado como Poisson com média igual à soma das
+    previsões casa + fora; todas as probabilidades são calculadas de uma vez.
+    """
+    n = len(predictions)
+    frames = []
+
+    for market, market_lines in lines.items():
+        col_home, col_away = MARKETS[market]
+        market_lines = np.asarray(market_lines, dtype=float)
+        k = len(market_lines)
+
+        expected = (predictions[col_home].to_numpy(dtype=float)
+                    + predictions[col_away].to_numpy(dtype=float))
+        p_over, p_under = poisson_over_under(expected, market_lines)
+
+        # Códigos 0/1/2 -> SUGGESTIONS (evita arrays de strings)
+        codes = np.where(p_over >= min_probability, 1, np.where(p_under >= min_probability, 2, 0))
+        suggestion = pd.Categorical.from_codes(codes.ravel(), categories=SUGGESTIONS)
+
+        frames.append(pd.DataFrame({
+            "match_id": np.repeat(predictions["match_id"].to_numpy(), k),
+            "home_team": np.repeat(predictions["home_team"].to_numpy(), k),
+            "away_team": np.repeat(predictions["away_team"].to_numpy(), k),
+            "market": market,
+            "line": np.tile(market_lines, n),
+            "expected": np.repeat(expected, k),
+            "p_over": p_over.ravel(),
+            "p_under": p_under.ravel(),
+            "suggestion": suggestion,
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+
 def derive_corners_signal(pred: MatchPrediction, line: float = 9.5) -> BettingSignal:
     """
-    Exemplo de regra de negócio:
-    - se cantos esperados totais > line + margem → over
-    - se < line - margem → under
+    Sinal de cantos de um único jogo e linha (ver derive_signals):
+    - P(total > line) >= MIN_PROBABILITY → over
+    - P(total < line) >= MIN_PROBABILITY → under
     - caso contrário → none
     """
-    total_corners = pred.predicted_corners_home + pred.predicted_corners_away
-    margin = 1.0
-
-    if total_corners > line + margin:
-        suggestion = "over"
-        rationale = f"Total esperado de cantos ({total_corners:.2f}) acima da linha {line}"
-    elif total_corners < line - margin:
-        suggestion = "under"
-        rationale = f"Total esperado de cantos ({total_corners:.2f}) abaixo da linha {line}"
+    signal = derive_signals(pd.DataFrame([pred.__dict__]), {"corners": [line]}).iloc[0]
+
+    if signal["suggestion"] == "over":
+        rationale = f"P(cantos > {line}) = {signal['p_over']:.0%} (esperados {signal['expected']:.2f})"
+    elif signal["suggestion"] == "under":
+        rationale = f"P(cantos < {line}) = {signal['p_under']:.0%} (esperados {signal['expected']:.2f})"
     else:
-        suggestion = "none"
-        rationale = f"Total esperado de cantos ({total_corners:.2f}) próximo da linha {line}"
+        rationale = f"Total esperado de cantos ({signal['expected']:.2f}) próximo da linha {line}"
 
     return BettingSignal(
         match_id=pred.match_id,
         home_team=pred.home_team,
         away_team=pred.away_team,
-        market=f"Total Cantos {line}",
-        suggestion=suggestion,
+        market=f"{MARKET_LABELS['corners']} {line}",
+        suggestion=signal["suggestion"],
         rationale=rationale,
     )
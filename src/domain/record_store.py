@@ -0,0 +1,187 @@
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# dtype da tabela -> dtype numpy do armazenamento
+STORAGE_DTYPES = {
+    "Int16": np.int16,     # contagens (nulos numa máscara à parte)
+    "float32": np.float32,
+    "float64": np.float64,
+    "string": object,
+    "object": object,
+}
+
+
+def record_values(record) -> Dict[str, Any]:
+    """Campos de um registo (dataclass, também com __slots__, ou mapping) num dict."""
+    if isinstance(record, Mapping):
+        return dict(record)
+    return {f.name: getattr(record, f.name) for f in fields(record)}
+
+
+def _is_missing(value) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and value != value)
+
+
+class RecordStore:
+    """
+    Tabela em memória guardada por colunas, com dtypes fixos (ex.:
+    TABLE_DTYPES["match_stats"]: contagens em int16, xG em float32).
+
+    As colunas do mesmo dtype partilham um bloco numpy 2D (uma linha do
+    bloco por coluna) pré-alocado, que duplica de tamanho quando enche. Cada
+    registo acrescentado (dataclass ou dict) é escrito diretamente nos blocos:
+    não fica nenhum objeto Python por jogo em memória.
+
+    to_frame() e column() devolvem vistas sobre os blocos, sem cópia (as
+    colunas de texto passam a "string"). Linhas acrescentadas depois não
+    alteram as vistas já devolvidas.
+    """
+
+    __slots__ = ("dtypes", "_position", "_blocks", "_mask", "_size", "_capacity")
+
+    def __init__(self, dtypes: Dict[str, str], capacity: int = 1024):
+        unknown = set(dtypes.values()) - set(STORAGE_DTYPES)
+        if unknown:
+            raise ValueError(f"dtypes não suportados: {sorted(unknown)} (opções: {list(STORAGE_DTYPES)})")
+
+        self.dtypes = dict(dtypes)
+        self._size = 0
+        self._capacity = max(int(capacity), 1)
+
+        # coluna -> (dtype, linha no bloco desse dtype)
+        self._position = {}
+        counts: Dict[str, int] = {}
+        for name, dtype in self.dtypes.items():
+            self._position[name] = (dtype, counts.get(dtype, 0))
+            counts[dtype] = counts.get(dtype, 0) + 1
+
+        self._blocks = {dtype: self._allocate(dtype, k, self._capacity) for dtype, k in counts.items()}
+        self._mask = np.zeros((counts.get("Int16", 0), self._capacity), dtype=bool)
+
+    @classmethod
+    def from_records(cls, dtypes: Dict[str, str], records: Iterable, capacity: int = 1024) -> "RecordStore":
+        store = cls(dtypes, capacity)
+        store.extend(records)
+        return store
+
+    @staticmethod
+    def _allocate(dtype: str, n_columns: int, capacity: int) -> np.ndarray:
+        storage = STORAGE_DTYPES[dtype]
+        if storage is object:
+            return np.full((n_columns, capacity), None, dtype=object)
+        if dtype == "Int16":
+            return np.zeros((n_columns, capacity), dtype=storage)
+        return np.full((n_columns, capacity), np.nan, dtype=storage)
+
+    def _grow(self):
+        capacity = self._capacity * 2
+        for dtype, block in self._blocks.items():
+            new = self._allocate(dtype, block.shape[0], capacity)
+            new[:, :self._size] = block[:, :self._size]
+            self._blocks[dtype] = new
+
+        mask = np.zeros((self._mask.shape[0], capacity), dtype=bool)
+        mask[:, :self._size] = self._mask[:, :self._size]
+        self._mask, self._capacity = mask, capacity
+
+    # ---------------------------------------------------------
+    # Escrita
+    # ---------------------------------------------------------
+
+    def append(self, *records):
+        """
+        Acrescenta uma linha com os campos de `records` (ex.: MatchInfo e
+        MatchStats do mesmo jogo); em campos repetidos vale o último registo.
+        Colunas sem valor ficam em falta; campos fora de `dtypes` são ignorados.
+        """
+        values = {}
+        for record in records:
+            values.update(record_values(record))
+
+        if self._size == self._capacity:
+            self._grow()
+        i = self._size
+
+        for name, (dtype, row) in self._position.items():
+            value = values.get(name)
+            missing = _is_missing(value)
+            if dtype == "Int16":
+                self._mask[row, i] = missing
+                self._blocks[dtype][row, i] = 0 if missing else value
+            elif STORAGE_DTYPES[dtype] is object:
+                self._blocks[dtype][row, i] = None if missing else value
+            else:
+                self._blocks[dtype][row, i] = np.nan if missing else value
+
+        self._size += 1
+
+    def extend(self, records: Iterable):
+        for record in records:
+            self.append(record)
+
+    # ---------------------------------------------------------
+    # Leitura (vistas sem cópia)
+    # ---------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.dtypes)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória reservada pelos blocos (nas colunas de texto, só os ponteiros)."""
+        return sum(block.nbytes for block in self._blocks.values()) + self._mask.nbytes
+
+    def column(self, name: str) -> np.ndarray:
+        """Vista da coluna `name` (nas colunas Int16, os valores em falta estão a 0, ver mask)."""
+        dtype, row = self._position[name]
+        return self._blocks[dtype][row, :self._size]
+
+    def mask(self, name: str) -> Optional[np.ndarray]:
+        """Vista dos valores em falta de uma coluna Int16 (None para os outros dtypes)."""
+        dtype, row = self._position[name]
+        return self._mask[row, :self._size] if dtype == "Int16" else None
+
+    def to_numpy(self, columns: Sequence[str]) -> np.ndarray:
+        """
+        Matriz n x k com `columns`, todas do mesmo dtype. É uma vista sem
+        cópia quando as colunas estão seguidas e pela ordem do bloco (ex.: as
+        colunas float32 de MatchStats); caso contrário é uma cópia. Colunas
+        Int16 com valores em falta passam a float32 com NaN.
+        """
+        positions = [self._position[name] for name in columns]
+        dtypes = {dtype for dtype, _ in positions}
+        if len(dtypes) != 1:
+            raise ValueError(f"to_numpy exige colunas do mesmo dtype (recebidos: {sorted(dtypes)})")
+
+        dtype = dtypes.pop()
+        rows = [row for _, row in positions]
+        if rows == list(range(rows[0], rows[0] + len(rows))):
+            rows = slice(rows[0], rows[0] + len(rows))
+        matrix = self._blocks[dtype][rows, :self._size].T
+
+        if dtype == "Int16":
+            missing = self._mask[rows, :self._size].T
+            if missing.any():
+                matrix = np.where(missing, np.nan, matrix.astype(np.float32))
+        return matrix
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame com os dtypes da tabela, sobre a memória do store (sem cópia nas colunas numéricas)."""
+        data = {}
+        for name, (dtype, row) in self._position.items():
+            values = self._blocks[dtype][row, :self._size]
+            if dtype == "Int16":
+                data[name] = pd.arrays.IntegerArray(values, self._mask[row, :self._size])
+            elif dtype == "string":
+                data[name] = pd.array(values, dtype="string")
+            else:
+                data[name] = values
+        return pd.DataFrame(data, columns=self.columns, copy=False)
@@ -1,12 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Optional, Dict, Any
 
 
 # ============================================================
 # 1. Representação básica de um jogo (informação bruta)
 # ============================================================
+# (slots=True: sem __dict__ por instância; para muitos jogos em memória,
+# ver RecordStore em src/domain/record_store.py)
 
-@dataclass
+@dataclass(slots=True)
 class MatchInfo:
     match_id: str
     season: str
@@ -22,7 +24,7 @@ class MatchInfo:
 # 2. Estatísticas completas do jogo (raw → processed)
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class MatchStats:
     # Principais
     xg_home: float
@@ -122,7 +124,7 @@ class MatchStats:
 # 3. Features para Machine Learning
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class MatchFeatures:
     match_id: str
     home_team: str
@@ -182,3 +184,30 @@ class MatchPrediction:
     confidence_low: Optional[Dict[str, float]] = None
     confidence_high: Optional[Dict[str, float]] = None
 
+
+
+# ============================================================
+# 5. Tipos das tabelas persistidas (data/raw, data/processed)
+# ============================================================
+
+def dataclass_dtypes(cls) -> Dict[str, str]:
+    """
+    dtypes pandas para os campos de um dataclass:
+    contagens -> Int16 (aceita nulos), métricas contínuas -> float32, texto -> string.
+    """
+    dtypes = {}
+    for f in fields(cls):
+        annotation = str(f.type)
+        if "int" in annotation:
+            dtypes[f.name] = "Int16"
+        elif "float" in annotation:
+            dtypes[f.name] = "float32"
+        elif "str" in annotation:
+            dtypes[f.name] = "string"
+    return dtypes
+
+
+TABLE_DTYPES: Dict[str, Dict[str, str]] = {
+    "matches": dataclass_dtypes(MatchInfo),
+    "match_stats": {**dataclass_dtypes(MatchInfo), **dataclass_dtypes(MatchStats)},
+}
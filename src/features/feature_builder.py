@@ -1,44 +1,140 @@
 import pandas as pd
+from dataclasses import fields
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from src.config.settings import RAW_DIR, PROCESSED_DIR
-from src.domain.schemas import MatchFeatures
+from src.domain.record_store import RecordStore
+from src.domain.schemas import MatchFeatures, dataclass_dtypes
+from src.features.team_index import TeamIndex
+from src.features.team_match import FEATURE_METRICS
+from src.utils.io import read_table, write_table
+
+
+ENGINES = ("vectorized", "iterrows")
+
+# Únicas colunas de match_stats usadas nas features
+STATS_COLUMNS = ["match_id"] + [col for cols in FEATURE_METRICS.values() for col in cols]
+
+# Colunas de MatchFeatures no RecordStore (médias em float64, como no engine vetorizado)
+FEATURE_DTYPES = {
+    **{name: "float64" if dtype == "float32" else dtype for name, dtype in dataclass_dtypes(MatchFeatures).items()},
+    "extra": "object",
+}
+
+
+def merge_match_frames(matches_df: pd.DataFrame, stats_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Junta jogos e estatísticas (uma linha por jogo). As colunas numéricas
+    passam a float64 para que nulos (Int16) se comportem como NaN.
+    """
+    df = matches_df.merge(stats_df, on="match_id", how="left")
+    numeric = df.select_dtypes("number").columns
+    return df.astype({col: "float64" for col in numeric})
+
+
+def load_match_frame(raw_dir: Path = RAW_DIR) -> pd.DataFrame:
+    """Lê de data/raw apenas as colunas necessárias às features e junta-as."""
+    matches_df = read_table(raw_dir, "matches")
+    stats_df = read_table(raw_dir, "match_stats", columns=STATS_COLUMNS)
+    return merge_match_frames(matches_df, stats_df)
+
+
+def features_from_aggregates(matches: pd.DataFrame, home: pd.DataFrame, away: pd.DataFrame) -> pd.DataFrame:
+    """
+    Monta as colunas de MatchFeatures a partir dos agregados (médias por
+    equipa e forma, ver TeamIndex.aggregates) das equipas da casa e de fora,
+    alinhados linha a linha com `matches`.
+    """
+    # Colunas montadas num dict e convertidas num único DataFrame no fim
+    out = {
+        "match_id": matches["match_id"].to_numpy(),
+        "home_team": matches["home_team"].to_numpy(),
+        "away_team": matches["away_team"].to_numpy(),
+    }
+    for name in FEATURE_METRICS:
+        out[f"home_avg_{name}"] = home[f"{name}_for"].to_numpy(dtype=float)
+        out[f"away_avg_{name}"] = away[f"{name}_for"].to_numpy(dtype=float)
+
+    out["home_form_last5"] = home["form_last5"].to_numpy(dtype=float)
+    out["away_form_last5"] = away["form_last5"].to_numpy(dtype=float)
+
+    out["home_home_performance"] = out["home_avg_shots"]
+    out["away_away_performance"] = away["shots_against"].to_numpy(dtype=float)
+
+    for name in FEATURE_METRICS:
+        out[f"delta_{name}"] = out[f"home_avg_{name}"] - out[f"away_avg_{name}"]
+
+    out["extra"] = None
+    return pd.DataFrame(out, columns=[f.name for f in fields(MatchFeatures)])
 
 
 class FeatureBuilder:
     """
     Constrói features para treino e previsão.
+
+    engine="vectorized" (por omissão) calcula todas as médias e formas numa
+    única passagem sobre a tabela longa equipa-jogo; engine="iterrows" mantém
+    o cálculo original jogo a jogo (útil para validação).
+
+    Com point_in_time=True cada jogo usa apenas o histórico estritamente
+    anterior à sua data (sem fuga de informação do futuro), obtido através
+    de um índice por equipa ordenado por data.
     """
 
-    def __init__(self):
-        self.raw_matches_path = Path(RAW_DIR) / "matches.csv"
-        self.raw_stats_path = Path(RAW_DIR) / "match_stats.csv"
-        self.processed_path = Path(PROCESSED_DIR)
+    def __init__(
+        self,
+        matches_df: Optional[pd.DataFrame] = None,
+        stats_df: Optional[pd.DataFrame] = None,
+        engine: str = "vectorized",
+        processed_dir: Path = PROCESSED_DIR,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Engine desconhecido: {engine} (opções: {ENGINES})")
+        self.engine = engine
+
+        self.processed_path = Path(processed_dir)
         self.processed_path.mkdir(parents=True, exist_ok=True)
 
-        self.matches_df = pd.read_csv(self.raw_matches_path)
-        self.stats_df = pd.read_csv(self.raw_stats_path)
+        self.matches_df = matches_df if matches_df is not None else read_table(RAW_DIR, "matches")
+        self.stats_df = (
+            stats_df if stats_df is not None
+            else read_table(RAW_DIR, "match_stats", columns=STATS_COLUMNS)
+        )
 
         # Merge inicial
-        self.df = self.matches_df.merge(self.stats_df, on="match_id", how="left")
+        self.df = merge_match_frames(self.matches_df, self.stats_df)
+
+        # Índice por equipa ordenado por data, construído uma única vez
+        self._team_index: Optional[TeamIndex] = None
+
+    @property
+    def team_index(self) -> TeamIndex:
+        if self._team_index is None:
+            self._team_index = TeamIndex(self.df)
+        return self._team_index
 
     # ---------------------------------------------------------
     # 1) Funções auxiliares
     # ---------------------------------------------------------
 
-    def _team_history(self, team: str) -> pd.DataFrame:
-        """Filtra todos os jogos de uma equipa."""
+    def _team_history(self, team: str, as_of=None) -> pd.DataFrame:
+        """
+        Filtra os jogos de uma equipa. Com `as_of`, apenas os jogos
+        estritamente anteriores a essa data (pesquisa binária no índice).
+        """
+        if as_of is not None:
+            return self.df.iloc[self.team_index.rows_before(team, as_of)]
         return self.df[(self.df["home_team"] == team) | (self.df["away_team"] == team)]
 
-    def _team_last_n(self, team: str, n: int = 5) -> pd.DataFrame:
-        """Últimos n jogos da equipa."""
-        hist = self._team_history(team)
-        return hist.sort_values("date", ascending=False).head(n)
+    def _team_last_n(self, team: str, n: int = 5, as_of=None) -> pd.DataFrame:
+        """Últimos n jogos da equipa (antes de `as_of`, se indicado)."""
+        hist = self._team_history(team, as_of)
+        return hist.sort_values("date", ascending=False, kind="mergesort").head(n)
 
-    def _team_avg(self, team: str, column_home: str, column_away: str) -> float:
+    def _team_avg(self, team: str, column_home: str, column_away: str, as_of=None) -> float:
         """Média de uma métrica para uma equipa (casa + fora)."""
-        hist = self._team_history(team)
+        hist = self._team_history(team, as_of)
         values = []
 
         for _, row in hist.iterrows():
@@ -49,9 +145,9 @@ class FeatureBuilder:
 
         return float(pd.Series(values).mean()) if values else 0.0
 
-    def _team_form_last5(self, team: str) -> float:
+    def _team_form_last5(self, team: str, as_of=None) -> float:
         """Forma recente baseada em pontos (vitória=3, empate=1, derrota=0)."""
-        last5 = self._team_last_n(team, 5)
+        last5 = self._team_last_n(team, 5, as_of)
         points = []
 
         for _, row in last5.iterrows():
@@ -76,30 +172,34 @@ class FeatureBuilder:
     # 2) Construção de features para um jogo
     # ---------------------------------------------------------
 
-    def build_features_for_match(self, match_row: pd.Series) -> MatchFeatures:
+    def build_features_for_match(self, match_row: pd.Series, as_of=None) -> MatchFeatures:
+        """
+        Features de um jogo. Com `as_of` (ex.: a data do jogo), só entram os
+        jogos anteriores a essa data.
+        """
         home = match_row["home_team"]
         away = match_row["away_team"]
 
         # Médias históricas
-        home_avg_corners = self._team_avg(home, "corners_home", "corners_away")
-        away_avg_corners = self._team_avg(away, "corners_home", "corners_away")
+        home_avg_corners = self._team_avg(home, "corners_home", "corners_away", as_of)
+        away_avg_corners = self._team_avg(away, "corners_home", "corners_away", as_of)
 
-        home_avg_shots = self._team_avg(home, "shots_home", "shots_away")
-        away_avg_shots = self._team_avg(away, "shots_home", "shots_away")
+        home_avg_shots = self._team_avg(home, "shots_home", "shots_away", as_of)
+        away_avg_shots = self._team_avg(away, "shots_home", "shots_away", as_of)
 
-        home_avg_yellow = self._team_avg(home, "yellow_cards_home", "yellow_cards_away")
-        away_avg_yellow = self._team_avg(away, "yellow_cards_home", "yellow_cards_away")
+        home_avg_yellow = self._team_avg(home, "yellow_cards_home", "yellow_cards_away", as_of)
+        away_avg_yellow = self._team_avg(away, "yellow_cards_home", "yellow_cards_away", as_of)
 
-        home_avg_xg = self._team_avg(home, "xg_home", "xg_away")
-        away_avg_xg = self._team_avg(away, "xg_home", "xg_away")
+        home_avg_xg = self._team_avg(home, "xg_home", "xg_away", as_of)
+        away_avg_xg = self._team_avg(away, "xg_home", "xg_away", as_of)
 
         # Forma recente
-        home_form = self._team_form_last5(home)
-        away_form = self._team_form_last5(away)
+        home_form = self._team_form_last5(home, as_of)
+        away_form = self._team_form_last5(away, as_of)
 
         # Casa/Fora
-        home_home_perf = self._team_avg(home, "shots_home", "shots_away")
-        away_away_perf = self._team_avg(away, "shots_away", "shots_home")
+        home_home_perf = self._team_avg(home, "shots_home", "shots_away", as_of)
+        away_away_perf = self._team_avg(away, "shots_away", "shots_home", as_of)
 
         # Diferenças
         delta_corners = home_avg_corners - away_avg_corners
@@ -130,31 +230,49 @@ class FeatureBuilder:
         )
 
     # ---------------------------------------------------------
-    # 3) Construção de features para todos os jogos
+    # 3) Engine vetorizado (uma passagem sobre a tabela equipa-jogo)
     # ---------------------------------------------------------
 
-    def build_all_features(self):
-        rows = []
+    def _build_features_vectorized(self, matches: pd.DataFrame, as_of=None) -> pd.DataFrame:
+        """Features (colunas de MatchFeatures) para todos os jogos de `matches` de uma vez."""
+        # Equipas sem histórico ficam a 0.0, tal como no cálculo jogo a jogo
+        home = self.team_index.aggregates(matches["home_team"].to_numpy(), as_of)
+        away = self.team_index.aggregates(matches["away_team"].to_numpy(), as_of)
+        return features_from_aggregates(matches, home, away)
 
-        for _, row in self.df.iterrows():
-            features = self.build_features_for_match(row)
-            rows.append(features.__dict__)
+    def build_features(self, matches: pd.DataFrame, point_in_time: bool = False) -> pd.DataFrame:
+        """
+        Features (uma linha por jogo) para `matches`, usando o histórico em self.df.
+        Com point_in_time=True, cada jogo só vê os jogos anteriores à sua `date`.
+        """
+        as_of = matches["date"].to_numpy() if point_in_time else None
 
-        df_features = pd.DataFrame(rows)
-        df_features.to_csv(self.processed_path / "features_train.csv", index=False)
-        print("✔ features_train.csv gerado com sucesso")
+        if self.engine == "vectorized":
+            return self._build_features_vectorized(matches, as_of)
+
+        store = RecordStore(FEATURE_DTYPES, capacity=len(matches))
+        for i, (_, row) in enumerate(matches.iterrows()):
+            store.append(self.build_features_for_match(row, None if as_of is None else as_of[i]))
+        return store.to_frame()
 
     # ---------------------------------------------------------
-    # 4) Features para a próxima jornada
+    # 4) Construção de features para todos os jogos
     # ---------------------------------------------------------
 
-    def build_next_round_features(self, next_round_matches: pd.DataFrame):
-        rows = []
+    def build_all_features(self, point_in_time: bool = True):
+        """
+        Gera features_train.csv. Por omissão as features de cada jogo usam só
+        o histórico anterior ao jogo, para que o treino não veja o futuro.
+        """
+        df_features = self.build_features(self.df, point_in_time=point_in_time)
+        write_table(df_features, self.processed_path, "features_train")
+        print("✔ features_train gerado com sucesso")
 
-        for _, row in next_round_matches.iterrows():
-            features = self.build_features_for_match(row)
-            rows.append(features.__dict__)
+    # ---------------------------------------------------------
+    # 5) Features para a próxima jornada
+    # ---------------------------------------------------------
 
-        df_features = pd.DataFrame(rows)
-        df_features.to_csv(self.processed_path / "features_next_round.csv", index=False)
-        print("✔ features_next_round.csv gerado com sucesso")
+    def build_next_round_features(self, next_round_matches: pd.DataFrame):
+        df_features = self.build_features(next_round_matches)
+        write_table(df_features, self.processed_path, "features_next_round")
+        print("✔ features_next_round gerado com sucesso")
@@ -0,0 +1,182 @@
+import copy
+import logging
+from collections import deque
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.config.settings import PROCESSED_DIR, RAW_DIR
+from src.domain.schemas import MatchFeatures
+from src.features.feature_builder import features_from_aggregates, load_match_frame
+from src.features.team_index import VALUE_COLUMNS
+from src.features.team_match import build_team_match_table
+from src.utils.io import append_table, ensure_dir, remove_table, table_exists, write_table
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TeamAccumulator:
+    """Estado acumulado de uma equipa: somas, contagens e últimos 5 resultados."""
+    sums: np.ndarray = field(default_factory=lambda: np.zeros(len(VALUE_COLUMNS)))
+    counts: np.ndarray = field(default_factory=lambda: np.zeros(len(VALUE_COLUMNS)))
+    played: int = 0
+    last5_points: deque = field(default_factory=lambda: deque(maxlen=5))
+
+    def aggregates(self) -> np.ndarray:
+        """Médias de VALUE_COLUMNS seguidas da forma (mesma semântica de TeamIndex.aggregates)."""
+        if self.played == 0:
+            return np.zeros(len(VALUE_COLUMNS) + 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self.sums / self.counts
+        return np.append(means, np.mean(self.last5_points))
+
+    def add(self, values: np.ndarray, points: float):
+        valid = ~np.isnan(values)
+        self.sums += np.where(valid, values, 0.0)
+        self.counts += valid
+        self.played += 1
+        self.last5_points.append(points)
+
+
+class FeatureStore:
+    """
+    Feature store persistente, indexada por match_id.
+
+    Mantém acumuladores por equipa, pelo que juntar uma jornada nova só
+    atualiza as duas equipas de cada jogo e acrescenta as linhas novas à
+    tabela features_train. As features são point-in-time: cada jogo usa apenas
+    os jogos de datas anteriores (iguais às de FeatureBuilder com
+    point_in_time=True).
+
+    Para o último dia processado guarda também o estado, do início desse
+    dia, das equipas que jogaram nele (day_start): jogos do mesmo dia que
+    cheguem depois (jornada ingerida em partes, jogo de segunda-feira) são
+    calculados a partir desse estado, sem reconstruir o store.
+    """
+
+    def __init__(self, processed_dir: Path = PROCESSED_DIR):
+        self.processed_dir = Path(processed_dir)
+        ensure_dir(self.processed_dir)
+        self.state_path = self.processed_dir / "feature_store.pkl"
+        self.table_name = "features_train"
+
+        self.teams: Dict[str, TeamAccumulator] = {}
+        self.match_ids: Set[str] = set()
+        self.last_date: Optional[pd.Timestamp] = None
+        self.day_start: Optional[Dict[str, TeamAccumulator]] = {}
+
+        if self.state_path.exists() and table_exists(self.processed_dir, self.table_name):
+            state = joblib.load(self.state_path)
+            self.teams = state["teams"]
+            self.match_ids = state["match_ids"]
+            self.last_date = state["last_date"]
+            # Estados antigos não têm day_start (None: o mesmo dia obriga a reconstruir)
+            self.day_start = state.get("day_start")
+
+    # ---------------------------------------------------------
+    # Persistência
+    # ---------------------------------------------------------
+
+    def _save_state(self):
+        joblib.dump(
+            {"teams": self.teams, "match_ids": self.match_ids, "last_date": self.last_date,
+             "day_start": self.day_start},
+            self.state_path,
+        )
+
+    def reset(self):
+        """Esquece todo o estado (a próxima atualização reconstrói tudo)."""
+        self.teams = {}
+        self.match_ids = set()
+        self.last_date = None
+        self.day_start = {}
+        remove_table(self.processed_dir, self.table_name)
+        self.state_path.unlink(missing_ok=True)
+
+    # ---------------------------------------------------------
+    # Atualização incremental
+    # ---------------------------------------------------------
+
+    def _process(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Calcula as features de `df` (jogos novos) e aplica-os aos acumuladores, data a data."""
+        df = df.assign(_kickoff=pd.to_datetime(df["date"])).sort_values("_kickoff", kind="mergesort")
+        table = build_team_match_table(df)
+        values = table[VALUE_COLUMNS].to_numpy(dtype=float)
+        kickoff = pd.to_datetime(table["date"]).to_numpy()
+
+        chunks = []
+        for date, day in df.groupby("_kickoff", sort=True):
+            if date != self.last_date:
+                self.day_start = {}
+
+            # 1) features com o estado antes deste dia
+            home = self._aggregates(day["home_team"])
+            away = self._aggregates(day["away_team"])
+            chunks.append(features_from_aggregates(day, home, away))
+
+            # 2) atualizar apenas as equipas que jogaram neste dia, guardando
+            #    antes o seu estado do início do dia
+            for i in np.flatnonzero(kickoff == np.datetime64(date)):
+                team = table["team"].iat[i]
+                if team not in self.day_start:
+                    self.day_start[team] = copy.deepcopy(self.teams.get(team, TeamAccumulator()))
+                self.teams.setdefault(team, TeamAccumulator()).add(values[i], table["points"].iat[i])
+
+            self.last_date = date
+
+        self.match_ids.update(df["match_id"])
+        return pd.concat(chunks, ignore_index=True)
+
+    def _aggregates(self, teams: pd.Series) -> pd.DataFrame:
+        """Agregados de cada equipa no início do dia a processar."""
+        empty = TeamAccumulator()
+        rows = [self.day_start.get(team, self.teams.get(team, empty)).aggregates() for team in teams]
+        return pd.DataFrame(rows, columns=VALUE_COLUMNS + ["form_last5"])
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Junta ao store os jogos de `df` (frame jogos+stats, normalmente o
+        histórico completo) ainda não vistos e devolve as features das linhas novas.
+        Só entram jogos terminados: um jogo por jogar entra quando tiver resultado.
+
+        Jogos novos com a data do último dia processado usam o estado do
+        início desse dia (day_start). Se algum jogo novo for anterior a esse
+        dia (ex.: dados corrigidos no passado), o estado deixa de ser válido
+        e tudo é reconstruído a partir de `df`.
+        """
+        df = df[df["home_score"].notna() & df["away_score"].notna()]
+        new = df[~df["match_id"].isin(self.match_ids)]
+        if new.empty:
+            logger.info("Feature store já atualizada, nada a fazer")
+            return pd.DataFrame(columns=[f.name for f in fields(MatchFeatures)])
+
+        first = pd.to_datetime(new["date"]).min()
+        if self.last_date is not None and (
+            first < self.last_date or (first == self.last_date and self.day_start is None)
+        ):
+            logger.warning("Jogos novos anteriores ao estado atual; a reconstruir a feature store")
+            self.reset()
+            new = df
+
+        # Sem estado anterior, uma tabela features_train existente é reescrita
+        append = bool(self.match_ids) and table_exists(self.processed_dir, self.table_name)
+        features = self._process(new)
+
+        if append:
+            append_table(features, self.processed_dir, self.table_name)
+        else:
+            write_table(features, self.processed_dir, self.table_name)
+        self._save_state()
+
+        logger.info(f"Feature store: +{len(features)} jogos ({len(self.match_ids)} no total)")
+        return features
+
+    def sync_from_raw(self, raw_dir: Path = RAW_DIR) -> pd.DataFrame:
+        """Lê os dados brutos e processa apenas os match_id que ainda não estão no store."""
+        return self.update(load_match_frame(raw_dir))
@@ -0,0 +1,64 @@
+from dataclasses import fields
+from pathlib import Path
+
+import pandas as pd
+
+from src.config.settings import PROCESSED_DIR, RAW_DIR
+from src.domain.schemas import MatchStats
+from src.features.feature_builder import merge_match_frames
+from src.features.team_match import build_team_match_table
+from src.utils.io import read_table, write_table
+
+
+# Todas as estatísticas de MatchStats: nome -> (coluna casa, coluna fora)
+STAT_METRICS = {
+    f.name[: -len("_home")]: (f.name, f.name[: -len("_home")] + "_away")
+    for f in fields(MatchStats)
+    if f.name.endswith("_home")
+}
+
+# Chave da tabela: uma linha por equipa, época e local ("all", "home", "away")
+KEY_COLUMNS = ["team", "season", "venue"]
+
+TABLE_NAME = "team_season_aggregates"
+
+
+def build_team_season_aggregates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Médias por equipa e época, separadas em casa/fora e no total, a partir do
+    frame jogos+stats. Cada estatística tem <stat>_for (da própria equipa) e
+    <stat>_against (do adversário), pelo que as médias em casa nunca
+    misturam os números do adversário. Só contam jogos já jogados (com
+    resultado): os jogos por jogar não entram em matches nem nos pontos.
+    """
+    df = df[df["home_score"].notna() & df["away_score"].notna()].reset_index(drop=True)
+    long = build_team_match_table(df, STAT_METRICS)
+    long["season"] = df["season"].to_numpy()[long["row"].to_numpy()]
+    long["venue"] = long["is_home"].map({True: "home", False: "away"})
+
+    value_columns = ["goals_for", "goals_against", "points"] + [
+        f"{name}_{side}" for name in STAT_METRICS for side in ("for", "against")
+    ]
+
+    def _aggregate(frame: pd.DataFrame, keys) -> pd.DataFrame:
+        grouped = frame.groupby(keys, sort=True)
+        agg = grouped[value_columns].mean()
+        agg.insert(0, "matches", grouped.size())
+        return agg.reset_index()
+
+    by_venue = _aggregate(long, KEY_COLUMNS)
+    overall = _aggregate(long, ["team", "season"]).assign(venue="all")
+
+    table = pd.concat([overall, by_venue], ignore_index=True)
+    table = table[KEY_COLUMNS + ["matches"] + value_columns]
+    return table.sort_values(KEY_COLUMNS, kind="mergesort").reset_index(drop=True)
+
+
+def update_team_aggregates(raw_dir: Path = RAW_DIR, processed_dir: Path = PROCESSED_DIR) -> pd.DataFrame:
+    """Recalcula a tabela a partir de data/raw e guarda-a em data/processed."""
+    matches = read_table(raw_dir, "matches")
+    stats = read_table(raw_dir, "match_stats", columns=["match_id"] + [f.name for f in fields(MatchStats)])
+    table = build_team_season_aggregates(merge_match_frames(matches, stats))
+    write_table(table, processed_dir, TABLE_NAME)
+    print(f"✔ Agregados por equipa/época guardados ({len(table)} linhas)")
+    return table
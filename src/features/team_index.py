@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.features.team_match import FEATURE_METRICS, build_team_match_table
+
+
+# Colunas da tabela equipa-jogo agregadas nas features
+VALUE_COLUMNS = [f"{name}_for" for name in FEATURE_METRICS] + ["shots_against"]
+
+
+@dataclass
+class _TeamHistory:
+    dates: np.ndarray       # datetime64, ordem crescente
+    rows: np.ndarray        # posição de cada jogo no frame original
+    sums: np.ndarray        # somas acumuladas de VALUE_COLUMNS (linha 0 = zeros)
+    counts: np.ndarray      # nº de valores não nulos acumulados (linha 0 = zeros)
+    points: np.ndarray      # pontos acumulados (posição 0 = 0)
+
+
+class TeamIndex:
+    """
+    Índice por equipa, ordenado por data, construído uma única vez a partir do
+    frame jogos+stats.
+
+    O histórico de uma equipa estritamente antes de uma data é encontrado com
+    pesquisa binária (searchsorted) e as médias/forma saem de somas acumuladas,
+    pelo que cada consulta é O(log n) em vez de percorrer todos os jogos.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        table = build_team_match_table(df, FEATURE_METRICS)
+        table["kickoff"] = pd.to_datetime(table["date"])
+
+        # Em empates de data, a ordem (row decrescente) faz com que os
+        # "últimos n" sejam os mesmos de um sort_values estável decrescente.
+        table = table.sort_values(
+            ["team", "kickoff", "row"], ascending=[True, True, False], kind="mergesort"
+        )
+
+        self._teams = {}
+        for team, group in table.groupby("team", sort=False):
+            values = group[VALUE_COLUMNS].to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            zeros = np.zeros((1, len(VALUE_COLUMNS)))
+
+            self._teams[team] = _TeamHistory(
+                dates=group["kickoff"].to_numpy(dtype="datetime64[ns]"),
+                rows=group["row"].to_numpy(),
+                sums=np.vstack([zeros, np.cumsum(np.where(valid, values, 0.0), axis=0)]),
+                counts=np.vstack([zeros, np.cumsum(valid, axis=0)]),
+                points=np.concatenate([[0.0], np.cumsum(group["points"].to_numpy(dtype=float))]),
+            )
+
+    # ---------------------------------------------------------
+    # Consultas
+    # ---------------------------------------------------------
+
+    def _position(self, history: _TeamHistory, as_of) -> np.ndarray:
+        """Nº de jogos estritamente antes de `as_of` (todos, se as_of for None)."""
+        if as_of is None:
+            return np.full(1, len(history.dates))
+        as_of = np.asarray(pd.to_datetime(as_of), dtype="datetime64[ns]").reshape(-1)
+        return np.searchsorted(history.dates, as_of, side="left")
+
+    def rows_before(self, team: str, as_of=None) -> np.ndarray:
+        """Posições (no frame original) dos jogos da equipa antes de `as_of`, por data crescente."""
+        history = self._teams.get(team)
+        if history is None:
+            return np.empty(0, dtype=int)
+        k = int(self._position(history, as_of)[0])
+        return history.rows[:k]
+
+    def aggregates(self, teams, as_of=None, n_form: int = 5) -> pd.DataFrame:
+        """
+        Médias de VALUE_COLUMNS e forma nos últimos `n_form` jogos para cada par
+        (equipa, data de corte). `as_of` pode ser None (todo o histórico), uma
+        data única ou um array com uma data por equipa.
+
+        Equipas sem jogos anteriores ficam a 0.0; métricas sem valores válidos
+        ficam NaN (tal como a média de uma série vazia de valores).
+        """
+        teams = np.asarray(teams, dtype=object)
+        n = len(teams)
+        if as_of is not None and np.ndim(as_of) == 0:
+            as_of = [as_of] * n
+
+        means = np.zeros((n, len(VALUE_COLUMNS)))
+        form = np.zeros(n)
+
+        for team in pd.unique(teams):
+            history = self._teams.get(team)
+            if history is None:
+                continue
+
+            mask = teams == team
+            if as_of is None:
+                k = np.full(mask.sum(), len(history.dates))
+            else:
+                k = self._position(history, np.asarray(as_of)[mask])
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                team_means = history.sums[k] / history.counts[k]
+            team_means[k == 0] = 0.0
+            means[mask] = team_means
+
+            start = np.maximum(k - n_form, 0)
+            played = k - start
+            with np.errstate(invalid="ignore", divide="ignore"):
+                team_form = (history.points[k] - history.points[start]) / played
+            form[mask] = np.where(played > 0, team_form, 0.0)
+
+        out = pd.DataFrame(means, columns=VALUE_COLUMNS)
+        out["form_last5"] = form
+        return out
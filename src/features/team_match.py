@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+
+# Métricas usadas nas features: nome -> (coluna casa, coluna fora)
+FEATURE_METRICS = {
+    "corners": ("corners_home", "corners_away"),
+    "shots": ("shots_home", "shots_away"),
+    "yellow_cards": ("yellow_cards_home", "yellow_cards_away"),
+    "xg": ("xg_home", "xg_away"),
+}
+
+
+def match_points(goals_for: pd.Series, goals_against: pd.Series) -> np.ndarray:
+    """Pontos de um jogo (vitória=3, empate=1, derrota=0). Resultados em falta valem 0."""
+    gf = goals_for.to_numpy(dtype=float)
+    ga = goals_against.to_numpy(dtype=float)
+    return np.select([gf > ga, gf == ga], [3.0, 1.0], default=0.0)
+
+
+def _as_float(values: pd.Series) -> np.ndarray:
+    """Converte colunas numéricas (incluindo Int16 com nulos) para float64, com NaN."""
+    return values.to_numpy(dtype=float, na_value=np.nan)
+
+
+def build_team_match_table(df: pd.DataFrame, metrics: dict = FEATURE_METRICS) -> pd.DataFrame:
+    """
+    Converte o frame jogos+stats (uma linha por jogo) numa tabela longa
+    equipa-jogo: uma linha por equipa e por jogo, com colunas <métrica>_for
+    (da própria equipa) e <métrica>_against (do adversário).
+
+    A coluna `row` guarda a posição original do jogo em `df`, para permitir
+    ordenações estáveis iguais às do frame original.
+    """
+    row = np.arange(len(df))
+
+    def _side(is_home: bool) -> pd.DataFrame:
+        own, opp = ("home", "away") if is_home else ("away", "home")
+        side = {
+            "row": row,
+            "match_id": df["match_id"].to_numpy(),
+            "date": df["date"].to_numpy(),
+            "team": df[f"{own}_team"].to_numpy(),
+            "opponent": df[f"{opp}_team"].to_numpy(),
+            "is_home": is_home,
+            "goals_for": _as_float(df[f"{own}_score"]),
+            "goals_against": _as_float(df[f"{opp}_score"]),
+        }
+        for name, (col_home, col_away) in metrics.items():
+            col_own, col_opp = (col_home, col_away) if is_home else (col_away, col_home)
+            side[f"{name}_for"] = _as_float(df[col_own])
+            side[f"{name}_against"] = _as_float(df[col_opp])
+        return pd.DataFrame(side)
+
+    table = pd.concat([_side(True), _side(False)], ignore_index=True)
+    table["points"] = match_points(table["goals_for"], table["goals_against"])
+    return table
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import PoissonRegressor
+
+from src.config.settings import ARTIFACTS_DIR
+from src.models.compact_forest import CompactForest
+
+
+def hash_training_data(X: pd.DataFrame, y=None) -> str:
+    """Hash (sha256) dos dados de treino, para saber com que dados foi gerado um artefacto."""
+    h = hashlib.sha256()
+    h.update(",".join(map(str, X.columns)).encode())
+    h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    if y is not None:
+        h.update(pd.util.hash_pandas_object(pd.DataFrame(y), index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+class ArtifactStore:
+    """
+    Artefactos de modelos em artifacts_dir (resolvido a partir de BASE_DIR).
+
+    - GLMs (PoissonRegressor): formato compacto só com coeficientes (.glm.npz)
+    - RandomForestRegressor: árvores em arrays planos float32/int32
+      (.forest.npz, ver CompactForest), carregados sem unpickle
+    - restantes: joblib sem compressão, carregado com mmap_mode="r" para que
+      os arrays sejam lidos diretamente do ficheiro
+    - manifesto (manifest/<nome>.json): formato, ordem das colunas de features,
+      hash dos dados de treino, versão do sklearn, tamanho e tempo de carga,
+      e o registo do treino (match_id usados, ver src/models/incremental.py).
+      Uma entrada por ficheiro, porque os modelos são guardados em paralelo
+      por vários processos (train_pipeline).
+    """
+
+    def __init__(self, artifacts_dir: Path = ARTIFACTS_DIR):
+        self.artifacts_dir = Path(artifacts_dir)
+        self.manifest_dir = self.artifacts_dir / "manifest"
+
+    # ---------------------------------------------------------
+    # Manifesto
+    # ---------------------------------------------------------
+
+    def entry(self, name: str) -> Optional[dict]:
+        path = self.manifest_dir / f"{name}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def manifest(self) -> Dict[str, dict]:
+        """Todas as entradas do manifesto, por nome de artefacto."""
+        if not self.manifest_dir.exists():
+            return {}
+        return {path.stem: self.entry(path.stem) for path in sorted(self.manifest_dir.glob("*.json"))}
+
+    def _write_entry(self, name: str, entry: dict):
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_dir / f"{name}.json.tmp"
+        tmp.write_text(json.dumps(entry, indent=2), encoding="utf-8")
+        tmp.replace(self.manifest_dir / f"{name}.json")
+
+    def path(self, name: str) -> Path:
+        """Ficheiro do artefacto (do manifesto; ou o .pkl antigo se não houver entrada)."""
+        entry = self.entry(name)
+        if entry is None:
+            return self.artifacts_dir / f"{name}.pkl"
+        return self.artifacts_dir / entry["file"]
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).exists()
+
+    # ---------------------------------------------------------
+    # Guardar / carregar
+    # ---------------------------------------------------------
+
+    def save(
+        self,
+        model,
+        name: str,
+        feature_columns: Optional[List[str]] = None,
+        data_hash: Optional[str] = None,
+        training: Optional[dict] = None,
+    ):
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+
+        if type(model) is PoissonRegressor:
+            fmt, file = "glm", f"{name}.glm.npz"
+            np.savez(
+                self.artifacts_dir / file,
+                coef=model.coef_,
+                intercept=np.array([model.intercept_]),
+                feature_names=np.asarray(getattr(model, "feature_names_in_", []), dtype=str),
+                params=np.array(json.dumps(model.get_params())),
+            )
+        elif isinstance(model, CompactForest) or (
+            type(model) is RandomForestRegressor and model.n_outputs_ == 1
+        ):
+            fmt, file = "forest", f"{name}.forest.npz"
+            if not isinstance(model, CompactForest):
+                model = CompactForest.from_forest(model)
+            model.save(self.artifacts_dir / file)
+        else:
+            fmt, file = "mmap", f"{name}.joblib"
+            joblib.dump(model, self.artifacts_dir / file)
+
+        entry = {
+            "file": file,
+            "format": fmt,
+            "estimator": f"{type(model).__module__}.{type(model).__name__}",
+            "feature_columns": list(feature_columns) if feature_columns is not None
+            else list(getattr(model, "feature_names_in_", [])),
+            "data_hash": data_hash,
+            "sklearn_version": sklearn.__version__,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "size_bytes": (self.artifacts_dir / file).stat().st_size,
+            "training": training,
+        }
+
+        # Mede o tempo de carga do artefacto acabado de escrever
+        start = time.perf_counter()
+        self._load_file(self.artifacts_dir / file, fmt)
+        entry["load_seconds"] = round(time.perf_counter() - start, 4)
+
+        self._write_entry(name, entry)
+
+        # Remove versões noutros formatos (ex.: .pkl antigo) do mesmo modelo
+        for old in (f"{name}.pkl", f"{name}.joblib", f"{name}.glm.npz", f"{name}.forest.npz"):
+            if old != file:
+                (self.artifacts_dir / old).unlink(missing_ok=True)
+
+    def load(self, name: str):
+        entry = self.entry(name)
+        if entry is None:
+            return joblib.load(self.artifacts_dir / f"{name}.pkl")
+        return self._load_file(self.artifacts_dir / entry["file"], entry["format"])
+
+    @staticmethod
+    def _load_file(path: Path, fmt: str):
+        if fmt == "glm":
+            return _glm_from_npz(path)
+        if fmt == "forest":
+            return CompactForest.load(path)
+        return joblib.load(path, mmap_mode="r")
+
+
+def _glm_from_npz(path: Path) -> PoissonRegressor:
+    """Reconstrói um PoissonRegressor a partir dos coeficientes guardados."""
+    with np.load(path) as data:
+        model = PoissonRegressor(**json.loads(str(data["params"])))
+        model.coef_ = data["coef"].astype(np.float64)
+        model.intercept_ = float(data["intercept"][0])
+        model.n_features_in_ = len(model.coef_)
+        if len(data["feature_names"]):
+            model.feature_names_in_ = data["feature_names"].astype(object)
+
+    # Função de ligação usada por predict() (normalmente criada no fit)
+    model._base_loss = model._get_loss()
+    return model
+
+
+_default_store = ArtifactStore()
+
+
+def get_store() -> ArtifactStore:
+    return _default_store
@@ -0,0 +1,205 @@
+import hashlib
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+
+from src.config.settings import ARTIFACTS_DIR, BACKTEST_MAX_SNAPSHOTS, PROCESSED_DIR, RAW_DIR, TRAIN_N_JOBS
+from src.domain.business_rules import derive_signals
+from src.models.artifact_store import ArtifactStore
+from src.models.model_specs import ModelSpec, design_matrix, fit_spec
+from src.models.predict import predict_batch, predictions_to_frame
+from src.models.train_pipeline import ALL_SPECS
+from src.utils.io import read_table, write_table
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOTS_DIR = ARTIFACTS_DIR / "backtest"
+
+# Dados partilhados pelos processos do pool (definidos em _init_worker)
+_worker_frame: Optional[pd.DataFrame] = None
+
+
+class SnapshotModels:
+    """Modelos de um snapshot em memória, com a mesma interface do ModelRegistry."""
+
+    def __init__(self, models: Dict[str, object]):
+        self.models = models
+
+    def get(self, name: str):
+        return self.models[name]
+
+
+AUX_COLUMNS = ["season", "round_number", "kickoff", "actual_corners"]
+
+
+def load_backtest_frame(processed_dir: Path = PROCESSED_DIR, raw_dir: Path = RAW_DIR) -> pd.DataFrame:
+    """
+    features_train (point-in-time) juntamente com época, jornada, data e os
+    cantos reais de cada jogo (AUX_COLUMNS), ordenado cronologicamente.
+    """
+    features = read_table(processed_dir, "features_train")
+    matches = read_table(raw_dir, "matches", columns=["match_id", "season", "round_number", "date"])
+    corners = read_table(raw_dir, "match_stats", columns=["match_id", "corners_home", "corners_away"])
+
+    df = features.merge(matches, on="match_id", how="inner").merge(corners, on="match_id", how="left")
+    df["actual_corners"] = (df["corners_home"] + df["corners_away"]).astype("float64")
+    df["kickoff"] = pd.to_datetime(df["date"])
+    df = df.drop(columns=["corners_home", "corners_away", "date"])
+    return df.sort_values("kickoff", kind="mergesort").reset_index(drop=True)
+
+
+def snapshot_key(train_ids: pd.Series, specs: List[ModelSpec]) -> str:
+    """Hash dos jogos de treino e da configuração dos modelos de um snapshot."""
+    h = hashlib.sha1()
+    for match_id in sorted(train_ids.astype(str)):
+        h.update(match_id.encode())
+    for spec in specs:
+        h.update(f"{spec.name}:{spec.target}:{spec.make_model(1).get_params()}".encode())
+    return h.hexdigest()[:16]
+
+
+def _snapshot(train: pd.DataFrame, specs: List[ModelSpec], n_jobs: int) -> SnapshotModels:
+    """
+    Modelos treinados em `train`, reutilizando o snapshot em cache se existir.
+    Cada snapshot é um diretório ArtifactStore (RandomForest em CompactForest,
+    GLMs só com coeficientes), escrito à parte e renomeado no fim.
+    """
+    path = SNAPSHOTS_DIR / snapshot_key(train["match_id"], specs)
+    if path.is_dir():
+        os.utime(path)  # usado agora: fica entre os mais recentes em prune_snapshots
+        store = ArtifactStore(path)
+        return SnapshotModels({spec.name: store.load(spec.name) for spec in specs})
+
+    models = {}
+    tmp = SNAPSHOTS_DIR / f".{path.name}.{os.getpid()}.tmp"
+    store = ArtifactStore(tmp)
+    for spec in specs:
+        X, y = design_matrix(train, spec)
+        models[spec.name], _, _ = fit_spec(spec, X, y, n_jobs)
+        store.save(models[spec.name], spec.name, feature_columns=list(X.columns))
+
+    try:
+        tmp.rename(path)
+    except OSError:  # outro processo guardou o mesmo snapshot entretanto
+        shutil.rmtree(tmp, ignore_errors=True)
+    return SnapshotModels(models)
+
+
+def prune_snapshots(keep: int = BACKTEST_MAX_SNAPSHOTS) -> int:
+    """
+    Apaga os snapshots menos usados recentemente, deixando `keep`, e os
+    .pkl do formato antigo. Devolve o nº de snapshots apagados.
+    """
+    if not SNAPSHOTS_DIR.exists():
+        return 0
+
+    for legacy in SNAPSHOTS_DIR.glob("*.pkl"):
+        legacy.unlink(missing_ok=True)
+
+    snapshots = sorted(
+        (p for p in SNAPSHOTS_DIR.iterdir() if p.is_dir() and not p.name.startswith(".")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for old in snapshots[keep:]:
+        shutil.rmtree(old, ignore_errors=True)
+    return max(0, len(snapshots) - keep)
+
+
+def _evaluate_round(df: pd.DataFrame, season: str, round_number: int, specs: List[ModelSpec],
+                    line: float, min_train: int, n_jobs: int) -> Optional[dict]:
+    in_round = (df["season"] == season) & (df["round_number"] == round_number)
+    before = df["kickoff"] < df.loc[in_round, "kickoff"].min()
+
+    # Só os modelos veem as colunas de features; AUX_COLUMNS servem a avaliação
+    features = df.drop(columns=AUX_COLUMNS)
+    train, test = features[before], features[in_round]
+    if len(train) < min_train:
+        return None
+
+    start = time.perf_counter()
+    models = _snapshot(train, specs, n_jobs)
+
+    result = {
+        "season": season,
+        "round_number": int(round_number),
+        "n_train": len(train),
+        "n_test": len(test),
+    }
+
+    for spec in specs:
+        X, y = design_matrix(test, spec)
+        result[f"mae_{spec.name}"] = mean_absolute_error(y, models.get(spec.name).predict(X))
+
+    # Sinais de cantos: acerto se over/under bater certo com o total real
+    predictions = predictions_to_frame(predict_batch(test, registry=models, mode="per_target"))
+    signal = derive_signals(predictions, {"corners": [line]})["suggestion"].to_numpy()
+    actual = df.loc[in_round, "actual_corners"].to_numpy()
+
+    active = (signal != "none") & ~np.isnan(actual)
+    signals = int(active.sum())
+    hits = int(((signal == "over") == (actual > line))[active].sum())
+
+    result["corners_signals"] = signals
+    result["corners_hits"] = hits
+    result["corners_hit_rate"] = hits / signals if signals else np.nan
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _init_worker(df: pd.DataFrame):
+    global _worker_frame
+    _worker_frame = df
+
+
+def _evaluate_round_in_worker(*args) -> Optional[dict]:
+    return _evaluate_round(_worker_frame, *args)
+
+
+def run_backtest(
+    seasons: Optional[List[str]] = None,
+    specs: List[ModelSpec] = ALL_SPECS,
+    line: float = 9.5,
+    min_train: int = 50,
+    n_jobs: int = TRAIN_N_JOBS,
+    df: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Backtest walk-forward: para cada jornada (season, round_number), treina
+    os modelos só com os jogos anteriores ao início da jornada, prevê a
+    jornada e mede o MAE por modelo e a taxa de acerto dos sinais de cantos.
+
+    Os modelos de cada jornada ficam em cache (artifacts/backtest), pelo
+    que repetir o backtest (ex.: outra linha de cantos) não volta a treinar;
+    no fim ficam só os BACKTEST_MAX_SNAPSHOTS mais recentes (prune_snapshots).
+    As jornadas são independentes e correm em paralelo (`n_jobs` processos).
+    """
+    df = load_backtest_frame() if df is None else df
+    rounds = df[["season", "round_number"]].drop_duplicates()
+    if seasons is not None:
+        rounds = rounds[rounds["season"].isin(seasons)]
+    tasks = [(season, rnd, specs, line, min_train, 1) for season, rnd in rounds.itertuples(index=False)]
+
+    if n_jobs <= 1:
+        results = [_evaluate_round(df, *task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(df,)) as pool:
+            results = list(pool.map(_evaluate_round_in_worker, *zip(*tasks)))
+
+    removed = prune_snapshots()
+    if removed:
+        logger.info(f"{removed} snapshots antigos apagados de {SNAPSHOTS_DIR}")
+
+    report = pd.DataFrame([r for r in results if r is not None])
+    if not report.empty:
+        write_table(report, PROCESSED_DIR, "backtest_rounds", partition_cols=())
+    return report
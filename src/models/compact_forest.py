@@ -0,0 +1,231 @@
+import json
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.tree._tree import NODE_DTYPE, TREE_LEAF, TREE_UNDEFINED, Tree
+
+# A partir deste nº de linhas, predict usa as árvores do sklearn
+# reconstruídas a partir dos arrays (ciclo em C, mais rápido em lotes
+# grandes); abaixo, percorre os arrays com numpy (sem reconstruir nada)
+SKLEARN_MIN_ROWS = 500
+
+
+def _float32_floor(values: np.ndarray) -> np.ndarray:
+    """
+    Arredonda para float32 por defeito. O sklearn compara X em float32 com
+    limiares a meio de dois valores float32 de treino; arredondar para baixo
+    mantém o limiar nesse intervalo e, portanto, as mesmas decisões.
+    """
+    rounded = values.astype(np.float32)
+    above = rounded.astype(np.float64) > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+class CompactForest:
+    """
+    RandomForestRegressor (uma saída) guardado como arrays planos: todas as
+    árvores concatenadas, filhos em int32, índices de feature em int16,
+    limiares e valores em float32 (~19 bytes por nó contra ~72 nas
+    estruturas Tree do sklearn).
+
+    Carrega-se com um np.load (.npz sem compressão, que descomprimir custaria
+    mais do que ler) em vez de reconstruir centenas de objetos Tree.
+    Lotes pequenos (o caso da app e do serviço) são previstos diretamente
+    sobre os arrays, todas as árvores em simultâneo; a partir de
+    SKLEARN_MIN_ROWS linhas as árvores do sklearn são reconstruídas uma vez
+    (to_forest) e reutilizadas. As atualizações incrementais (grow)
+    acrescentam árvores, como o warm_start do sklearn.
+    """
+
+    def __init__(self, arrays: dict, params: dict, feature_names=None):
+        self.roots = arrays["roots"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.missing_left = arrays["missing_left"]
+        self.value = arrays["value"]
+        self.params = params
+        self.n_features_in_ = int(arrays["n_features"])
+        if feature_names is not None and len(feature_names):
+            self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self._index()
+
+    def _index(self):
+        """Arrays derivados usados por predict (filhos intercalados: 2·nó = esquerdo, 2·nó+1 = direito)."""
+        self._children = np.empty(2 * len(self.left), dtype=np.intp)
+        self._children[0::2] = self.left
+        self._children[1::2] = self.right
+        self._is_leaf = self.left < 0
+        self._feature = self.feature.astype(np.intp)
+        self._forest = None
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    # ---------------------------------------------------------
+    # Conversão
+    # ---------------------------------------------------------
+
+    @staticmethod
+    def _tree_arrays(forest: RandomForestRegressor, offset: int = 0) -> dict:
+        roots, left, right, feature, threshold, missing_left, value = [], [], [], [], [], [], []
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left < 0
+            roots.append(offset)
+            left.append(np.where(is_leaf, -1, tree.children_left + offset))
+            right.append(np.where(is_leaf, -1, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            missing_left.append(getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=np.uint8)))
+            value.append(tree.value[:, 0, 0])
+            offset += tree.node_count
+
+        return {
+            "roots": np.asarray(roots, dtype=np.int32),
+            "left": np.concatenate(left).astype(np.int32),
+            "right": np.concatenate(right).astype(np.int32),
+            "feature": np.concatenate(feature).astype(
+                np.int16 if forest.n_features_in_ <= np.iinfo(np.int16).max else np.int32
+            ),
+            "threshold": _float32_floor(np.concatenate(threshold)),
+            "missing_left": np.concatenate(missing_left).astype(bool),
+            "value": np.concatenate(value).astype(np.float32),
+            "n_features": np.array(forest.n_features_in_),
+        }
+
+    @classmethod
+    def from_forest(cls, forest: RandomForestRegressor) -> "CompactForest":
+        params = {k: v for k, v in forest.get_params().items() if k != "warm_start"}
+        return cls(cls._tree_arrays(forest), params, getattr(forest, "feature_names_in_", None))
+
+    def save(self, path: Path):
+        np.savez(
+            path,
+            roots=self.roots,
+            left=self.left,
+            right=self.right,
+            feature=self.feature,
+            threshold=self.threshold,
+            missing_left=self.missing_left,
+            value=self.value,
+            n_features=np.array(self.n_features_in_),
+            feature_names=np.asarray(getattr(self, "feature_names_in_", []), dtype=str),
+            params=np.array(json.dumps(self.params)),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "CompactForest":
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        return cls(arrays, json.loads(str(arrays["params"])), arrays["feature_names"].astype(object))
+
+    # ---------------------------------------------------------
+    # Previsão / atualização
+    # ---------------------------------------------------------
+
+    def to_forest(self) -> RandomForestRegressor:
+        """RandomForestRegressor equivalente (mesmas decisões e valores das folhas)."""
+        ends = np.append(self.roots[1:], len(self.left))
+        depth = self._depths()
+        params = {k: v for k, v in self.params.items() if k in DecisionTreeRegressor().get_params()}
+
+        estimators = []
+        for start, end in zip(self.roots, ends):
+            leaf = self._is_leaf[start:end]
+            nodes = np.zeros(end - start, dtype=NODE_DTYPE)
+            nodes["left_child"] = np.where(leaf, TREE_LEAF, self.left[start:end] - start)
+            nodes["right_child"] = np.where(leaf, TREE_LEAF, self.right[start:end] - start)
+            nodes["feature"] = np.where(leaf, TREE_UNDEFINED, self.feature[start:end])
+            nodes["threshold"] = np.where(leaf, TREE_UNDEFINED, self.threshold[start:end])
+            nodes["missing_go_to_left"] = self.missing_left[start:end]
+
+            tree = Tree(self.n_features_in_, np.array([1], dtype=np.intp), 1)
+            tree.__setstate__({
+                "max_depth": int(depth[start:end].max()),
+                "node_count": end - start,
+                "nodes": nodes,
+                "values": self.value[start:end].astype(np.float64).reshape(-1, 1, 1),
+            })
+            estimator = DecisionTreeRegressor(**params)
+            estimator.tree_ = tree
+            estimator.n_features_in_ = self.n_features_in_
+            estimator.n_outputs_ = 1
+            estimator.max_features_ = self.n_features_in_
+            estimators.append(estimator)
+
+        forest = RandomForestRegressor(**{**self.params, "n_estimators": len(estimators)})
+        forest.estimator_ = DecisionTreeRegressor(**params)
+        forest.estimators_ = estimators
+        forest.n_features_in_ = self.n_features_in_
+        forest.n_outputs_ = 1
+        if hasattr(self, "feature_names_in_"):
+            forest.feature_names_in_ = self.feature_names_in_
+        return forest
+
+    def _depths(self) -> np.ndarray:
+        """Profundidade de cada nó (todas as árvores, nível a nível)."""
+        depth = np.zeros(len(self.left), dtype=np.intp)
+        level, frontier = 0, self.roots
+        while len(frontier):
+            depth[frontier] = level
+            inner = frontier[~self._is_leaf[frontier]]
+            frontier = np.concatenate([self.left[inner], self.right[inner]])
+            level += 1
+        return depth
+
+    def predict(self, X) -> np.ndarray:
+        if hasattr(X, "columns") and hasattr(self, "feature_names_in_"):
+            X = X[list(self.feature_names_in_)]
+
+        if len(X) >= SKLEARN_MIN_ROWS:
+            if self._forest is None:
+                self._forest = self.to_forest()
+            return self._forest.predict(X)
+
+        # Mesma conversão que o sklearn faz antes de percorrer as árvores
+        X = np.asarray(X, dtype=np.float32)
+        n, p = X.shape
+        values = X.ravel()
+        has_nan = bool(np.isnan(values).any())
+
+        node = np.tile(self.roots.astype(np.intp), n)
+        offset = np.repeat(np.arange(n, dtype=np.intp) * p, self.n_estimators)
+
+        # Cada passo desce um nível; só os pares (linha, árvore) que ainda
+        # não chegaram a uma folha continuam
+        pending = np.flatnonzero(~self._is_leaf[node])
+        while len(pending):
+            current = node[pending]
+            x = values[offset[pending] + self._feature[current]]
+            go_right = ~(x <= self.threshold[current])
+            if has_nan:
+                missing = np.isnan(x)
+                go_right[missing] = ~self.missing_left[current[missing]]
+            current = self._children[2 * current + go_right]
+            node[pending] = current
+            pending = pending[~self._is_leaf[current]]
+
+        return self.value[node].reshape(n, self.n_estimators).mean(axis=1, dtype=np.float64)
+
+    def grow(self, X, y, n_trees: int) -> "CompactForest":
+        """Treina n_trees árvores novas em (X, y), com os mesmos hiperparâmetros, e acrescenta-as."""
+        seed = self.params.get("random_state")
+        forest = RandomForestRegressor(**{
+            **self.params,
+            "n_estimators": n_trees,
+            # Sementes diferentes das árvores já existentes
+            "random_state": None if seed is None else seed + self.n_estimators,
+        })
+        forest.fit(X, y)
+
+        new = self._tree_arrays(forest, offset=len(self.left))
+        for key in ("roots", "left", "right", "feature", "threshold", "missing_left", "value"):
+            setattr(self, key, np.concatenate([getattr(self, key), new[key]]))
+        self._index()
+        return self
@@ -0,0 +1,99 @@
+import time
+from typing import List
+
+import pandas as pd
+
+from src.config.settings import (
+    INCREMENTAL_FULL_REFIT_EVERY,
+    INCREMENTAL_TREES_PER_UPDATE,
+    PROCESSED_DIR,
+)
+from src.models.artifact_store import get_store
+from src.models.compact_forest import CompactForest
+from src.models.model_specs import ModelSpec, design_matrix, fit_spec, full_training_record, save_model
+from src.models.train_pipeline import ALL_SPECS
+from src.utils.io import read_table
+
+
+def _is_forest(model) -> bool:
+    return hasattr(model, "estimators_") and hasattr(model, "n_estimators")
+
+
+def _warm_update(spec: ModelSpec, model, df: pd.DataFrame, new: pd.DataFrame):
+    """
+    Atualiza um modelo existente:
+    - GLM (PoissonRegressor): novo fit em todo o histórico a partir dos
+      coeficientes anteriores (warm_start), que converge em poucas iterações
+    - RandomForest: acrescenta INCREMENTAL_TREES_PER_UPDATE árvores treinadas
+      só nos jogos novos, mantendo as árvores existentes (CompactForest.grow
+      nos artefactos .forest.npz; warm_start nos .joblib/.pkl antigos)
+    """
+    if isinstance(model, CompactForest):
+        X, y = design_matrix(new, spec)
+        return model.grow(X[list(model.feature_names_in_)], y, INCREMENTAL_TREES_PER_UPDATE)
+
+    if _is_forest(model):
+        X, y = design_matrix(new, spec)
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + INCREMENTAL_TREES_PER_UPDATE)
+    else:
+        X, y = design_matrix(df, spec)
+        model.set_params(warm_start=True)
+
+    # Mesma ordem de colunas do treino anterior (a de train_all_models é
+    # diferente da de design_matrix): as árvores/coeficientes já existentes
+    # referem-se às colunas por posição
+    columns = getattr(model, "feature_names_in_", None)
+    if columns is not None:
+        X = X[list(columns)]
+
+    model.fit(X, y)
+    return model
+
+
+def update_models(
+    specs: List[ModelSpec] = ALL_SPECS,
+    full_refit_every: int = INCREMENTAL_FULL_REFIT_EVERY,
+    force_full: bool = False,
+):
+    """
+    Treino incremental depois de cada jornada.
+
+    O manifesto de cada artefacto (entrada "training", ver ArtifactStore)
+    guarda os match_id já vistos, também nos treinos de raiz de
+    train_all_models/train_specs; só os jogos novos desencadeiam uma
+    atualização. A cada `full_refit_every` atualizações (ou com force_full)
+    o modelo é retreinado de raiz em todo o histórico. Aplica-se aos modelos
+    por alvo (MODEL_MODE="per_target").
+    """
+    df = read_table(PROCESSED_DIR, "features_train")
+    store = get_store()
+
+    for spec in specs:
+        entry = (store.entry(spec.name) or {}).get("training") or {}
+        seen = set(entry.get("match_ids", []))
+        new = df[~df["match_id"].astype(str).isin(seen)]
+        exists = store.exists(spec.name)
+
+        if new.empty and exists and not force_full:
+            print(f"{spec.label}: sem jogos novos")
+            continue
+
+        start = time.perf_counter()
+        updates = entry.get("updates_since_full", 0)
+        full = force_full or not exists or not seen or updates + 1 >= full_refit_every
+
+        X, y = design_matrix(df, spec)
+        if full:
+            model, _, _ = fit_spec(spec, X, y, n_jobs=-1)
+            training = full_training_record(df)
+        else:
+            model = _warm_update(spec, store.load(spec.name), df, new)
+            training = {**entry, "match_ids": sorted(df["match_id"].astype(str)), "updates_since_full": updates + 1}
+
+        columns = getattr(model, "feature_names_in_", None)
+        save_model(model, spec, X if columns is None else X[list(columns)], y, store.artifacts_dir, training)
+
+        kind = "de raiz" if full else "incremental"
+        print(f"{spec.label}: treino {kind} com {len(new)} jogos novos ({time.perf_counter() - start:.2f}s)")
+
+    print("✔ Modelos atualizados")
@@ -0,0 +1,101 @@
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+
+from src.config.settings import ARTIFACTS_DIR
+from src.models.artifact_store import ArtifactStore, hash_training_data
+
+
+# Melhores hiperparâmetros por família, escritos por src/models/tuning.py
+TUNED_PARAMS_PATH = ARTIFACTS_DIR / "tuning" / "best_params.json"
+
+# Colunas de features_train que não entram nos modelos
+NON_FEATURE_COLUMNS = ["match_id", "home_team", "away_team", "extra"]
+
+
+@dataclass
+class ModelSpec:
+    """
+    Definição de um modelo (um artefacto): alvo, colunas a excluir de X e
+    fábrica do estimador. `make_model(n_jobs)` recebe o nº de cores que o
+    modelo pode usar.
+    """
+    name: str
+    label: str
+    target: str
+    make_model: Callable[[int], object]
+    drop_columns: List[str] = field(default_factory=list)
+
+
+def tuned_params(family: str, path: Path = TUNED_PARAMS_PATH) -> dict:
+    """Hiperparâmetros afinados de uma família (vazio se nunca foi afinada)."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get(family, {}).get("params", {})
+
+
+def feature_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Todas as colunas numéricas candidatas a features (inclui os alvos)."""
+    return df.drop(columns=[col for col in NON_FEATURE_COLUMNS if col in df.columns])
+
+
+def design_matrix(df: pd.DataFrame, spec: ModelSpec) -> Tuple[pd.DataFrame, pd.Series]:
+    """X e y de um modelo a partir de features_train."""
+    X = feature_frame(df).drop(columns=spec.drop_columns)
+    return X, df[spec.target]
+
+
+def fit_spec(spec: ModelSpec, X: pd.DataFrame, y: pd.Series, n_jobs: int = 1):
+    """Treina o modelo e devolve (modelo, MAE no treino, segundos)."""
+    start = time.perf_counter()
+    model = spec.make_model(n_jobs)
+    model.fit(X, y)
+    mae = mean_absolute_error(y, model.predict(X))
+    return model, mae, time.perf_counter() - start
+
+
+def full_training_record(df: pd.DataFrame) -> dict:
+    """
+    Registo de um treino de raiz em `df` (features_train), guardado no
+    manifesto do artefacto: o treino incremental só trata como novos os
+    match_id que não estão aqui e volta a contar as atualizações do zero.
+    """
+    return {
+        "match_ids": sorted(df["match_id"].astype(str)),
+        "updates_since_full": 0,
+        "last_full_refit": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def save_model(
+    model,
+    spec: ModelSpec,
+    X: pd.DataFrame = None,
+    y=None,
+    artifacts_dir: Path = ARTIFACTS_DIR,
+    training: Optional[dict] = None,
+):
+    """Guarda o artefacto (ver ArtifactStore) com a ordem das colunas, o hash de X/y e o registo do treino."""
+    ArtifactStore(artifacts_dir).save(
+        model,
+        spec.name,
+        feature_columns=list(X.columns) if X is not None else None,
+        data_hash=hash_training_data(X, y) if X is not None else None,
+        training=training,
+    )
+
+
+def train_specs(specs: List[ModelSpec], df: pd.DataFrame, n_jobs: int = -1):
+    """Treino sequencial de uma família de modelos (usado pelos train_*)."""
+    training = full_training_record(df)
+    for spec in specs:
+        X, y = design_matrix(df, spec)
+        model, mae, _ = fit_spec(spec, X, y, n_jobs)
+        print(f"MAE {spec.label}: {mae:.3f}")
+        save_model(model, spec, X, y, training=training)
@@ -0,0 +1,83 @@
+from typing import Sequence, Union
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+
+
+class MultiOutputPoissonRegressor(RegressorMixin, BaseEstimator):
+    """
+    GLM de Poisson (ligação log) com várias saídas, treinado num único fit.
+
+    Minimiza para cada alvo o mesmo objetivo do PoissonRegressor,
+    mean(exp(η) - y·η) + alpha/2·||w||², pelo que os coeficientes são os de
+    k PoissonRegressor; mas o fit é um só método de Newton para todos os
+    alvos: em cada iteração X é multiplicada uma vez (X @ W) e os k
+    sistemas (p+1 x p+1) são montados e resolvidos em conjunto.
+    `alpha` pode ser um valor por alvo.
+    """
+
+    def __init__(self, alpha: Union[float, Sequence[float]] = 0.1, max_iter: int = 100, tol: float = 1e-4):
+        self.alpha = alpha
+        self.max_iter = max_iter
+        self.tol = tol
+
+    @staticmethod
+    def _objective(X1, Y, theta, penalty):
+        eta = X1 @ theta.T
+        return np.mean(np.exp(eta) - Y * eta, axis=0) + 0.5 * np.sum(penalty * theta ** 2, axis=1), eta
+
+    def fit(self, X, Y):
+        if hasattr(X, "columns"):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        X = np.asarray(X, dtype=np.float64)
+        Y = np.asarray(Y, dtype=np.float64)
+        Y = Y.reshape(len(Y), -1)
+        n, p = X.shape
+        k = Y.shape[1]
+
+        # Coluna de uns para o intercept, que não é penalizado
+        X1 = np.hstack([X, np.ones((n, 1))])
+        penalty = np.zeros((k, p + 1))
+        penalty[:, :p] = np.broadcast_to(np.asarray(self.alpha, dtype=np.float64), (k,))[:, None]
+
+        # Como o PoissonRegressor: coeficientes a zero e intercept = log(média de y)
+        theta = np.zeros((k, p + 1))
+        theta[:, p] = np.log(Y.mean(axis=0))
+        loss, eta = self._objective(X1, Y, theta, penalty)
+
+        self.n_iter_ = 0
+        for self.n_iter_ in range(1, self.max_iter + 1):
+            mu = np.exp(eta)
+            grad = (mu - Y).T @ X1 / n + penalty * theta
+            if np.max(np.abs(grad)) <= self.tol:
+                break
+
+            hessian = np.einsum("ni,nk,nj->kij", X1, mu, X1) / n + penalty[:, :, None] * np.eye(p + 1)
+            step = np.linalg.solve(hessian, grad[:, :, None])[:, :, 0]
+
+            # Passo de Newton com recuo (por alvo) até o objetivo descer
+            t = np.ones(k)
+            for _ in range(30):
+                candidate = theta - t[:, None] * step
+                new_loss, new_eta = self._objective(X1, Y, candidate, penalty)
+                worse = ~(new_loss <= loss)
+                if not worse.any():
+                    break
+                t[worse] /= 2
+            else:
+                # Alvos sem descida possível ficam como estão
+                t[worse] = 0.0
+                candidate = theta - t[:, None] * step
+                new_loss, new_eta = self._objective(X1, Y, candidate, penalty)
+            theta, loss, eta = candidate, new_loss, new_eta
+
+        self.coef_ = theta[:, :p].copy()
+        self.intercept_ = theta[:, p].copy()
+        self.n_features_in_ = p
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        """Taxas previstas (n x k), uma coluna por alvo pela ordem do fit."""
+        if hasattr(X, "columns") and hasattr(self, "feature_names_in_"):
+            X = X[list(self.feature_names_in_)]
+        return np.exp(np.asarray(X, dtype=np.float64) @ self.coef_.T + self.intercept_)
@@ -1,38 +1,151 @@
-import joblib
-import pandas as pd
+import threading
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
 
-from src.config.settings import PROCESSED_DIR
+from src.config.settings import ARTIFACTS_DIR, MODEL_MODE, PREDICTIONS_DIR, PROCESSED_DIR
 from src.domain.schemas import MatchPrediction
+from src.models.artifact_store import ArtifactStore
+from src.models.simulation import attach_intervals, simulate_matches
+from src.models.train_multi_output import MULTI_OUTPUT_NAME, TARGET_FIELDS
+from src.utils.io import read_table, table_exists, write_table
+
+# Artefacto -> campo de MatchPrediction
+MODEL_FIELDS = {
+    "corners_home": "predicted_corners_home",
+    "corners_away": "predicted_corners_away",
+    "shots_home": "predicted_shots_home",
+    "shots_away": "predicted_shots_away",
+    "cards_home": "predicted_yellow_cards_home",
+    "cards_away": "predicted_yellow_cards_away",
+}
+
+ID_COLUMNS = ["match_id", "home_team", "away_team"]
+
+
+class ModelRegistry:
+    """
+    Cache de modelos partilhada pelo processo.
+
+    Cada artefacto é carregado apenas quando é pedido pela primeira vez e
+    volta a ser carregado só se o ficheiro for alterado (mtime), por exemplo
+    depois de um novo treino. A leitura passa pelo ArtifactStore (GLMs só
+    com coeficientes; RandomForest em arrays compactos, ver CompactForest).
+    """
+
+    def __init__(self, artifacts_dir: Path = ARTIFACTS_DIR):
+        self.artifacts_dir = Path(artifacts_dir)
+        self.store = ArtifactStore(self.artifacts_dir)
+        self._models: Dict[str, Tuple[Tuple[str, int], object]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        path = self.store.path(name)
+        version = (path.name, path.stat().st_mtime_ns)
+
+        with self._lock:
+            cached = self._models.get(name)
+            if cached is None or cached[0] != version:
+                cached = (version, self.store.load(name))
+                self._models[name] = cached
+
+        return cached[1]
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
 
 
-ARTIFACTS_DIR = Path("src/models/artifacts")
+_registry = ModelRegistry()
 
 
-def predict_match(features_row: pd.Series) -> MatchPrediction:
-    # Carregar modelos
-    corners_home = joblib.load(ARTIFACTS_DIR / "corners_home.pkl")
-    corners_away = joblib.load(ARTIFACTS_DIR / "corners_away.pkl")
+def get_registry() -> ModelRegistry:
+    """Registry por omissão, partilhado por todo o processo."""
+    return _registry
 
-    shots_home = joblib.load(ARTIFACTS_DIR / "shots_home.pkl")
-    shots_away = joblib.load(ARTIFACTS_DIR / "shots_away.pkl")
 
-    cards_home = joblib.load(ARTIFACTS_DIR / "cards_home.pkl")
-    cards_away = joblib.load(ARTIFACTS_DIR / "cards_away.pkl")
+def _model_input(model, X: pd.DataFrame) -> pd.DataFrame:
+    """Seleciona (e ordena) as colunas com que o modelo foi treinado."""
+    columns = getattr(model, "feature_names_in_", None)
+    return X if columns is None else X[list(columns)]
+
+
+def predict_batch(
+    features_df: pd.DataFrame,
+    registry: Optional[ModelRegistry] = None,
+    mode: str = MODEL_MODE,
+) -> List[MatchPrediction]:
+    """
+    Previsões para todos os jogos de `features_df` (uma linha por jogo),
+    com uma única chamada a `.predict` por modelo. Com mode="multi_output"
+    há um único modelo (e uma única chamada) para todos os campos.
+    """
+    registry = registry or get_registry()
 
     # Features (remover colunas não numéricas)
-    X = features_row.drop(labels=["match_id", "home_team", "away_team"]).to_frame().T
-
-    return MatchPrediction(
-        match_id=features_row["match_id"],
-        home_team=features_row["home_team"],
-        away_team=features_row["away_team"],
-        predicted_corners_home=float(corners_home.predict(X)[0]),
-        predicted_corners_away=float(corners_away.predict(X)[0]),
-        predicted_shots_home=float(shots_home.predict(X)[0]),
-        predicted_shots_away=float(shots_away.predict(X)[0]),
-        predicted_yellow_cards_home=float(cards_home.predict(X)[0]),
-        predicted_yellow_cards_away=float(cards_away.predict(X)[0]),
-        predicted_xg_home=0.0,  # reservado para modelo futuro
-        predicted_xg_away=0.0,
-    )
+    X = features_df.drop(columns=ID_COLUMNS)
+
+    predicted = {}
+    if mode == "multi_output":
+        model = registry.get(MULTI_OUTPUT_NAME)
+        outputs = model.predict(_model_input(model, X))
+        for i, target in enumerate(model.target_names_):
+            predicted[TARGET_FIELDS[target]] = outputs[:, i]
+    else:
+        for name, field in MODEL_FIELDS.items():
+            model = registry.get(name)
+            predicted[field] = model.predict(_model_input(model, X))
+
+    predictions = []
+    for i in range(len(features_df)):
+        predictions.append(MatchPrediction(
+            match_id=features_df["match_id"].iat[i],
+            home_team=features_df["home_team"].iat[i],
+            away_team=features_df["away_team"].iat[i],
+            **{field: float(values[i]) for field, values in predicted.items()},
+            # Sem modelo próprio de xG: média de xG da equipa (features)
+            predicted_xg_home=float(features_df["home_avg_xg"].iat[i]),
+            predicted_xg_away=float(features_df["away_avg_xg"].iat[i]),
+        ))
+
+    return predictions
+
+
+def predictions_to_frame(predictions: List[MatchPrediction]) -> pd.DataFrame:
+    return pd.DataFrame([p.__dict__ for p in predictions])
+
+
+def predict_match(features_row: pd.Series, registry: Optional[ModelRegistry] = None) -> MatchPrediction:
+    return predict_batch(features_row.to_frame().T, registry)[0]
+
+
+def generate_predictions(
+    processed_dir: Path = PROCESSED_DIR,
+    predictions_dir: Path = PREDICTIONS_DIR,
+    registry: Optional[ModelRegistry] = None,
+    mode: str = MODEL_MODE,
+) -> pd.DataFrame:
+    """
+    Gera previsões para todos os jogos da próxima jornada.
+    Lê features_next_round e produz predictions_next_round (com intervalos
+    de confiança simulados) e as tabelas de probabilidades da simulação.
+    """
+    if not table_exists(processed_dir, "features_next_round"):
+        raise FileNotFoundError(
+            f"Tabela features_next_round não encontrada em {processed_dir}. "
+            "Gera primeiro as features da próxima jornada."
+        )
+
+    df = read_table(processed_dir, "features_next_round")
+    predictions = predict_batch(df, registry, mode)
+
+    # Uma única simulação: dela saem os intervalos das previsões e as
+    # distribuições (resultados exatos, 1X2 e over/under por linha)
+    simulation = simulate_matches(predictions_to_frame(predictions))
+    pred_df = predictions_to_frame(attach_intervals(predictions, simulation=simulation))
+    write_table(pred_df, predictions_dir, "predictions_next_round")
+    write_table(simulation.scores, predictions_dir, "scores_next_round")
+    write_table(simulation.outcomes, predictions_dir, "outcomes_next_round")
+    write_table(simulation.over_under, predictions_dir, "over_under_next_round")
+    return pred_df
@@ -0,0 +1,301 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Empty, Queue
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from src.config.settings import (
+    MODEL_MODE,
+    RAW_DIR,
+    SERVICE_MAX_BATCH,
+    SERVICE_MAX_WAIT_MS,
+)
+from src.domain.schemas import MatchPrediction
+from src.features.feature_builder import FeatureBuilder
+from src.models.predict import ModelRegistry, get_registry, predict_batch
+from src.utils.io import read_table, table_version
+
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyStats:
+    """Latências (ms) dos últimos `window` pedidos e tamanho dos micro-batches."""
+
+    def __init__(self, window: int = 10_000):
+        self._latencies = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def record_request(self, ms: float):
+        with self._lock:
+            self._latencies.append(ms)
+            self.requests += 1
+
+    def record_batch(self, size: int):
+        with self._lock:
+            self._batch_sizes.append(size)
+
+    def summary(self) -> dict:
+        with self._lock:
+            latencies = np.array(self._latencies)
+            batches = np.array(self._batch_sizes)
+            requests = self.requests
+
+        if latencies.size == 0:
+            return {"requests": requests}
+        return {
+            "requests": requests,
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+            "max_ms": round(float(latencies.max()), 3),
+            "batches": int(batches.size),
+            "mean_batch_size": round(float(batches.mean()), 2) if batches.size else 0.0,
+        }
+
+
+class PredictionService:
+    """
+    Previsões a pedido para quaisquer jogos (equipa da casa x equipa de fora).
+
+    Os modelos (ModelRegistry) e o estado das equipas (TeamIndex do
+    FeatureBuilder, com os jogos terminados) ficam em memória. Os pedidos
+    concorrentes são agrupados em micro-batches: um thread junta até
+    `max_batch` jogos, esperando no máximo `max_wait_ms` pelo próximo
+    pedido, e faz uma única chamada vetorizada (build_features +
+    predict_batch) para todos.
+    """
+
+    def __init__(
+        self,
+        registry: Optional[ModelRegistry] = None,
+        mode: str = MODEL_MODE,
+        max_batch: int = SERVICE_MAX_BATCH,
+        max_wait_ms: float = SERVICE_MAX_WAIT_MS,
+    ):
+        self.registry = registry or get_registry()
+        self.mode = mode
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.stats = LatencyStats()
+
+        self._queue: "Queue[Tuple[str, str, Future]]" = Queue()
+        self._builder: Optional[FeatureBuilder] = None
+        self._version = None
+        self._teams = set()
+        self.reload()
+
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    # ---------------------------------------------------------
+    # Estado em memória
+    # ---------------------------------------------------------
+
+    def reload(self):
+        """(Re)carrega o histórico das equipas se data/raw mudou."""
+        version = (table_version(RAW_DIR, "matches"), table_version(RAW_DIR, "match_stats"))
+        if version == self._version:
+            return False
+
+        # Histórico só com jogos terminados: os jogos por jogar contariam na
+        # forma como derrotas (0 pontos), ao contrário de build_next_round_features
+        matches = read_table(RAW_DIR, "matches")
+        played = matches[matches["home_score"].notna() & matches["away_score"].notna()]
+
+        builder = FeatureBuilder(played)
+        builder.team_index  # constrói já o índice, fora do caminho dos pedidos
+        self._teams = set(played["home_team"].dropna()) | set(played["away_team"].dropna())
+        self._builder, self._version = builder, version
+        logger.info(f"Estado carregado: {len(builder.df)} jogos, {len(self._teams)} equipas")
+        return True
+
+    @property
+    def teams(self) -> List[str]:
+        return sorted(self._teams)
+
+    def warm_up(self):
+        """Carrega os modelos antes do primeiro pedido."""
+        if len(self._teams) >= 2:
+            home, away = self.teams[:2]
+            self.predict(home, away)
+
+    # ---------------------------------------------------------
+    # Micro-batching
+    # ---------------------------------------------------------
+
+    def submit(self, home_team: str, away_team: str) -> Future:
+        for team in (home_team, away_team):
+            if team not in self._teams:
+                raise KeyError(f"Equipa desconhecida: {team}")
+        future = Future()
+        self._queue.put((home_team, away_team, future))
+        return future
+
+    def predict(self, home_team: str, away_team: str, timeout: float = 10.0) -> MatchPrediction:
+        start = time.perf_counter()
+        prediction = self.submit(home_team, away_team).result(timeout)
+        self.stats.record_request((time.perf_counter() - start) * 1000)
+        return prediction
+
+    def _next_batch(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                predictions = self._predict_batch([(home, away) for home, away, _ in batch])
+                for (_, _, future), prediction in zip(batch, predictions):
+                    future.set_result(prediction)
+            except Exception as exc:  # o erro chega a todos os pedidos do batch
+                logger.exception("Erro a prever um micro-batch")
+                for _, _, future in batch:
+                    future.set_exception(exc)
+            self.stats.record_batch(len(batch))
+
+    def _predict_batch(self, fixtures: List[Tuple[str, str]]) -> List[MatchPrediction]:
+        fixtures_df = pd.DataFrame(fixtures, columns=["home_team", "away_team"])
+        fixtures_df.insert(0, "match_id", [f"{home} x {away}" for home, away in fixtures])
+
+        features = self._builder.build_features(fixtures_df)
+        return predict_batch(features, registry=self.registry, mode=self.mode)
+
+
+# ---------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------
+
+# Tempo máximo (s) à espera das previsões de um pedido
+REQUEST_TIMEOUT = 10.0
+
+
+def parse_fixtures(payload) -> List[Tuple[str, str]]:
+    """
+    Jogos de um corpo POST /predict ({"fixtures": [{"home_team", "away_team"}, ...]}).
+    ValueError (-> 400) se o corpo não tiver esse formato.
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("fixtures"), list):
+        raise ValueError('Corpo esperado: {"fixtures": [{"home_team": ..., "away_team": ...}, ...]}')
+
+    fixtures = []
+    for i, fixture in enumerate(payload["fixtures"]):
+        if not isinstance(fixture, dict):
+            raise ValueError(f"fixtures[{i}] não é um objeto")
+        teams = (fixture.get("home_team"), fixture.get("away_team"))
+        if not all(isinstance(team, str) and team for team in teams):
+            raise ValueError(f"fixtures[{i}]: home_team e away_team são obrigatórios (texto)")
+        fixtures.append(teams)
+    return fixtures
+
+
+def make_server(service: PredictionService, host: str, port: int) -> ThreadingHTTPServer:
+    """
+    Servidor HTTP (um thread por ligação):
+    - GET  /predict?home=<equipa>&away=<equipa>
+    - POST /predict  {"fixtures": [{"home_team": ..., "away_team": ...}, ...]}
+    - GET  /teams, /stats (latência p50/p99), /health
+    - POST /reload   (relê data/raw se tiver mudado)
+
+    Pedidos mal formados ou com equipas desconhecidas -> 400; erro dos
+    modelos -> 500; previsões sem resposta em REQUEST_TIMEOUT s -> 504.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True  # cabeçalhos e corpo seguem sem esperar pelo ACK
+
+        def _send(self, status: int, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _predict(self, fixtures: List[Tuple[str, str]]):
+            try:
+                futures = [service.submit(home, away) for home, away in fixtures]
+            except KeyError as exc:
+                self._send(400, {"error": str(exc.args[0])})
+                return
+
+            start = time.perf_counter()
+            deadline = start + REQUEST_TIMEOUT
+            try:
+                predictions = [future.result(timeout=max(0.0, deadline - time.perf_counter())) for future in futures]
+            except FutureTimeoutError:
+                self._send(504, {"error": f"Sem previsões ao fim de {REQUEST_TIMEOUT:g}s"})
+                return
+            except Exception as exc:
+                self._send(500, {"error": f"Erro ao prever: {exc}"})
+                return
+            service.stats.record_request((time.perf_counter() - start) * 1000)
+            self._send(200, [p.__dict__ for p in predictions])
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/predict":
+                query = parse_qs(url.query)
+                if "home" not in query or "away" not in query:
+                    self._send(400, {"error": "Parâmetros obrigatórios: home, away"})
+                    return
+                self._predict([(query["home"][0], query["away"][0])])
+            elif url.path == "/teams":
+                self._send(200, service.teams)
+            elif url.path == "/stats":
+                self._send(200, service.stats.summary())
+            elif url.path == "/health":
+                self._send(200, {"status": "ok"})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send(400, {"error": "JSON inválido"})
+                return
+
+            if url.path == "/predict":
+                try:
+                    fixtures = parse_fixtures(payload)
+                except ValueError as exc:
+                    self._send(400, {"error": str(exc)})
+                    return
+                self._predict(fixtures)
+            elif url.path == "/reload":
+                try:
+                    self._send(200, {"reloaded": service.reload()})
+                except Exception as exc:
+                    logger.exception("Erro a recarregar o serviço")
+                    self._send(500, {"error": f"Erro ao recarregar: {exc}"})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
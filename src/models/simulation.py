@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.special import gammaln, xlogy
+
+from src.config.settings import SIMULATION_INTERVAL, SIMULATION_SAMPLES
+from src.domain.business_rules import DEFAULT_LINES, MARKETS
+from src.domain.schemas import MatchPrediction
+
+
+# Estatísticas simuladas: nome -> (taxa casa, taxa fora). Os golos usam o xG.
+SIMULATED_STATS = {
+    **MARKETS,
+    "goals": ("predicted_xg_home", "predicted_xg_away"),
+}
+
+# Jogos por bloco (limita a memória das grelhas casa x fora)
+CHUNK_SIZE = 512
+
+
+@dataclass
+class MatchSimulation:
+    """
+    Resultado de simulate_matches (tabelas longas, uma linha por jogo e ...):
+    - intervals: ... estatística (casa, fora, total) -> quantis low/high
+    - over_under: ... mercado e linha -> p_over/p_under do total
+    - scores: ... resultado exato (golos casa, golos fora) até max_goals
+    - outcomes: vitória casa / empate / vitória fora
+    """
+    intervals: pd.DataFrame
+    over_under: pd.DataFrame
+    scores: pd.DataFrame
+    outcomes: pd.DataFrame
+
+
+def _support(rates: np.ndarray) -> int:
+    """Valores 0..K-1 cobrem a distribuição (cauda > 6 desvios-padrão é desprezável)."""
+    top = float(np.nanmax(rates, initial=0.0))
+    return int(np.ceil(top + 6 * np.sqrt(top) + 6))
+
+
+def _poisson_pmf(rates: np.ndarray, k: int) -> np.ndarray:
+    """pmf de Poisson em 0..k-1 (n x k); a massa da cauda fica no último valor."""
+    values = np.arange(k)
+    pmf = np.exp(xlogy(values, rates[:, None]) - rates[:, None] - gammaln(values + 1))
+    pmf[:, -1] += np.clip(1.0 - pmf.sum(axis=1), 0.0, None)
+    return pmf
+
+
+def _joint_counts(rng: np.random.Generator, home: np.ndarray, away: np.ndarray, n_samples: int) -> np.ndarray:
+    """
+    Histograma de `n_samples` amostras conjuntas (casa, fora) por jogo
+    (n x K x K). Equivalente a tirar as amostras uma a uma e contá-las, mas
+    numa única chamada multinomial sobre a grelha de valores possíveis.
+    """
+    k = _support(np.concatenate([home, away]))
+    joint = _poisson_pmf(home, k)[:, :, None] * _poisson_pmf(away, k)[:, None, :]
+    joint = joint.reshape(len(home), k * k)
+    joint /= joint.sum(axis=1, keepdims=True)
+    return rng.multinomial(n_samples, joint).reshape(len(home), k, k)
+
+
+def _total_counts(joint: np.ndarray) -> np.ndarray:
+    """Histograma de casa + fora a partir do histograma conjunto (n x 2K-1)."""
+    n, k, _ = joint.shape
+    total = np.zeros((n, 2 * k - 1), dtype=joint.dtype)
+    for h in range(k):
+        total[:, h:h + k] += joint[:, h, :]
+    return total
+
+
+def _quantiles(counts: np.ndarray, q: float) -> np.ndarray:
+    """Quantil q de cada histograma (linha) de contagens."""
+    cdf = np.cumsum(counts, axis=1) / counts.sum(axis=1, keepdims=True)
+    return np.argmax(cdf >= q, axis=1).astype(float)
+
+
+def _simulate_chunk(rng, chunk: pd.DataFrame, n_samples: int, level: float,
+                    lines: Dict[str, Sequence[float]], max_goals: int) -> Dict[str, list]:
+    q_low, q_high = (1 - level) / 2, (1 + level) / 2
+    ids = chunk["match_id"].to_numpy()
+    out = {"intervals": [], "over_under": [], "scores": [], "outcomes": []}
+
+    for stat, (col_home, col_away) in SIMULATED_STATS.items():
+        home = chunk[col_home].to_numpy(dtype=float)
+        away = chunk[col_away].to_numpy(dtype=float)
+        missing = np.isnan(home) | np.isnan(away)
+        home, away = np.where(missing, 0.0, home), np.where(missing, 0.0, away)
+
+        joint = _joint_counts(rng, home, away, n_samples)
+        total = _total_counts(joint)
+
+        for side, counts in (("home", joint.sum(axis=2)), ("away", joint.sum(axis=1)), ("total", total)):
+            low, high = _quantiles(counts, q_low), _quantiles(counts, q_high)
+            out["intervals"].append(pd.DataFrame({
+                "match_id": ids,
+                "stat": f"{stat}_{side}",
+                "low": np.where(missing, np.nan, low),
+                "high": np.where(missing, np.nan, high),
+            }))
+
+        if stat in lines:
+            market_lines = np.asarray(lines[stat], dtype=float)
+            # P(total > linha) = 1 - P(total <= floor(linha)); P(total < linha) = P(total <= ceil(linha) - 1)
+            cdf = np.cumsum(total, axis=1) / n_samples
+            last = cdf.shape[1] - 1
+            p_over = 1 - cdf[:, np.clip(np.floor(market_lines).astype(int), 0, last)]
+            under_idx = np.ceil(market_lines).astype(int) - 1
+            p_under = np.where(under_idx >= 0, cdf[:, np.clip(under_idx, 0, last)], 0.0)
+            p_over[missing], p_under[missing] = np.nan, np.nan
+
+            k = len(market_lines)
+            out["over_under"].append(pd.DataFrame({
+                "match_id": np.repeat(ids, k),
+                "market": stat,
+                "line": np.tile(market_lines, len(ids)),
+                "p_over": p_over.ravel(),
+                "p_under": p_under.ravel(),
+            }))
+
+        if stat == "goals":
+            probs = joint / n_samples
+            probs[missing] = np.nan
+            g = min(max_goals + 1, joint.shape[1])
+            home_goals, away_goals = np.meshgrid(np.arange(g), np.arange(g), indexing="ij")
+            out["scores"].append(pd.DataFrame({
+                "match_id": np.repeat(ids, g * g),
+                "home_goals": np.tile(home_goals.ravel(), len(ids)),
+                "away_goals": np.tile(away_goals.ravel(), len(ids)),
+                "probability": probs[:, :g, :g].reshape(len(ids), -1).ravel(),
+            }))
+
+            grid = np.subtract.outer(np.arange(joint.shape[1]), np.arange(joint.shape[2]))
+            out["outcomes"].append(pd.DataFrame({
+                "match_id": ids,
+                "p_home_win": (probs * (grid > 0)).sum(axis=(1, 2)),
+                "p_draw": (probs * (grid == 0)).sum(axis=(1, 2)),
+                "p_away_win": (probs * (grid < 0)).sum(axis=(1, 2)),
+            }))
+
+    return out
+
+
+def simulate_matches(
+    predictions: pd.DataFrame,
+    n_samples: int = SIMULATION_SAMPLES,
+    level: float = SIMULATION_INTERVAL,
+    lines: Dict[str, Sequence[float]] = DEFAULT_LINES,
+    max_goals: int = 6,
+    seed: Optional[int] = None,
+) -> MatchSimulation:
+    """
+    Simulação Monte Carlo de todos os jogos de `predictions` (colunas de
+    MatchPrediction). Cada estatística da casa e de fora é Poisson com a
+    taxa prevista (golos: taxa = xG) e são tiradas `n_samples` amostras
+    conjuntas por jogo, de uma vez para todos os jogos (sem ciclos por
+    amostra). Daí saem os quantis do intervalo `level` (casa, fora e total),
+    as probabilidades over/under das `lines`, os resultados exatos e 1X2.
+    """
+    rng = np.random.default_rng(seed)
+    parts = {"intervals": [], "over_under": [], "scores": [], "outcomes": []}
+
+    for start in range(0, len(predictions), CHUNK_SIZE):
+        chunk = predictions.iloc[start:start + CHUNK_SIZE]
+        for name, frames in _simulate_chunk(rng, chunk, n_samples, level, lines, max_goals).items():
+            parts[name].extend(frames)
+
+    def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    intervals = _concat(parts["intervals"])
+    if not intervals.empty:
+        # Ordem por jogo (e não por estatística), como nas restantes tabelas
+        order = pd.Categorical(intervals["match_id"], categories=pd.unique(predictions["match_id"]))
+        intervals = intervals.iloc[np.argsort(order.codes, kind="stable")].reset_index(drop=True)
+
+    return MatchSimulation(
+        intervals=intervals,
+        over_under=_concat(parts["over_under"]),
+        scores=_concat(parts["scores"]),
+        outcomes=_concat(parts["outcomes"]),
+    )
+
+
+def attach_intervals(
+    predictions: List[MatchPrediction],
+    n_samples: int = SIMULATION_SAMPLES,
+    level: float = SIMULATION_INTERVAL,
+    seed: Optional[int] = None,
+    simulation: Optional[MatchSimulation] = None,
+) -> List[MatchPrediction]:
+    """
+    Preenche confidence_low/confidence_high ({estatística: quantil}) de cada
+    previsão. Com `simulation` (simulate_matches destas previsões) usa os
+    intervalos dessa simulação em vez de simular outra vez, para que
+    intervalos e probabilidades venham das mesmas amostras.
+    """
+    if not predictions:
+        return predictions
+
+    if simulation is None:
+        frame = pd.DataFrame([p.__dict__ for p in predictions])
+        simulation = simulate_matches(frame, n_samples, level, lines={}, seed=seed)
+    by_match = {match_id: group for match_id, group in simulation.intervals.groupby("match_id", sort=False)}
+
+    for pred in predictions:
+        group = by_match[pred.match_id]
+        pred.confidence_low = dict(zip(group["stat"], group["low"]))
+        pred.confidence_high = dict(zip(group["stat"], group["high"]))
+    return predictions
@@ -0,0 +1,87 @@
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+
+from src.config.settings import ARTIFACTS_DIR, PROCESSED_DIR, TRAIN_N_JOBS
+from src.models.model_specs import ModelSpec, feature_frame, save_model, tuned_params
+from src.models.multi_poisson import MultiOutputPoissonRegressor
+from src.utils.io import read_table
+
+
+# Alvo (coluna de features_train) -> campo de MatchPrediction
+TARGET_FIELDS = {
+    "home_avg_corners": "predicted_corners_home",
+    "away_avg_corners": "predicted_corners_away",
+    "home_avg_shots": "predicted_shots_home",
+    "away_avg_shots": "predicted_shots_away",
+    "home_avg_yellow_cards": "predicted_yellow_cards_home",
+    "away_avg_yellow_cards": "predicted_yellow_cards_away",
+}
+
+# Alvo -> família de src/models/tuning.py cujos hiperparâmetros (alpha,
+# max_iter) se aplicam. Os remates são afinados como RandomForest e ficam
+# com os valores por omissão.
+TARGET_FAMILIES = {
+    "home_avg_corners": "corners",
+    "away_avg_corners": "corners",
+    "home_avg_yellow_cards": "cards",
+    "away_avg_yellow_cards": "cards",
+}
+
+MULTI_OUTPUT_NAME = "multi_output"
+
+
+def make_multi_output_model(n_jobs: int = -1):
+    """
+    Um único GLM de Poisson para todos os alvos, num só fit (n_jobs não é
+    usado). alpha por alvo e max_iter vêm de tuned_params, como nos
+    train_* por família.
+    """
+    params = {target: {"alpha": 0.1, "max_iter": 300} for target in TARGET_FIELDS}
+    for target, family in TARGET_FAMILIES.items():
+        params[target].update(tuned_params(family))
+
+    return MultiOutputPoissonRegressor(
+        alpha=[params[target]["alpha"] for target in TARGET_FIELDS],
+        max_iter=max(p["max_iter"] for p in params.values()),
+    )
+
+
+MULTI_OUTPUT_SPEC = ModelSpec(
+    MULTI_OUTPUT_NAME, "Multi-output", "", make_multi_output_model, list(TARGET_FIELDS)
+)
+
+
+def train_multi_output_model(
+    n_jobs: int = TRAIN_N_JOBS,
+    features_train: Optional[pd.DataFrame] = None,
+    artifacts_dir: Path = ARTIFACTS_DIR,
+):
+    """
+    Treina um único estimador para todos os alvos (cantos, remates e
+    cartões; casa e fora), num só fit, e guarda-o num só artefacto
+    (multi_output).
+    X é partilhado: todas as features exceto os seis alvos.
+    """
+    df = features_train if features_train is not None else read_table(PROCESSED_DIR, "features_train")
+
+    X = feature_frame(df).drop(columns=MULTI_OUTPUT_SPEC.drop_columns)
+    Y = df[list(TARGET_FIELDS)]
+
+    start = time.perf_counter()
+    model = make_multi_output_model(n_jobs)
+    model.fit(X, Y)
+    # Ordem das saídas de predict(), usada em predict_batch
+    model.target_names_ = list(Y.columns)
+    seconds = time.perf_counter() - start
+
+    predicted = model.predict(X)
+    for i, target in enumerate(model.target_names_):
+        mae = mean_absolute_error(Y[target], predicted[:, i])
+        print(f"MAE {target}: {mae:.3f}")
+
+    save_model(model, MULTI_OUTPUT_SPEC, X, Y, artifacts_dir)
+    print(f"✔ Modelo multi-output guardado com sucesso ({seconds:.2f}s)")
@@ -1,16 +1,131 @@
-from src.models.train_corners import train_corners_model
-from src.models.train_shots import train_shots_model
-from src.models.train_cards import train_cards_model
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
+import joblib
+import numpy as np
+import pandas as pd
 
-def train_all_models():
-    print("=== Treinar modelos de Cantos ===")
-    train_corners_model()
+from src.config.settings import ARTIFACTS_DIR, MODEL_MODE, PROCESSED_DIR, TRAIN_N_JOBS
+from src.models.model_specs import ModelSpec, feature_frame, fit_spec, full_training_record, save_model
+from src.models.train_cards import MODEL_SPECS as CARDS_SPECS
+from src.models.train_corners import MODEL_SPECS as CORNERS_SPECS
+from src.models.train_multi_output import train_multi_output_model
+from src.models.train_shots import MODEL_SPECS as SHOTS_SPECS
+from src.utils.io import read_table
 
-    print("\n=== Treinar modelos de Remates ===")
-    train_shots_model()
 
-    print("\n=== Treinar modelos de Cartões ===")
-    train_cards_model()
+ALL_SPECS: List[ModelSpec] = CORNERS_SPECS + SHOTS_SPECS + CARDS_SPECS
 
-    print("\n✔ Todos os modelos treinados com sucesso")
+# Colunas de X de um modelo na matriz partilhada: intervalo [início, fim) ou lista de posições
+Window = Union[Tuple[int, int], List[int]]
+
+
+def shared_layout(columns: List[str], specs: List[ModelSpec]) -> Tuple[List[str], Dict[str, Window]]:
+    """
+    Ordem das colunas da matriz partilhada e, por modelo, as colunas de X.
+
+    Cada família exclui de X um grupo de colunas (os seus alvos). Com os
+    grupos disjuntos, a ordem G1 .. Gk R G1 .. Gk-1 (R = restantes colunas)
+    deixa o X de cada família num bloco contíguo: é lido da matriz
+    memory-mapped com um slice simples, sem cópia (a indexação por lista
+    copiava a matriz inteira em cada processo). Caso contrário, ordem
+    original e posições (com cópia).
+    """
+    groups = list(dict.fromkeys(tuple(c for c in columns if c in spec.drop_columns) for spec in specs))
+    flat = [c for group in groups for c in group]
+    if not all(groups) or len(flat) != len(set(flat)):
+        return columns, {
+            spec.name: [i for i, c in enumerate(columns) if c not in spec.drop_columns] for spec in specs
+        }
+
+    layout = flat + [c for c in columns if c not in set(flat)] + flat[: len(flat) - len(groups[-1])]
+    starts, position = {}, 0
+    for group in groups:
+        position += len(group)
+        starts[group] = position
+
+    windows = {}
+    for spec in specs:
+        group = tuple(c for c in columns if c in spec.drop_columns)
+        windows[spec.name] = (starts[group], starts[group] + len(columns) - len(group))
+    return layout, windows
+
+
+def _fit_from_matrix(spec: ModelSpec, matrix_path: str, layout: List[str], window: Window, n_jobs: int,
+                     artifacts_dir: Path = ARTIFACTS_DIR, training: Optional[dict] = None):
+    """
+    Treina um modelo num processo do pool. A matriz de features é aberta em
+    modo memory-mapped (só leitura), partilhada por todos os processos; X é
+    uma vista das colunas `window` (ver shared_layout).
+    """
+    matrix = joblib.load(matrix_path, mmap_mode="r")
+    if isinstance(window, tuple):
+        X = pd.DataFrame(matrix[:, window[0]:window[1]], columns=layout[window[0]:window[1]], copy=False)
+    else:
+        X = pd.DataFrame(matrix[:, window], columns=[layout[i] for i in window])
+    y = pd.Series(matrix[:, layout.index(spec.target)], name=spec.target)
+
+    model, mae, seconds = fit_spec(spec, X, y, n_jobs)
+    save_model(model, spec, X, y, artifacts_dir, training=training)
+    return spec.name, mae, seconds
+
+
+def train_all_models(
+    n_jobs: int = TRAIN_N_JOBS,
+    specs: List[ModelSpec] = ALL_SPECS,
+    mode: str = MODEL_MODE,
+    features_train: Optional[pd.DataFrame] = None,
+    artifacts_dir: Path = ARTIFACTS_DIR,
+):
+    """
+    Treina todos os modelos (cantos, remates, cartões; casa e fora).
+    Com mode="multi_output" treina antes um único modelo para todos os alvos.
+
+    features_train é lido uma única vez e os modelos são treinados em
+    paralelo num pool de processos com `n_jobs` cores no total; os cores
+    que sobram são dados aos estimadores que os sabem usar (RandomForest).
+    Com n_jobs=1 o treino é sequencial.
+
+    `features_train` (por omissão lido de data/processed) e `artifacts_dir`
+    permitem treinar outro conjunto de dados, ex.: um shard (liga, época).
+    """
+    if mode == "multi_output":
+        train_multi_output_model(n_jobs, features_train, artifacts_dir)
+        return
+
+    start = time.perf_counter()
+    df = features_train if features_train is not None else read_table(PROCESSED_DIR, "features_train")
+    features = feature_frame(df)
+    layout, windows = shared_layout(list(features.columns), specs)
+    training = full_training_record(df)
+
+    n_workers = max(1, min(n_jobs, len(specs)))
+    model_jobs = max(1, n_jobs // n_workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        matrix_path = str(Path(tmp) / "features_train.mmap")
+        joblib.dump(features[layout].to_numpy(dtype=np.float64), matrix_path)
+
+        if n_workers == 1:
+            results = [_fit_from_matrix(spec, matrix_path, layout, windows[spec.name], model_jobs,
+                                        artifacts_dir, training) for spec in specs]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                futures = [
+                    pool.submit(_fit_from_matrix, spec, matrix_path, layout, windows[spec.name], model_jobs,
+                                artifacts_dir, training)
+                    for spec in specs
+                ]
+                results = [f.result() for f in futures]
+
+    labels = {spec.name: spec.label for spec in specs}
+    print(f"{'modelo':<16} {'MAE':>7} {'tempo (s)':>10}")
+    for name, mae, seconds in results:
+        print(f"{labels[name]:<16} {mae:>7.3f} {seconds:>10.2f}")
+
+    total = time.perf_counter() - start
+    print(f"\n✔ Todos os modelos treinados com sucesso em {total:.2f}s "
+          f"({n_workers} processos x {model_jobs} cores)")
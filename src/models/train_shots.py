@@ -1,43 +1,27 @@
-import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_absolute_error
-import joblib
-from pathlib import Path
 
 from src.config.settings import PROCESSED_DIR
-from src.utils.io import ensure_dir
+from src.models.model_specs import ModelSpec, train_specs, tuned_params
+from src.utils.io import read_table
 
 
-ARTIFACTS_DIR = Path("src/models/artifacts")
+TARGETS = ["home_avg_shots", "away_avg_shots"]
 
 
-def train_shots_model():
-    ensure_dir(ARTIFACTS_DIR)
-
-    df = pd.read_csv(Path(PROCESSED_DIR) / "features_train.csv")
-
-    y_home = df["home_avg_shots"]
-    y_away = df["away_avg_shots"]
+def make_shots_model(n_jobs: int = -1):
+    params = {"n_estimators": 300, **tuned_params("shots")}
+    return RandomForestRegressor(**params, random_state=42, n_jobs=n_jobs)
 
-    X = df.drop(columns=["match_id", "home_team", "away_team",
-                         "home_avg_shots", "away_avg_shots"])
 
-    model_home = RandomForestRegressor(n_estimators=300, random_state=42)
-    model_away = RandomForestRegressor(n_estimators=300, random_state=42)
+MODEL_SPECS = [
+    ModelSpec("shots_home", "Remates Casa", "home_avg_shots", make_shots_model, TARGETS),
+    ModelSpec("shots_away", "Remates Fora", "away_avg_shots", make_shots_model, TARGETS),
+]
 
-    model_home.fit(X, y_home)
-    model_away.fit(X, y_away)
 
-    pred_home = model_home.predict(X)
-    pred_away = model_away.predict(X)
-
-    mae_home = mean_absolute_error(y_home, pred_home)
-    mae_away = mean_absolute_error(y_away, pred_away)
-
-    print(f"MAE Remates Casa: {mae_home:.3f}")
-    print(f"MAE Remates Fora: {mae_away:.3f}")
+def train_shots_model():
+    df = read_table(PROCESSED_DIR, "features_train")
 
-    joblib.dump(model_home, ARTIFACTS_DIR / "shots_home.pkl")
-    joblib.dump(model_away, ARTIFACTS_DIR / "shots_away.pkl")
+    train_specs(MODEL_SPECS, df)
 
     print("✔ Modelos de remates guardados com sucesso")
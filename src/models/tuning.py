@@ -0,0 +1,275 @@
+import hashlib
+import json
+import math
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
+
+from src.config.settings import (
+    TRAIN_N_JOBS,
+    TUNING_CANDIDATES,
+    TUNING_CV_SPLITS,
+    TUNING_ETA,
+)
+from src.data_ingestion.journal import IngestionJournal
+from src.models.artifact_store import hash_training_data
+from src.models.backtest import AUX_COLUMNS, load_backtest_frame
+from src.models.model_specs import TUNED_PARAMS_PATH, ModelSpec, feature_frame
+from src.models.train_cards import MODEL_SPECS as CARDS_SPECS
+from src.models.train_corners import MODEL_SPECS as CORNERS_SPECS
+from src.models.train_shots import MODEL_SPECS as SHOTS_SPECS
+
+
+TUNING_DIR = TUNED_PARAMS_PATH.parent
+
+# Dados partilhados pelos processos do pool (definidos em _init_worker)
+_worker_cache: Optional[dict] = None
+
+
+@dataclass
+class SearchFamily:
+    """
+    Família de modelos a afinar (cantos, remates, cartões).
+
+    O orçamento de cada trial é o hiperparâmetro `budget_param` (nº de
+    árvores, iterações do solver), que cresce de `min_budget` até
+    `max_budget` ao longo das rondas de successive halving.
+    """
+    name: str
+    specs: List[ModelSpec]
+    space: Dict[str, list]
+    budget_param: str
+    min_budget: int
+    max_budget: int
+
+
+FAMILIES = {
+    "corners": SearchFamily(
+        "corners", CORNERS_SPECS,
+        {"alpha": [0.0, 0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0, 3.0]},
+        "max_iter", 30, 300,
+    ),
+    "cards": SearchFamily(
+        "cards", CARDS_SPECS,
+        {"alpha": [0.0, 0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0, 3.0]},
+        "max_iter", 30, 300,
+    ),
+    "shots": SearchFamily(
+        "shots", SHOTS_SPECS,
+        {
+            "max_depth": [None, 6, 10, 16],
+            "min_samples_leaf": [1, 3, 5, 10],
+            "max_features": [1.0, 0.5, "sqrt"],
+        },
+        "n_estimators", 30, 300,
+    ),
+}
+
+
+# ---------------------------------------------------------
+# Folds temporais e cache de features
+# ---------------------------------------------------------
+
+def time_series_folds(kickoff: pd.Series, n_splits: int = TUNING_CV_SPLITS) -> List[Tuple[int, int]]:
+    """
+    Folds de janela crescente sobre as datas dos jogos (ordenados por data).
+    Cada fold é (train_end, test_end): treino = linhas [0, train_end),
+    validação = [train_end, test_end). Jogos do mesmo dia ficam sempre do
+    mesmo lado da divisão.
+    """
+    kickoff = kickoff.to_numpy()
+    dates = np.unique(kickoff)
+    folds = []
+    for train_idx, test_idx in TimeSeriesSplit(n_splits=n_splits).split(dates):
+        train_end = int(np.searchsorted(kickoff, dates[test_idx[0]], side="left"))
+        test_end = int(np.searchsorted(kickoff, dates[test_idx[-1]], side="right"))
+        folds.append((train_end, test_end))
+    return folds
+
+
+def build_feature_cache(n_splits: int = TUNING_CV_SPLITS, df: Optional[pd.DataFrame] = None) -> Path:
+    """
+    Matriz de features (float64) e folds, calculados uma vez e guardados em
+    tuning/cache/<hash>.joblib. Os processos do pool abrem-na em modo
+    memory-mapped; pesquisas seguintes com os mesmos dados reutilizam-na.
+    """
+    df = load_backtest_frame() if df is None else df
+    features = feature_frame(df.drop(columns=AUX_COLUMNS))
+    data_hash = hash_training_data(features)
+
+    path = TUNING_DIR / "cache" / f"{data_hash}-{n_splits}.joblib"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cache = {
+            "data_hash": data_hash,
+            "columns": list(features.columns),
+            "matrix": features.to_numpy(dtype=np.float64),
+            "folds": time_series_folds(df["kickoff"], n_splits),
+        }
+        tmp = path.with_suffix(".tmp")
+        joblib.dump(cache, tmp)
+        tmp.replace(path)
+    return path
+
+
+# ---------------------------------------------------------
+# Trials
+# ---------------------------------------------------------
+
+def trial_id(family: str, params: dict, budget: int, data_hash: str) -> str:
+    payload = json.dumps([family, params, budget, data_hash], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _init_worker(cache_path: str):
+    global _worker_cache
+    _worker_cache = joblib.load(cache_path, mmap_mode="r")
+
+
+def _evaluate_trial(family_name: str, params: dict, budget: int) -> Tuple[float, float]:
+    """MAE médio (folds x modelos da família) de um candidato com um orçamento."""
+    family = FAMILIES[family_name]
+    cache = _worker_cache
+    columns = cache["columns"]
+    matrix = cache["matrix"]
+
+    start = time.perf_counter()
+    errors = []
+    for spec in family.specs:
+        keep = [i for i, col in enumerate(columns) if col not in spec.drop_columns]
+        names = [columns[i] for i in keep]
+        target = columns.index(spec.target)
+
+        for train_end, test_end in cache["folds"]:
+            X_train = pd.DataFrame(matrix[:train_end, keep], columns=names)
+            X_test = pd.DataFrame(matrix[train_end:test_end, keep], columns=names)
+
+            model = spec.make_model(1)
+            model.set_params(**params, **{family.budget_param: budget})
+            with warnings.catch_warnings():
+                # Nas primeiras rondas o orçamento (max_iter) é curto de propósito
+                warnings.simplefilter("ignore", ConvergenceWarning)
+                model.fit(X_train, matrix[:train_end, target])
+            errors.append(np.mean(np.abs(model.predict(X_test) - matrix[train_end:test_end, target])))
+
+    return float(np.mean(errors)), time.perf_counter() - start
+
+
+def _candidates(family: SearchFamily, n_candidates: int, seed: int) -> List[dict]:
+    grid = list(ParameterGrid(family.space))
+    if len(grid) <= n_candidates:
+        return grid
+    chosen = np.random.default_rng(seed).choice(len(grid), size=n_candidates, replace=False)
+    return [grid[i] for i in sorted(chosen)]
+
+
+def _budgets(family: SearchFamily, eta: int) -> List[int]:
+    """Orçamento de cada ronda: max_budget / eta^k, ..., max_budget (>= min_budget)."""
+    n_rounds = int(math.floor(math.log(family.max_budget / family.min_budget, eta))) + 1
+    return [int(round(family.max_budget / eta ** k)) for k in reversed(range(n_rounds))]
+
+
+def search_family(
+    family: SearchFamily,
+    cache_path: Path,
+    n_candidates: int = TUNING_CANDIDATES,
+    eta: int = TUNING_ETA,
+    n_jobs: int = TRAIN_N_JOBS,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    Successive halving: todos os candidatos começam com o orçamento mínimo;
+    em cada ronda só o melhor 1/eta passa à ronda seguinte, com eta vezes
+    mais orçamento. Cada trial terminado fica no journal
+    tuning/<família>_trials.jsonl e não volta a correr numa pesquisa
+    retomada (mesmos dados, parâmetros e orçamento).
+    """
+    data_hash = joblib.load(cache_path, mmap_mode="r")["data_hash"]
+    journal = IngestionJournal(TUNING_DIR / f"{family.name}_trials.jsonl", key="trial_id")
+    done = journal.to_frame()
+    done = {} if done.empty else dict(zip(done["trial_id"], done["mae"]))
+
+    candidates = _candidates(family, n_candidates, seed)
+    rounds = []
+
+    with ProcessPoolExecutor(max_workers=max(1, n_jobs), initializer=_init_worker,
+                             initargs=(str(cache_path),)) as pool:
+        for rung, budget in enumerate(_budgets(family, eta)):
+            ids = [trial_id(family.name, params, budget, data_hash) for params in candidates]
+            pending = [(tid, params) for tid, params in zip(ids, candidates) if tid not in done]
+
+            futures = {tid: pool.submit(_evaluate_trial, family.name, params, budget) for tid, params in pending}
+            for tid, params in pending:
+                mae, seconds = futures[tid].result()
+                done[tid] = mae
+                journal.append({
+                    "trial_id": tid,
+                    "family": family.name,
+                    "params": params,
+                    "budget": budget,
+                    "mae": mae,
+                    "seconds": round(seconds, 3),
+                    "data_hash": data_hash,
+                })
+
+            scores = [done[tid] for tid in ids]
+            for params, mae in zip(candidates, scores):
+                rounds.append({"rung": rung, "budget": budget, "params": params, "mae": mae})
+
+            print(f"{family.name}: ronda {rung} ({family.budget_param}={budget}) "
+                  f"{len(candidates)} candidatos, {len(pending)} novos, melhor MAE {min(scores):.3f}")
+
+            keep = max(1, len(candidates) // eta)
+            order = np.argsort(scores, kind="stable")[:keep]
+            candidates = [candidates[i] for i in order]
+
+    return pd.DataFrame(rounds)
+
+
+def save_best_params(family: SearchFamily, results: pd.DataFrame, path: Path = TUNED_PARAMS_PATH):
+    """Guarda o melhor candidato da última ronda (lido por make_*_model)."""
+    last = results[results["rung"] == results["rung"].max()]
+    best = last.loc[last["mae"].idxmin()]
+
+    best_params = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    best_params[family.name] = {
+        "params": {**best["params"], family.budget_param: int(best["budget"])},
+        "cv_mae": float(best["mae"]),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(best_params, indent=2), encoding="utf-8")
+    tmp.replace(path)
+    return best_params[family.name]
+
+
+def tune_models(
+    families: Optional[List[str]] = None,
+    n_candidates: int = TUNING_CANDIDATES,
+    eta: int = TUNING_ETA,
+    n_splits: int = TUNING_CV_SPLITS,
+    n_jobs: int = TRAIN_N_JOBS,
+):
+    """
+    Afina os hiperparâmetros das famílias pedidas (por omissão todas) com
+    validação cruzada temporal. Os folds e a matriz de features são
+    calculados uma única vez e partilhados por todos os candidatos.
+    """
+    cache_path = build_feature_cache(n_splits)
+
+    for name in families or list(FAMILIES):
+        family = FAMILIES[name]
+        start = time.perf_counter()
+        results = search_family(family, cache_path, n_candidates, eta, n_jobs)
+        best = save_best_params(family, results)
+        print(f"✔ {name}: {best['params']} (MAE CV {best['cv_mae']:.3f}, {time.perf_counter() - start:.1f}s)")
@@ -0,0 +1 @@
+# vazio
@@ -0,0 +1,383 @@
+import hashlib
+import importlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from src.config import settings
+from src.config.settings import (
+    ARTIFACTS_DIR,
+    BASE_DIR,
+    MODEL_MODE,
+    PIPELINE_MAX_WORKERS,
+    PIPELINE_STATE_DIR,
+    PREDICTIONS_DIR,
+    PRIMEIRA_LIGA_ID,
+    PROCESSED_DIR,
+    RAW_DIR,
+)
+
+
+# Este módulo não importa pandas/sklearn: as etapas são importadas só no
+# processo que as corre, pelo que uma execução sem nada a fazer é rápida.
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    Uma etapa do pipeline.
+
+    - target: função a correr, "módulo:função"
+    - kwargs: argumentos da função (entram no hash, ex.: mode)
+    - inputs: ficheiros/diretórios de dados lidos (o conteúdo entra no hash)
+    - outputs: ficheiros escritos; têm de existir para a etapa ser saltada
+    - code: ficheiros/diretórios de código (.py) de que a etapa depende
+    - config: nomes de constantes de src/config/settings usadas pela etapa
+    - always: a etapa corre sempre (o input real é a rede, sem hash local);
+      as seguintes só correm se os outputs dela mudarem
+
+    As dependências entre etapas não são declaradas: uma etapa depende de
+    todas as etapas que escrevem algum dos seus inputs.
+    """
+    name: str
+    target: str
+    inputs: List[Path] = field(default_factory=list)
+    outputs: List[Path] = field(default_factory=list)
+    code: List[str] = field(default_factory=list)
+    config: List[str] = field(default_factory=list)
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    always: bool = False
+
+
+def table_files(directory: Path, name: str) -> List[Path]:
+    """Ficheiros de uma tabela de write_table (dataset Parquet e CSV)."""
+    return [Path(directory) / f"{name}.parquet", Path(directory) / f"{name}.csv"]
+
+
+def _manifest(name: str) -> Path:
+    """Entrada do manifesto de um artefacto (reescrita a cada save, ver ArtifactStore)."""
+    return ARTIFACTS_DIR / "manifest" / f"{name}.json"
+
+
+def default_stages(mode: str = MODEL_MODE) -> List[Stage]:
+    """
+    Os scripts como DAG: ingest -> build_features -> train_{corners,shots,cards}
+    -> predict, com build_next_round (features dos jogos por jogar) antes de
+    predict e update_data (estatísticas da próxima jornada) à parte. Em
+    mode="multi_output" as três famílias dão lugar a um único treino, e o
+    mesmo `mode` é passado a predict.
+
+    As etapas de ingestão (ingest, update_data) leem da rede e correm
+    sempre; se os dados obtidos forem iguais, as seguintes são saltadas.
+    Sem rede: --skip ingest update_data.
+    """
+    raw_tables = table_files(RAW_DIR, "matches") + table_files(RAW_DIR, "match_stats")
+    features_train = table_files(PROCESSED_DIR, "features_train")
+    tuned = ARTIFACTS_DIR / "tuning" / "best_params.json"
+    train_code = ["src/models/model_specs.py", "src/models/artifact_store.py", "src/utils/io.py"]
+
+    stages = [
+        Stage(
+            "ingest",
+            "src.data_ingestion.update_pipeline:update_data_for_league",
+            outputs=[RAW_DIR / "matches.csv", RAW_DIR / "match_stats.csv"],
+            code=["src/data_ingestion", "src/domain", "src/utils/io.py"],
+            config=["SEASONS"],
+            kwargs={"league_id": PRIMEIRA_LIGA_ID},
+            always=True,
+        ),
+        Stage(
+            "update_data",
+            "scripts.update_data:update_data",
+            inputs=table_files(RAW_DIR, "matches"),
+            outputs=[RAW_DIR / "next_round_stats.csv"],
+            code=["scripts/update_data.py", "src/data_ingestion", "src/domain"],
+            config=["LEAGUE", "SEASONS", "HTML_PARSER", "TEAM_MATCH_THRESHOLD", "FIXTURE_DATE_TOLERANCE_DAYS"],
+            always=True,
+        ),
+        Stage(
+            "build_features",
+            "scripts.build_features:build_features",
+            inputs=raw_tables,
+            outputs=[PROCESSED_DIR / "features_train.csv", PROCESSED_DIR / "team_season_aggregates.csv"],
+            code=["scripts/build_features.py", "src/features", "src/domain", "src/utils/io.py"],
+            config=["STORAGE_FORMAT"],
+        ),
+        Stage(
+            "build_next_round",
+            "scripts.build_features:build_next_round_features",
+            inputs=raw_tables,
+            outputs=[PROCESSED_DIR / "features_next_round.csv"],
+            code=["scripts/build_features.py", "src/features", "src/domain", "src/utils/io.py"],
+            config=["STORAGE_FORMAT"],
+        ),
+    ]
+
+    # Artefactos de cada família (nomes de MODEL_FIELDS em src/models/predict.py)
+    if mode == "multi_output":
+        families = {"multi_output": ("src.models.train_multi_output:train_multi_output_model", ["multi_output"])}
+    else:
+        families = {
+            family: (f"src.models.train_{family}:train_{family}_model", [f"{family}_home", f"{family}_away"])
+            for family in ("corners", "shots", "cards")
+        }
+
+    artifacts = []
+    for family, (target, names) in families.items():
+        code_file = "src/models/train_multi_output.py" if family == "multi_output" else f"src/models/train_{family}.py"
+        stages.append(Stage(
+            f"train_{family}",
+            target,
+            inputs=features_train + [tuned],
+            outputs=[_manifest(name) for name in names],
+            code=[code_file] + train_code,
+            config=["TRAIN_N_JOBS"],
+        ))
+        artifacts += [_manifest(name) for name in names]
+
+    stages.append(Stage(
+        "predict",
+        "src.models.predict:generate_predictions",
+        inputs=table_files(PROCESSED_DIR, "features_next_round") + artifacts,
+        outputs=[PREDICTIONS_DIR / f"{name}.csv" for name in
+                 ("predictions_next_round", "scores_next_round", "outcomes_next_round", "over_under_next_round")],
+        code=["src/models/predict.py", "src/models/simulation.py", "src/domain", "src/utils/io.py"],
+        config=["SIMULATION_SAMPLES", "SIMULATION_INTERVAL"],
+        kwargs={"mode": mode},
+    ))
+    return stages
+
+
+# ---------------------------------------------------------
+# Hashes de conteúdo
+# ---------------------------------------------------------
+
+class FileHasher:
+    """
+    sha256 do conteúdo de ficheiros, com cache em disco por (tamanho, mtime):
+    um ficheiro só é lido outra vez se tiver sido alterado.
+    """
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = Path(cache_path)
+        self._cache: Dict[str, list] = {}
+        if self.cache_path.exists():
+            self._cache = json.loads(self.cache_path.read_text(encoding="utf-8"))
+
+    def file(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path)
+        cached = self._cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self._cache[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def path(self, path: Path, pattern: str = "*") -> str:
+        """
+        Hash de um ficheiro ou diretório (todos os ficheiros `pattern`). Num
+        diretório conta o conteúdo e a subpasta de cada ficheiro, não o nome:
+        os ficheiros de um dataset Parquet têm nomes aleatórios a cada escrita.
+        """
+        path = Path(path)
+        if path.is_file():
+            return self.file(path)
+        if not path.is_dir():
+            return "missing"
+
+        parts = sorted(
+            f"{f.parent.relative_to(path)}:{self.file(f)}"
+            for f in path.rglob(pattern)
+            if f.is_file() and not any(p.startswith(".") or p == "__pycache__" for p in f.relative_to(path).parts)
+        )
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._cache), encoding="utf-8")
+        os.replace(tmp, self.cache_path)
+
+
+def stage_hash(stage: Stage, hasher: FileHasher) -> str:
+    """Hash dos inputs (dados, código e configuração) de uma etapa."""
+    payload = {
+        "target": stage.target,
+        "kwargs": stage.kwargs,
+        "inputs": {str(p): hasher.path(p) for p in stage.inputs},
+        "code": {c: hasher.path(BASE_DIR / c, "*.py") for c in stage.code},
+        "config": {name: getattr(settings, name) for name in stage.config},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# ---------------------------------------------------------
+# DAG
+# ---------------------------------------------------------
+
+def dependencies(stages: Sequence[Stage]) -> Dict[str, List[str]]:
+    """Etapa -> etapas que escrevem algum dos seus inputs (erro se houver ciclos)."""
+    writers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            writers[Path(output)] = stage.name
+
+    deps = {
+        stage.name: sorted({writers[Path(p)] for p in stage.inputs if Path(p) in writers} - {stage.name})
+        for stage in stages
+    }
+
+    # Deteção de ciclos (ordem topológica)
+    done, remaining = set(), dict(deps)
+    while remaining:
+        ready = [name for name, upstream in remaining.items() if set(upstream) <= done]
+        if not ready:
+            raise ValueError(f"Ciclo entre as etapas: {sorted(remaining)}")
+        for name in ready:
+            done.add(name)
+            del remaining[name]
+    return deps
+
+
+def _call(target: str, kwargs: Dict[str, Any]) -> float:
+    """Corre "módulo:função"(**kwargs) (num processo do pool) e devolve os segundos."""
+    module, function = target.split(":")
+    start = time.perf_counter()
+    getattr(importlib.import_module(module), function)(**kwargs)
+    return time.perf_counter() - start
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # "ran", "skipped", "failed", "blocked" (dependência falhou), "pending" (dry run)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class PipelineRunner:
+    """
+    Corre um DAG de etapas, saltando as que já correram com os mesmos inputs.
+
+    O hash de cada etapa (ver stage_hash) só é calculado quando as etapas de
+    que depende terminam, com os outputs delas já escritos: se uma etapa
+    voltar a correr mas produzir os mesmos ficheiros, as seguintes são
+    saltadas. Etapas sem dependências pendentes correm em paralelo, em
+    processos (até `max_workers`). O último hash de cada etapa bem sucedida
+    fica em `state_dir`/state.json.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        state_dir: Path = PIPELINE_STATE_DIR,
+        max_workers: int = PIPELINE_MAX_WORKERS,
+    ):
+        self.stages = {stage.name: stage for stage in stages}
+        self.deps = dependencies(stages)
+        self.state_dir = Path(state_dir)
+        self.state_path = self.state_dir / "state.json"
+        self.hasher = FileHasher(self.state_dir / "file_hashes.json")
+        self.max_workers = max(1, max_workers)
+
+        self.state: Dict[str, dict] = {}
+        if self.state_path.exists():
+            self.state = json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    def _save_state(self):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+        self.hasher.save()
+
+    def is_up_to_date(self, stage: Stage, digest: str) -> bool:
+        if stage.always:
+            return False
+        recorded = self.state.get(stage.name, {}).get("hash")
+        return recorded == digest and all(Path(p).exists() for p in stage.outputs)
+
+    def run(self, force: Iterable[str] = (), skip: Iterable[str] = (), dry_run: bool = False) -> List[StageResult]:
+        """
+        Corre as etapas desatualizadas (e as de `force`). As de `skip` não
+        correm e as seguintes usam os outputs que existirem. Com dry_run=True
+        só indica o que correria: etapas a jusante de uma que corre ficam
+        "pending", porque o hash delas depende dos novos outputs.
+        """
+        force, skip = set(force), set(skip)
+        unknown = (force | skip) - set(self.stages)
+        if unknown:
+            raise ValueError(f"Etapas desconhecidas: {sorted(unknown)} (opções: {list(self.stages)})")
+
+        results: Dict[str, StageResult] = {}
+        hashes: Dict[str, str] = {}
+        running: Dict[Future, str] = {}
+        pool = ProcessPoolExecutor(max_workers=self.max_workers) if not dry_run else None
+
+        def _schedule():
+            for name, stage in self.stages.items():
+                if name in results or name in running.values():
+                    continue
+                upstream = [results.get(dep) for dep in self.deps[name]]
+                if any(r is None for r in upstream):
+                    continue
+                if any(r.status in ("failed", "blocked") for r in upstream):
+                    results[name] = StageResult(name, "blocked")
+                    continue
+                if any(r.status == "pending" for r in upstream):
+                    results[name] = StageResult(name, "pending")
+                    continue
+
+                if name in skip:
+                    results[name] = StageResult(name, "skipped")
+                    continue
+
+                hashes[name] = stage_hash(stage, self.hasher)
+                if name not in force and self.is_up_to_date(stage, hashes[name]):
+                    results[name] = StageResult(name, "skipped")
+                elif dry_run:
+                    results[name] = StageResult(name, "pending")
+                else:
+                    logger.info(f"A correr {name} ({stage.target})")
+                    running[pool.submit(_call, stage.target, stage.kwargs)] = name
+
+        try:
+            # Repete até não haver mais etapas prontas (skips libertam as seguintes)
+            while True:
+                before = len(results) + len(running)
+                _schedule()
+                if len(results) + len(running) == before:
+                    if not running:
+                        break
+                    finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        try:
+                            seconds = future.result()
+                        except Exception as exc:
+                            logger.error(f"Etapa {name} falhou: {exc}")
+                            results[name] = StageResult(name, "failed", error=str(exc))
+                            continue
+                        results[name] = StageResult(name, "ran", seconds)
+                        self.state[name] = {"hash": hashes[name], "seconds": round(seconds, 3),
+                                            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+                        self._save_state()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if not dry_run:
+            self._save_state()
+        return [results[name] for name in self.stages]
@@ -0,0 +1,280 @@
+import logging
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from src.config.settings import (
+    LEAGUES,
+    MODEL_MODE,
+    SEASONS,
+    SHARD_MAX_WORKERS,
+    SHARDS_DIR,
+    TRAIN_N_JOBS,
+)
+from src.features.feature_builder import STATS_COLUMNS, FeatureBuilder
+from src.features.team_aggregates import update_team_aggregates
+from src.models.predict import ModelRegistry, generate_predictions
+from src.models.train_pipeline import train_all_models
+from src.utils.io import read_table, remove_table, table_exists, write_table
+
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("ingest", "features", "train", "predict")
+
+# Tabelas escritas pela etapa predict (ver generate_predictions)
+PREDICTION_TABLES = ["predictions_next_round", "scores_next_round", "outcomes_next_round", "over_under_next_round"]
+
+
+def slugify(name: str) -> str:
+    """Nome de diretório para uma liga, ex.: "Liga Portugal 2" -> "liga-portugal-2"."""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", ascii_name.lower()).strip("-")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    Uma unidade do pipeline: uma liga numa época. Cada shard tem as suas
+    tabelas em <root>/<liga>/<época>/{raw,processed,predictions,artifacts},
+    com a mesma estrutura de data/raw, data/processed, etc.
+    """
+    league: str
+    season: str
+    league_id: Optional[int] = None
+    root: Path = SHARDS_DIR
+
+    @property
+    def key(self) -> str:
+        return f"{slugify(self.league)}/{self.season}"
+
+    @property
+    def path(self) -> Path:
+        return Path(self.root) / slugify(self.league) / self.season
+
+    @property
+    def raw_dir(self) -> Path:
+        return self.path / "raw"
+
+    @property
+    def processed_dir(self) -> Path:
+        return self.path / "processed"
+
+    @property
+    def predictions_dir(self) -> Path:
+        return self.path / "predictions"
+
+    @property
+    def artifacts_dir(self) -> Path:
+        return self.path / "artifacts"
+
+
+def make_shards(
+    leagues: Dict[str, Optional[int]] = LEAGUES,
+    seasons: Sequence[str] = SEASONS,
+    root: Path = SHARDS_DIR,
+) -> List[Shard]:
+    """Um shard por liga e época."""
+    return [Shard(league, season, league_id, root) for league, league_id in leagues.items() for season in seasons]
+
+
+def league_history(shard: Shard, shards: Iterable[Shard]) -> List[Shard]:
+    """
+    Shards da mesma liga até à época de `shard` (inclusive). O histórico de
+    uma equipa nunca atravessa ligas: equipas com o mesmo nome em ligas
+    diferentes (ex.: "Nacional") são equipas diferentes.
+    """
+    return sorted(
+        (s for s in shards if s.league == shard.league and s.season <= shard.season),
+        key=lambda s: s.season,
+    )
+
+
+# ---------------------------------------------------------
+# Etapas de um shard
+# ---------------------------------------------------------
+
+def ingest_shard(shard: Shard, shards: List[Shard], mode: str, n_jobs: int):
+    """Jogos e estatísticas da época do shard (ver update_data_for_league)."""
+    # Import local: só esta etapa precisa dos clientes HTTP dos scrapers
+    from src.data_ingestion.update_pipeline import update_data_for_league
+
+    if shard.league_id is None:
+        raise ValueError(f"Liga sem ID no Sofascore: {shard.league}")
+    update_data_for_league(
+        shard.league_id,
+        seasons=[shard.season],
+        raw_dir=shard.raw_dir,
+        processed_dir=shard.processed_dir,
+    )
+
+
+def features_shard(shard: Shard, shards: List[Shard], mode: str, n_jobs: int):
+    """
+    Features point-in-time dos jogos da época do shard, com o histórico das
+    épocas anteriores da mesma liga. Jogos terminados vão para
+    features_train; jogos por jogar para features_next_round.
+    """
+    history = [s for s in league_history(shard, shards) if table_exists(s.raw_dir, "match_stats")]
+    matches = pd.concat([read_table(s.raw_dir, "matches") for s in history], ignore_index=True)
+    stats = pd.concat([read_table(s.raw_dir, "match_stats", columns=STATS_COLUMNS) for s in history],
+                      ignore_index=True)
+
+    # O histórico só tem jogos terminados: um jogo por jogar contaria na
+    # forma dos jogos seguintes como derrota (0 pontos)
+    played = matches["home_score"].notna() & matches["away_score"].notna()
+    upcoming = matches[~played & (matches["season"] == shard.season)]
+
+    builder = FeatureBuilder(matches[played], stats, processed_dir=shard.processed_dir)
+    season = builder.df[builder.df["season"] == shard.season]
+
+    write_table(builder.build_features(season, point_in_time=True), shard.processed_dir, "features_train")
+    if not upcoming.empty:
+        write_table(builder.build_features(upcoming, point_in_time=True),
+                    shard.processed_dir, "features_next_round")
+    else:
+        remove_table(shard.processed_dir, "features_next_round")
+
+    # Agregados por equipa/época só da época do shard
+    update_team_aggregates(shard.raw_dir, shard.processed_dir)
+
+
+def train_shard(shard: Shard, shards: List[Shard], mode: str, n_jobs: int):
+    """Modelos do shard, treinados com as features da liga até à sua época."""
+    features = pd.concat(
+        [read_table(s.processed_dir, "features_train") for s in league_history(shard, shards)
+         if table_exists(s.processed_dir, "features_train")],
+        ignore_index=True,
+    )
+    train_all_models(n_jobs=n_jobs, mode=mode, features_train=features, artifacts_dir=shard.artifacts_dir)
+
+
+def predict_shard(shard: Shard, shards: List[Shard], mode: str, n_jobs: int):
+    """Previsões dos jogos por jogar da época (se houver)."""
+    if not table_exists(shard.processed_dir, "features_next_round"):
+        logger.info(f"{shard.key}: sem jogos por jogar, nada a prever")
+        for name in PREDICTION_TABLES:
+            remove_table(shard.predictions_dir, name)
+        return
+    generate_predictions(shard.processed_dir, shard.predictions_dir, ModelRegistry(shard.artifacts_dir), mode)
+
+
+STAGE_FUNCTIONS = {
+    "ingest": ingest_shard,
+    "features": features_shard,
+    "train": train_shard,
+    "predict": predict_shard,
+}
+
+
+def _run_stage(stage: str, shard: Shard, shards: List[Shard], mode: str, n_jobs: int) -> float:
+    start = time.perf_counter()
+    STAGE_FUNCTIONS[stage](shard, shards, mode, n_jobs)
+    return time.perf_counter() - start
+
+
+# ---------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------
+
+def run_shards(
+    shards: List[Shard],
+    stages: Sequence[str] = STAGES,
+    max_workers: int = SHARD_MAX_WORKERS,
+    mode: str = MODEL_MODE,
+) -> pd.DataFrame:
+    """
+    Corre as etapas pedidas (pela ordem de STAGES) para todos os shards.
+
+    Dentro de cada etapa os shards são independentes e correm em paralelo
+    num pool de `max_workers` processos (cada um com TRAIN_N_JOBS //
+    max_workers cores para o treino); entre etapas há uma barreira, porque
+    as features e o treino de uma época leem as épocas anteriores da mesma
+    liga. Um shard que falha é registado e salta as etapas seguintes, sem
+    parar os restantes. Devolve o tempo (s) de cada etapa por shard.
+    """
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Etapas desconhecidas: {sorted(unknown)} (opções: {STAGES})")
+
+    stages = [stage for stage in STAGES if stage in stages]
+    n_workers = max(1, min(max_workers, len(shards)))
+    n_jobs = max(1, TRAIN_N_JOBS // n_workers)
+
+    timings = {shard.key: {} for shard in shards}
+    failed = set()
+
+    for stage in stages:
+        todo = [shard for shard in shards if shard.key not in failed]
+        if stage == "features":
+            report_team_collisions(todo)
+        if n_workers == 1:
+            outcomes = []
+            for shard in todo:
+                try:
+                    outcomes.append((shard, _run_stage(stage, shard, shards, mode, n_jobs), None))
+                except Exception as exc:
+                    outcomes.append((shard, None, exc))
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                futures = [(shard, pool.submit(_run_stage, stage, shard, shards, mode, n_jobs)) for shard in todo]
+                outcomes = [(shard, f.result(), None) if f.exception() is None else (shard, None, f.exception())
+                            for shard, f in futures]
+
+        for shard, seconds, exc in outcomes:
+            if exc is not None:
+                logger.error(f"{shard.key}: etapa {stage} falhou ({exc}); etapas seguintes ignoradas")
+                failed.add(shard.key)
+            else:
+                timings[shard.key][stage] = seconds
+
+    # Shards que falharam na primeira etapa não têm tempos: ficam com NaN
+    report = pd.DataFrame.from_dict(timings, orient="index", columns=stages).reindex([s.key for s in shards])
+    report.index.name = "shard"
+    return report
+
+
+# ---------------------------------------------------------
+# Leitura conjunta dos shards
+# ---------------------------------------------------------
+
+def read_shards(shards: Iterable[Shard], name: str, where: str = "processed") -> pd.DataFrame:
+    """
+    Concatena a tabela `name` de todos os shards (`where` = raw, processed
+    ou predictions) com as colunas league e season. Como há equipas com o
+    mesmo nome em ligas diferentes, uma equipa é identificada por (league,
+    nome) e não só pelo nome.
+    """
+    frames = []
+    for shard in shards:
+        directory = getattr(shard, f"{where}_dir")
+        if table_exists(directory, name):
+            frame = read_table(directory, name).drop(columns=["league", "season"], errors="ignore")
+            frames.append(frame.assign(league=shard.league, season=shard.season))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def team_collisions(shards: Iterable[Shard]) -> Dict[str, List[str]]:
+    """Nomes de equipa presentes em mais do que uma liga -> ligas."""
+    matches = read_shards(shards, "matches", where="raw")
+    if matches.empty:
+        return {}
+
+    teams = pd.concat([
+        matches[["league", "home_team"]].rename(columns={"home_team": "team"}),
+        matches[["league", "away_team"]].rename(columns={"away_team": "team"}),
+    ]).dropna().drop_duplicates()
+    leagues = teams.groupby("team")["league"].agg(sorted)
+    return leagues[leagues.str.len() > 1].to_dict()
+
+
+def report_team_collisions(shards: Iterable[Shard]):
+    for team, leagues in team_collisions(shards).items():
+        logger.warning(f"Equipa '{team}' existe em várias ligas ({', '.join(leagues)}): "
+                       "tratadas como equipas diferentes")
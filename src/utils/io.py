@@ -1,6 +1,28 @@
+import os
+import shutil
+import time
+import uuid
 from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
 import pandas as pd
 
+from src.config.settings import STORAGE_FORMAT
+from src.domain.schemas import TABLE_DTYPES
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional: sem ele tudo continua em CSV
+    pa = None
+    ds = None
+    pq = None
+
+
+# Filtro simples, ex.: ("season", "==", "2023-2024") ou ("season", "in", [...])
+Filter = Tuple[str, str, object]
+
 
 def ensure_dir(path: Path):
     """Garante que um diretório existe."""
@@ -11,3 +33,327 @@ def read_csv_safe(path: Path) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"Ficheiro não encontrado: {path}")
     return pd.read_csv(path)
+
+
+# ---------------------------------------------------------
+# Armazenamento colunar (Parquet) com exportação CSV
+# ---------------------------------------------------------
+
+def _use_parquet() -> bool:
+    return STORAGE_FORMAT == "parquet" and pq is not None
+
+
+# Versões antigas de um dataset Parquet ficam no disco pelo menos este tempo
+# depois de substituídas, para leitores que ainda as estejam a ler
+VERSION_GRACE_SECONDS = 300
+
+
+def parquet_path(directory: Path, name: str) -> Path:
+    """Dataset Parquet de uma tabela (diretório com um ou mais ficheiros)."""
+    return Path(directory) / f"{name}.parquet"
+
+
+def _read_path(directory: Path, name: str) -> Path:
+    """
+    Versão atual do dataset Parquet (symlink resolvido uma vez): todos os
+    ficheiros de uma leitura vêm da mesma versão, mesmo que a tabela seja
+    reescrita a meio.
+    """
+    return parquet_path(directory, name).resolve()
+
+
+def csv_path(directory: Path, name: str) -> Path:
+    return Path(directory) / f"{name}.csv"
+
+
+def table_exists(directory: Path, name: str) -> bool:
+    return parquet_path(directory, name).exists() or csv_path(directory, name).exists()
+
+
+def _versions(target: Path) -> List[Path]:
+    """Versões escritas de um dataset Parquet (ver _replace_dir)."""
+    return list(target.parent.glob(f".{target.name}.v-*"))
+
+
+def _replace_dir(new: Path, target: Path):
+    """
+    Substitui o diretório `target` por `new` de forma atómica.
+
+    `target` é um symlink para a versão atual (.<nome>.v-<uuid>, no mesmo
+    diretório) e a troca é um os.replace do symlink: um leitor vê sempre a
+    versão anterior ou a nova, e um crash deixa a anterior intacta. As
+    versões substituídas (e as incompletas de escritas interrompidas) são
+    apagadas depois de VERSION_GRACE_SECONDS, para não desaparecerem a meio
+    de uma leitura.
+    """
+    previous = Path(os.readlink(target)).name if target.is_symlink() else None
+
+    if target.exists() and not target.is_symlink():
+        # Formato antigo (diretório real): passa a ser uma versão. Só nesta
+        # primeira escrita a tabela fica por instantes indisponível.
+        previous = f".{target.name}.v-{uuid.uuid4().hex}"
+        target.rename(target.with_name(previous))
+
+    link = target.with_name(f".{target.name}.{uuid.uuid4().hex}.link")
+    os.symlink(new.name, link, target_is_directory=True)
+    os.replace(link, target)
+
+    if previous is not None:
+        # mtime da versão = momento em que deixou de ser a atual
+        os.utime(target.with_name(previous))
+    expired = time.time() - VERSION_GRACE_SECONDS
+    for version in _versions(target):
+        if version.name != new.name and version.stat().st_mtime < expired:
+            shutil.rmtree(version, ignore_errors=True)
+
+
+def remove_table(directory: Path, name: str):
+    """Apaga as versões Parquet e CSV de uma tabela (se existirem)."""
+    target = parquet_path(directory, name)
+    if target.is_symlink():
+        target.unlink()
+    else:
+        shutil.rmtree(target, ignore_errors=True)
+    for version in _versions(target):
+        shutil.rmtree(version, ignore_errors=True)
+    csv_path(directory, name).unlink(missing_ok=True)
+
+
+def table_version(directory: Path, name: str) -> Tuple[str, int, int]:
+    """
+    Versão de uma tabela no disco: (ficheiro lido, nº de ficheiros, maior
+    mtime). Muda sempre que a tabela é reescrita (write_table) ou recebe
+    linhas novas (append_table); serve de chave para caches de leitura.
+    """
+    path = _read_path(directory, name)
+    if pq is not None and path.exists():
+        files = [f.stat().st_mtime_ns for f in path.rglob("*.parquet")]
+        return str(path), len(files), max(files, default=0)
+
+    path = csv_path(directory, name)
+    if not path.exists():
+        raise FileNotFoundError(f"Tabela não encontrada: {name} em {directory}")
+    return str(path), 1, path.stat().st_mtime_ns
+
+
+def _with_dtypes(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    dtypes = {col: dtype for col, dtype in TABLE_DTYPES.get(name, {}).items() if col in df.columns}
+    return df.astype(dtypes) if dtypes else df
+
+
+def write_table(
+    df: pd.DataFrame,
+    directory: Path,
+    name: str,
+    partition_cols: Sequence[str] = ("season",),
+    export_csv: bool = True,
+):
+    """
+    Guarda uma tabela com os dtypes explícitos de TABLE_DTYPES.
+
+    Em Parquet, a tabela é particionada pelas colunas de `partition_cols`
+    que existam (por omissão `season`). Tanto o Parquet como o CSV são
+    escritos à parte e só depois substituem a versão anterior de forma
+    atómica (o CSV com os.replace, o dataset Parquet com _replace_dir).
+    Com export_csv=True é também escrita a versão CSV, por compatibilidade.
+    """
+    directory = Path(directory)
+    ensure_dir(directory)
+    df = _with_dtypes(df, name)
+
+    if _use_parquet():
+        target = parquet_path(directory, name)
+        version = target.with_name(f".{target.name}.v-{uuid.uuid4().hex}")
+        partitions = [col for col in partition_cols if col in df.columns]
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if partitions:
+            pq.write_to_dataset(table, version, partition_cols=partitions)
+        else:
+            ensure_dir(version)
+            pq.write_table(table, version / "part-0.parquet")
+
+        _replace_dir(version, target)
+
+    if export_csv or not _use_parquet():
+        target = csv_path(directory, name)
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, target)
+
+
+def _partition_cols(target: Path) -> List[str]:
+    """Colunas de partição (pastas <coluna>=<valor>) de um dataset Parquet existente."""
+    cols = []
+    level = target
+    while True:
+        sub = next((p for p in level.iterdir() if p.is_dir() and "=" in p.name), None)
+        if sub is None:
+            return cols
+        cols.append(sub.name.split("=", 1)[0])
+        level = sub
+
+
+def append_table(df: pd.DataFrame, directory: Path, name: str, export_csv: bool = True):
+    """
+    Acrescenta linhas a uma tabela existente (ou cria-a). Em Parquet cada
+    chamada escreve ficheiros novos no dataset, sem reescrever os anteriores;
+    num dataset particionado as linhas vão para as partições respetivas.
+    """
+    directory = Path(directory)
+    if not table_exists(directory, name):
+        write_table(df, directory, name, partition_cols=(), export_csv=export_csv)
+        return
+
+    df = _with_dtypes(df, name)
+
+    if _use_parquet():
+        target = parquet_path(directory, name)
+        ensure_dir(target)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        partitions = _partition_cols(target)
+        if partitions:
+            pq.write_to_dataset(
+                table, target, partition_cols=partitions,
+                basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            )
+        else:
+            pq.write_table(table, target / f"part-{uuid.uuid4().hex}.parquet")
+
+    if export_csv or not _use_parquet():
+        df.to_csv(csv_path(directory, name), mode="a", header=False, index=False)
+
+
+def _filter_mask(df: pd.DataFrame, col: str, op: str, value) -> pd.Series:
+    if op == "==":
+        return df[col] == value
+    if op == "in":
+        return df[col].isin(list(value))
+    raise ValueError(f"Operador de filtro não suportado: {op}")
+
+
+def _apply_filters(df: pd.DataFrame, filters: Iterable[Filter]) -> pd.DataFrame:
+    for col, op, value in filters:
+        df = df[_filter_mask(df, col, op, value)]
+    return df
+
+
+def read_table(
+    directory: Path,
+    name: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Filter]] = None,
+) -> pd.DataFrame:
+    """
+    Lê uma tabela carregando só as colunas pedidas (`columns`) e, em Parquet,
+    só as partições/linhas que passam `filters`. Se não existir versão
+    Parquet, lê o CSV com os mesmos dtypes.
+    """
+    directory = Path(directory)
+    path = _read_path(directory, name)
+
+    if pq is not None and path.exists():
+        table = pq.read_table(path, columns=columns, filters=filters or None)
+        df = table.to_pandas()
+    else:
+        path = csv_path(directory, name)
+        if not path.exists():
+            raise FileNotFoundError(f"Tabela não encontrada: {name} em {directory}")
+
+        filter_cols = [col for col, _, _ in filters or []]
+        usecols = None if columns is None else list(dict.fromkeys(list(columns) + filter_cols))
+        dtypes = TABLE_DTYPES.get(name, {})
+        df = pd.read_csv(path, usecols=usecols, dtype=dtypes or None)
+
+        if filters:
+            df = _apply_filters(df, filters).reset_index(drop=True)
+        if columns is not None:
+            df = df[list(columns)]
+
+    return _with_dtypes(df, name)
+
+
+def _filter_expression(filters: Sequence[Filter], any_of: Sequence[Filter]):
+    """Expressão pyarrow: todos os `filters` e pelo menos um de `any_of`."""
+    def _one(col, op, value):
+        if op == "==":
+            return ds.field(col) == value
+        if op == "in":
+            return ds.field(col).isin(list(value))
+        raise ValueError(f"Operador de filtro não suportado: {op}")
+
+    expression = None
+    for f in filters:
+        expression = _one(*f) if expression is None else expression & _one(*f)
+    if any_of:
+        alternatives = _one(*any_of[0])
+        for f in any_of[1:]:
+            alternatives = alternatives | _one(*f)
+        expression = alternatives if expression is None else expression & alternatives
+    return expression
+
+
+def read_table_page(
+    directory: Path,
+    name: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Filter]] = None,
+    any_of: Optional[List[Filter]] = None,
+    offset: int = 0,
+    limit: int = 50,
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Uma página (linhas [offset, offset + limit)) de uma tabela filtrada,
+    e o nº total de linhas que passam os filtros.
+
+    `filters` têm de passar todos; de `any_of` basta um (ex.: equipa da casa
+    ou de fora). Em Parquet os filtros e a projeção de colunas são feitos
+    pelo pyarrow (partições e row groups descartados sem serem lidos) e a
+    leitura pára assim que a página está completa.
+    """
+    directory = Path(directory)
+    filters, any_of = filters or [], any_of or []
+    path = _read_path(directory, name)
+
+    if ds is not None and path.exists():
+        dataset = ds.dataset(path, format="parquet", partitioning="hive")
+        expression = _filter_expression(filters, any_of)
+        total = dataset.count_rows(filter=expression)
+
+        scanner = dataset.scanner(columns=columns, filter=expression)
+        batches, skip, remaining = [], offset, limit
+        for batch in scanner.to_batches():
+            if remaining <= 0:
+                break
+            if skip >= batch.num_rows:
+                skip -= batch.num_rows
+                continue
+            part = batch.slice(skip, remaining)
+            skip = 0
+            remaining -= part.num_rows
+            batches.append(part)
+
+        df = pa.Table.from_batches(batches, schema=scanner.projected_schema).to_pandas()
+        return _with_dtypes(df, name), total
+
+    path = csv_path(directory, name)
+    if not path.exists():
+        raise FileNotFoundError(f"Tabela não encontrada: {name} em {directory}")
+
+    filter_cols = [col for col, _, _ in filters + any_of]
+    usecols = None if columns is None else list(dict.fromkeys(list(columns) + filter_cols))
+    dtypes = TABLE_DTYPES.get(name, {})
+    df = pd.read_csv(path, usecols=usecols, dtype=dtypes or None)
+
+    df = _apply_filters(df, filters)
+    if any_of:
+        mask = pd.Series(False, index=df.index)
+        for f in any_of:
+            mask |= _filter_mask(df, *f)
+        df = df[mask]
+
+    total = len(df)
+    df = df.iloc[offset:offset + limit].reset_index(drop=True)
+    if columns is not None:
+        df = df[list(columns)]
+    return _with_dtypes(df, name), total
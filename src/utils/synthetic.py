@@ -0,0 +1,63 @@
+from dataclasses import fields
+from datetime import date, timedelta
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.domain.schemas import MatchStats
+
+
+def make_synthetic_league(
+    n_seasons: int = 1,
+    n_teams: int = 18,
+    seed: int = 42,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Gera dados sintéticos (matches, match_stats) com o mesmo formato de data/raw,
+    para benchmarks e validação local sem acesso à rede.
+    Cada época é uma volta dupla (todas as equipas jogam entre si em casa e fora).
+    """
+    rng = np.random.default_rng(seed)
+    teams = [f"Equipa {i + 1:02d}" for i in range(n_teams)]
+
+    # Calendário "round robin" (método do círculo)
+    rotation = list(range(n_teams))
+    first_leg = []
+    for _ in range(n_teams - 1):
+        first_leg.append([(rotation[i], rotation[n_teams - 1 - i]) for i in range(n_teams // 2)])
+        rotation = [rotation[0]] + [rotation[-1]] + rotation[1:-1]
+    schedule = first_leg + [[(a, h) for h, a in rnd] for rnd in first_leg]
+
+    match_rows = []
+    for s in range(n_seasons):
+        start_year = 2024 - n_seasons + 1 + s
+        season = f"{start_year}-{start_year + 1}"
+        kickoff = date(start_year, 8, 10)
+
+        for round_idx, pairs in enumerate(schedule):
+            round_date = (kickoff + timedelta(days=7 * round_idx)).isoformat()
+            for h, a in pairs:
+                match_rows.append({
+                    "match_id": f"{season}-{round_idx + 1:02d}-{h:02d}{a:02d}",
+                    "season": season,
+                    "round_number": round_idx + 1,
+                    "date": round_date,
+                    "home_team": teams[h],
+                    "away_team": teams[a],
+                    "home_score": int(rng.poisson(1.5)),
+                    "away_score": int(rng.poisson(1.1)),
+                })
+
+    matches = pd.DataFrame(match_rows)
+
+    stats = {"match_id": matches["match_id"].to_numpy()}
+    n = len(matches)
+    for f in fields(MatchStats):
+        if f.type is float or f.type == "float":
+            stats[f.name] = np.round(rng.gamma(2.0, 0.6, size=n), 2)
+        else:
+            stats[f.name] = rng.poisson(5.0, size=n)
+    stats_df = pd.DataFrame(stats)
+
+    return matches, stats_df
@@ -0,0 +1,74 @@
+import dataclasses
+from dataclasses import fields
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.domain.schemas import MatchStats
+from src.models.train_pipeline import ALL_SPECS
+
+
+def make_matches(rows, season: str = "2023/2024") -> pd.DataFrame:
+    """data/raw/matches a partir de (data, casa, fora, golos casa, golos fora); golos None = por jogar."""
+    return pd.DataFrame([
+        {
+            "match_id": str(i + 1),
+            "season": season,
+            "round_number": i + 1,
+            "date": date,
+            "home_team": home,
+            "away_team": away,
+            "home_score": home_score,
+            "away_score": away_score,
+        }
+        for i, (date, home, away, home_score, away_score) in enumerate(rows)
+    ]).astype({"home_score": "Int16", "away_score": "Int16"})
+
+
+def make_stats(matches: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """data/raw/match_stats (todas as colunas de MatchStats) dos jogos terminados de `matches`."""
+    played = matches[matches["home_score"].notna()]
+    columns = [f.name for f in fields(MatchStats)]
+    rng = np.random.default_rng(seed)
+    stats = pd.DataFrame(rng.integers(0, 15, size=(len(played), len(columns))).astype(float), columns=columns)
+    stats.insert(0, "match_id", played["match_id"].to_numpy())
+    return stats
+
+
+@pytest.fixture
+def leak_matches() -> pd.DataFrame:
+    """A ganha o jogo 1; os jogos 2 e 3 ainda não se jogaram."""
+    return make_matches([
+        ("2024-01-01", "A", "B", 2, 0),
+        ("2024-01-08", "C", "A", None, None),
+        ("2024-01-15", "A", "C", None, None),
+    ])
+
+
+def make_season(n_teams: int = 6, n_rounds: int = 10, season: str = "2023/2024", seed: int = 0) -> pd.DataFrame:
+    """Época terminada: n_rounds jornadas semanais (round robin) com resultados aleatórios."""
+    rng = np.random.default_rng(seed)
+    teams = [f"T{i}" for i in range(n_teams)]
+    rows = []
+    for rnd in range(n_rounds):
+        order = teams[:1] + teams[1:][rnd % (n_teams - 1):] + teams[1:][:rnd % (n_teams - 1)]
+        date = (pd.Timestamp("2023-08-05") + pd.Timedelta(weeks=rnd)).strftime("%Y-%m-%d")
+        for i in range(n_teams // 2):
+            rows.append((date, order[i], order[-1 - i], *rng.integers(0, 4, size=2)))
+
+    matches = make_matches(rows, season)
+    matches["round_number"] = np.repeat(np.arange(1, n_rounds + 1), n_teams // 2)
+    return matches
+
+
+def _small_forest(n_jobs: int = 1):
+    return RandomForestRegressor(n_estimators=5, random_state=0, n_jobs=n_jobs)
+
+
+# ALL_SPECS com os mesmos alvos e colunas excluídas; só a floresta dos remates fica mais pequena
+FAST_SPECS = [
+    dataclasses.replace(spec, make_model=_small_forest) if spec.name.startswith("shots") else spec
+    for spec in ALL_SPECS
+]
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from src.features.feature_builder import FeatureBuilder
+from src.models import backtest
+from src.models.artifact_store import ArtifactStore
+from src.models.backtest import load_backtest_frame, prune_snapshots, run_backtest
+from src.utils.io import write_table
+
+from tests.conftest import make_season, make_stats
+
+
+@pytest.fixture
+def frame(tmp_path, monkeypatch):
+    matches = make_season(n_rounds=6)
+    stats = make_stats(matches)
+    write_table(matches, tmp_path / "raw", "matches")
+    write_table(stats, tmp_path / "raw", "match_stats")
+    features = FeatureBuilder(matches, stats, processed_dir=tmp_path / "processed").build_features(
+        matches, point_in_time=True
+    )
+    write_table(features, tmp_path / "processed", "features_train")
+
+    monkeypatch.setattr(backtest, "SNAPSHOTS_DIR", tmp_path / "snapshots")
+    monkeypatch.setattr(backtest, "PROCESSED_DIR", tmp_path / "processed")
+    return load_backtest_frame(tmp_path / "processed", tmp_path / "raw")
+
+
+def test_snapshots_are_compact_artifacts_and_reused(frame, monkeypatch):
+    first = run_backtest(min_train=6, n_jobs=1, df=frame)
+    snapshots = [p for p in backtest.SNAPSHOTS_DIR.iterdir() if p.is_dir()]
+    assert len(snapshots) == len(first)
+    assert ArtifactStore(snapshots[0]).entry("shots_home")["format"] == "forest"
+
+    # Segunda corrida: tudo vem da cache, nenhum modelo é treinado
+    monkeypatch.setattr(backtest, "fit_spec", lambda *args: pytest.fail("snapshot não reutilizado"))
+    second = run_backtest(min_train=6, n_jobs=1, df=frame)
+    # Mesmas métricas (a menos dos valores float32 das folhas do CompactForest)
+    pd.testing.assert_frame_equal(second.drop(columns="seconds"), first.drop(columns="seconds"))
+
+
+def test_prune_keeps_most_recent_snapshots(frame, monkeypatch):
+    monkeypatch.setattr(backtest, "prune_snapshots", lambda: 0)
+    run_backtest(min_train=6, n_jobs=1, df=frame)
+
+    snapshots = sorted(backtest.SNAPSHOTS_DIR.iterdir(), key=lambda p: p.stat().st_mtime)
+    assert prune_snapshots(keep=2) == len(snapshots) - 2
+    assert sorted(backtest.SNAPSHOTS_DIR.iterdir()) == sorted(snapshots[-2:])
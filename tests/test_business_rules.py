@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import poisson
+
+from src.domain.business_rules import MARKETS, derive_corners_signal, derive_signals, poisson_over_under
+from src.domain.schemas import MatchPrediction
+
+
+def _prediction(match_id: str, corners: float, shots: float = 12.0, cards: float = 2.0) -> MatchPrediction:
+    return MatchPrediction(
+        match_id=match_id, home_team="A", away_team="B",
+        predicted_corners_home=corners / 2, predicted_corners_away=corners / 2,
+        predicted_shots_home=shots, predicted_shots_away=shots,
+        predicted_yellow_cards_home=cards, predicted_yellow_cards_away=cards,
+        predicted_xg_home=1.2, predicted_xg_away=1.0,
+    )
+
+
+@pytest.mark.parametrize("line", [8.5, 9.0, 10.5])
+def test_probabilities_match_scipy_including_push_lines(line):
+    expected = np.array([4.0, 9.5, 14.0])
+    p_over, p_under = poisson_over_under(expected, [line])
+
+    np.testing.assert_allclose(p_over[:, 0], poisson.sf(np.floor(line), expected))
+    np.testing.assert_allclose(p_under[:, 0], poisson.cdf(np.ceil(line) - 1, expected))
+    push = poisson.pmf(line, expected) if float(line).is_integer() else 0.0
+    np.testing.assert_allclose(p_over[:, 0] + p_under[:, 0] + push, 1.0)
+
+
+def test_one_row_per_match_market_and_line():
+    predictions = pd.DataFrame([_prediction("1", 5.0).__dict__, _prediction("2", 15.0).__dict__])
+    lines = {"corners": [8.5, 9.5, 10.5], "cards": [3.5]}
+    signals = derive_signals(predictions, lines)
+
+    assert len(signals) == 2 * 4
+    corners = signals[signals["market"] == "corners"].set_index(["match_id", "line"])
+    assert corners.loc[("1", 9.5), "suggestion"] == "under"
+    assert corners.loc[("2", 9.5), "suggestion"] == "over"
+    assert set(signals["market"]) <= set(MARKETS)
+
+
+def test_single_match_signal_agrees_with_bulk():
+    pred = _prediction("1", 9.4)
+    bulk = derive_signals(pd.DataFrame([pred.__dict__]), {"corners": [9.5]}).iloc[0]
+    signal = derive_corners_signal(pred, 9.5)
+
+    assert signal.suggestion == bulk["suggestion"] == "none"
+    assert signal.market == "Total Cantos 9.5"
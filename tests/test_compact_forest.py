@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.models.artifact_store import ArtifactStore
+from src.models.compact_forest import SKLEARN_MIN_ROWS, CompactForest
+
+
+@pytest.fixture
+def forest():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(600, 6)), columns=[f"f{i}" for i in range(6)])
+    X.iloc[::20, 2] = np.nan
+    y = 3 * X["f0"].fillna(0) + rng.poisson(5, len(X))
+    return RandomForestRegressor(n_estimators=20, random_state=0).fit(X, y), X, y
+
+
+@pytest.mark.parametrize("n_rows", [1, 50, SKLEARN_MIN_ROWS + 100])
+def test_predictions_match_sklearn(forest, n_rows):
+    rf, X, _ = forest
+    X_new = X.sample(n_rows, replace=True, random_state=1)
+
+    compact = CompactForest.from_forest(rf)
+    # Só a precisão float32 dos valores das folhas muda
+    np.testing.assert_allclose(compact.predict(X_new), rf.predict(X_new), rtol=1e-6)
+
+
+def test_round_trips_through_the_artifact_store(forest, tmp_path):
+    rf, X, _ = forest
+    store = ArtifactStore(tmp_path)
+    store.save(rf, "shots_home")
+
+    loaded = store.load("shots_home")
+    assert store.entry("shots_home")["format"] == "forest"
+    assert list(loaded.feature_names_in_) == list(X.columns)
+    np.testing.assert_allclose(loaded.predict(X[:10]), rf.predict(X[:10]), rtol=1e-6)
+
+
+def test_grow_appends_trees_like_warm_start(forest):
+    rf, X, y = forest
+    compact = CompactForest.from_forest(rf).grow(X[:100], y[:100], 5)
+
+    assert compact.n_estimators == 25
+    # A média das 25 árvores = (20 antigas + 5 novas) / 25
+    new = CompactForest.from_forest(RandomForestRegressor(n_estimators=5, random_state=20).fit(X[:100], y[:100]))
+    expected = (20 * rf.predict(X[:10]) + 5 * new.predict(X[:10])) / 25
+    np.testing.assert_allclose(compact.predict(X[:10]), expected, rtol=1e-6)
+    np.testing.assert_allclose(compact.predict(X), compact.to_forest().predict(X), rtol=1e-6)
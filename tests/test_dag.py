@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+
+from src.pipeline.dag import PipelineRunner, Stage, dependencies
+
+
+# Etapas de teste (importadas pelo processo do pool como "tests.test_dag:<função>")
+
+def count_lines(source: str, target: str):
+    """Escreve o nº de linhas de `source`: conteúdos diferentes podem dar o mesmo output."""
+    Path(target).write_text(str(len(Path(source).read_text().splitlines())))
+
+
+def fail(**kwargs):
+    raise RuntimeError("etapa partida")
+
+
+@pytest.fixture
+def files(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("a\nb\n")
+    return source, tmp_path / "count.txt", tmp_path / "copy.txt"
+
+
+def _stages(source, count, copy, first_target="tests.test_dag:count_lines"):
+    return [
+        Stage("count", first_target, inputs=[source], outputs=[count],
+              kwargs={"source": str(source), "target": str(count)}),
+        Stage("copy", "tests.test_dag:count_lines", inputs=[count], outputs=[copy],
+              kwargs={"source": str(count), "target": str(copy)}),
+    ]
+
+
+def _run(stages, tmp_path, **kwargs):
+    results = PipelineRunner(stages, state_dir=tmp_path / "state", max_workers=1).run(**kwargs)
+    return {r.name: r.status for r in results}
+
+
+def test_unchanged_inputs_are_skipped(files, tmp_path):
+    stages = _stages(*files)
+    assert _run(stages, tmp_path) == {"count": "ran", "copy": "ran"}
+    assert _run(stages, tmp_path) == {"count": "skipped", "copy": "skipped"}
+
+    # Conteúdo novo com o mesmo nº de linhas: count corre, mas o output não muda
+    files[0].write_text("cc\nd\n")
+    assert _run(stages, tmp_path) == {"count": "ran", "copy": "skipped"}
+
+    files[0].write_text("c\n")
+    assert _run(stages, tmp_path, dry_run=True) == {"count": "pending", "copy": "pending"}
+    assert _run(stages, tmp_path) == {"count": "ran", "copy": "ran"}
+    assert _run(stages, tmp_path, force=["copy"]) == {"count": "skipped", "copy": "ran"}
+
+
+def test_missing_outputs_rerun_and_failures_block_downstream(files, tmp_path):
+    source, count, copy = files
+    _run(_stages(*files), tmp_path)
+
+    copy.unlink()
+    assert _run(_stages(*files), tmp_path) == {"count": "skipped", "copy": "ran"}
+
+    source.write_text("x\n")
+    assert _run(_stages(*files, first_target="tests.test_dag:fail"), tmp_path) == {
+        "count": "failed", "copy": "blocked",
+    }
+
+
+def test_dependencies_come_from_outputs_and_cycles_are_rejected(files):
+    assert dependencies(_stages(*files)) == {"count": [], "copy": ["count"]}
+
+    a, b = Path("a"), Path("b")
+    with pytest.raises(ValueError):
+        dependencies([Stage("x", "m:f", inputs=[a], outputs=[b]), Stage("y", "m:f", inputs=[b], outputs=[a])])
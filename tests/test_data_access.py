@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("streamlit")
+
+from app import data_access  # noqa: E402
+from src.utils.io import write_table  # noqa: E402
+
+from tests.conftest import make_matches  # noqa: E402
+
+
+def test_tables_are_cached_until_the_file_changes(tmp_path, monkeypatch):
+    matches = make_matches([("2024-01-01", "A", "B", 1, 0), ("2024-01-08", "B", "A", 2, 2)])
+    write_table(matches, tmp_path, "matches")
+
+    reads = []
+    read_table = data_access.read_table
+    monkeypatch.setattr(data_access, "read_table", lambda *a, **kw: reads.append(a) or read_table(*a, **kw))
+    data_access._load_table.clear()
+
+    assert len(data_access.load_table(tmp_path, "matches", columns=["match_id"])) == 2
+    assert len(data_access.load_table(tmp_path, "matches", columns=["match_id"])) == 2
+    assert len(reads) == 1
+
+    write_table(matches.iloc[:1], tmp_path, "matches")
+    assert len(data_access.load_table(tmp_path, "matches", columns=["match_id"])) == 1
+    assert len(reads) == 2
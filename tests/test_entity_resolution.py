@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from src.data_ingestion.entity_resolution import EntityResolver
+
+from tests.conftest import make_matches
+
+TEAMS = ["Sporting CP", "SC Braga", "FC Porto", "Vitória SC", "Estrela da Amadora", "Casa Pia"]
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    return EntityResolver(TEAMS, cache_path=tmp_path / "entities.json")
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Sporting", "Sporting CP"),               # alias
+    ("Sporting Braga", "SC Braga"),            # alias
+    ("Vitória de Guimarães", "Vitória SC"),    # alias com acentos
+    ("FC Porto ", "FC Porto"),                 # normalização
+    ("Casa Pia AC", "Casa Pia"),               # aproximado (stopwords)
+    ("FC Porto B", None),                      # equipa B não é a principal
+    ("Vitória Setúbal", None),                 # palavras a mais: outra equipa
+    ("Benfica", None),                         # não está em data/raw/matches
+])
+def test_team_names(resolver, name, expected):
+    assert resolver.resolve_team(name, "sofascore") == expected
+
+
+def test_ambiguous_names_are_not_resolved(tmp_path):
+    # "sporting" está contido nos dois nomes canónicos com a mesma semelhança
+    resolver = EntityResolver(["Sporting CP", "Sporting Braga"], cache_path=tmp_path / "e.json")
+    assert resolver.resolve_team("Sporting Club", "x") is None
+    assert ("x", "Sporting Club") in resolver.missing["teams"]
+
+
+def test_rejected_cache_entries_are_resolved_again(resolver, tmp_path):
+    path = tmp_path / "entities.json"
+    path.write_text(json.dumps({"teams": {"sofascore": {"FC Porto B": "FC Porto", "Porto": "FC Porto"}}}))
+    resolver = EntityResolver(TEAMS, cache_path=path)
+
+    assert resolver.resolve_team("Porto", "sofascore") == "FC Porto"
+    assert resolver.resolve_team("FC Porto B", "sofascore") is None
+
+    resolver.save()
+    assert json.loads(path.read_text())["teams"]["sofascore"] == {"Porto": "FC Porto"}
+
+
+def test_stat_keys_from_both_sources(resolver):
+    flash = resolver.canonical_stats({"Cantos": {"home": 5}, "Remates à baliza": {"home": 3}}, "flashscore")
+    sofa = resolver.canonical_stats({"Corner kicks": {"home": 5}, "Shots off target": {"home": 2},
+                                     "Desconhecida": {"home": 1}}, "sofascore")
+    assert flash == {"corners": {"home": 5}, "shots_on_target": {"home": 3}}
+    assert sofa == {"corners": {"home": 5}, "shots_off_target": {"home": 2}}
+    assert resolver.report()["stats"] == ["sofascore: Desconhecida"]
+
+
+def test_fixtures_match_by_teams_and_nearest_date(resolver):
+    matches = make_matches([
+        ("2024-01-01", "Sporting CP", "FC Porto", 1, 0),
+        ("2024-04-01", "Sporting CP", "FC Porto", None, None),
+        ("2024-02-01", "SC Braga", "Casa Pia", None, None),
+    ])
+    fixtures = [
+        {"id": 10, "home_team": "Sporting", "away_team": "Porto", "date": "2024-04-02"},
+        {"id": 11, "home_team": "Sporting", "away_team": "Porto"},      # sem data: próximo por jogar
+        {"id": 12, "home_team": "Braga", "away_team": "Casa Pia", "date": "2024-03-15"},  # fora da tolerância
+    ]
+    assert resolver.match_fixtures(fixtures, matches, "sofascore", "id", tolerance_days=3) == ["2", "2", None]
+    assert resolver.report()["fixtures"] == ["sofascore: 12"]
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from src.features.feature_builder import FeatureBuilder
+
+from tests.conftest import make_season, make_stats
+
+
+@pytest.fixture
+def raw():
+    matches = make_season(n_teams=6, n_rounds=8)
+    return matches, make_stats(matches)
+
+
+def _features(raw, tmp_path, engine: str, **kwargs) -> pd.DataFrame:
+    builder = FeatureBuilder(*raw, engine=engine, processed_dir=tmp_path)
+    return builder.build_features(builder.df, **kwargs).drop(columns="extra")
+
+
+def test_vectorized_engine_matches_iterrows(raw, tmp_path):
+    pd.testing.assert_frame_equal(
+        _features(raw, tmp_path, "vectorized"),
+        _features(raw, tmp_path, "iterrows"),
+        check_dtype=False,
+    )
+
+
+def test_unknown_engine_is_rejected(raw, tmp_path):
+    with pytest.raises(ValueError):
+        FeatureBuilder(*raw, engine="numba", processed_dir=tmp_path)
+
+
+def test_point_in_time_engines_match(raw, tmp_path):
+    pd.testing.assert_frame_equal(
+        _features(raw, tmp_path, "vectorized", point_in_time=True),
+        _features(raw, tmp_path, "iterrows", point_in_time=True),
+        check_dtype=False,
+    )
+
+
+def test_point_in_time_ignores_later_and_same_day_matches(raw, tmp_path):
+    matches, stats = raw
+    before = _features(raw, tmp_path, "vectorized", point_in_time=True)
+
+    # Alterar resultados e stats da última jornada não muda nenhuma linha,
+    # nem as da própria jornada (jogos do mesmo dia não entram)
+    last = matches["round_number"] == matches["round_number"].max()
+    changed = matches.copy()
+    changed.loc[last, ["home_score", "away_score"]] = [9, 0]
+    changed_stats = stats.copy()
+    changed_stats.loc[changed_stats["match_id"].isin(matches.loc[last, "match_id"]), "corners_home"] = 99
+    after = _features((changed, changed_stats), tmp_path, "vectorized", point_in_time=True)
+
+    pd.testing.assert_frame_equal(before, after)
+
+    # A primeira jornada não tem histórico
+    first = (matches["round_number"] == 1).to_numpy()
+    assert (before.loc[first, ["home_avg_shots", "away_form_last5"]] == 0.0).all().all()
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from src.features.feature_builder import FeatureBuilder, merge_match_frames
+from src.features.feature_store import FeatureStore
+from src.utils.io import read_table
+
+from tests.conftest import make_season, make_stats
+
+
+@pytest.fixture
+def raw():
+    matches = make_season(n_teams=8, n_rounds=6)
+    return matches, make_stats(matches)
+
+
+@pytest.fixture
+def season(raw):
+    return merge_match_frames(*raw)
+
+
+def _table(processed_dir) -> pd.DataFrame:
+    df = read_table(processed_dir, "features_train").drop(columns="extra")
+    return df.sort_values("match_id").reset_index(drop=True)
+
+
+def _full(season, processed_dir) -> pd.DataFrame:
+    FeatureStore(processed_dir).update(season)
+    return _table(processed_dir)
+
+
+def test_incremental_days_in_parts_match_full_rebuild(season, tmp_path):
+    full = _full(season, tmp_path / "full")
+
+    # Cada jornada chega em duas partes com a mesma data (ex.: jogo de segunda-feira)
+    for _, day in season.groupby("round_number"):
+        for part in (day.iloc[:1], day.iloc[1:]):
+            seen = season[season["round_number"] < day["round_number"].iat[0]]
+            FeatureStore(tmp_path / "inc").update(pd.concat([seen, day.loc[:part.index[-1]]]))
+
+    pd.testing.assert_frame_equal(_table(tmp_path / "inc"), full)
+
+
+def test_same_day_addition_does_not_rebuild(season, tmp_path, monkeypatch):
+    first_day = season[season["round_number"] == 1]
+    FeatureStore(tmp_path).update(first_day.iloc[:2])
+
+    store = FeatureStore(tmp_path)
+    monkeypatch.setattr(store, "reset", lambda: pytest.fail("reconstrução desnecessária"))
+    assert len(store.update(first_day)) == len(first_day) - 2
+
+
+def test_earlier_match_rebuilds_to_the_same_result(season, tmp_path):
+    full = _full(season, tmp_path / "full")
+
+    late = season["round_number"] == 3
+    FeatureStore(tmp_path / "inc").update(season[~late])
+    FeatureStore(tmp_path / "inc").update(season)
+
+    pd.testing.assert_frame_equal(_table(tmp_path / "inc"), full)
+
+
+def test_store_matches_point_in_time_feature_builder(raw, season, tmp_path):
+    full = _full(season, tmp_path / "full")
+
+    matches, stats = raw
+    builder = FeatureBuilder(matches, stats, processed_dir=tmp_path)
+    expected = builder.build_features(matches, point_in_time=True).drop(columns="extra")
+    expected = expected.sort_values("match_id").reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(full, expected, check_dtype=False)
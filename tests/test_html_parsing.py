@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from src.data_ingestion.html_parsing import extract_next_data, parse_stat_rows
+
+STATS_HTML = """
+<html><body>
+  <div class="stat__row">
+    <div class="stat__homeValue">5</div>
+    <div class="stat__category">Cantos</div>
+    <div class="stat__awayValue">3</div>
+  </div>
+  <div class="stat__row extra">
+    <div class="stat__homeValue">12</div>
+    <div class="stat__category">Remates totais</div>
+    <div class="stat__awayValue">9</div>
+  </div>
+  <div class="stat__row"><div class="stat__category">Sem valores</div></div>
+  <div class="stat__rowx"><div class="stat__category">Outra classe</div></div>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("parser", ["lxml", "html.parser"])
+def test_stat_rows_are_the_same_with_both_backends(parser):
+    assert parse_stat_rows(STATS_HTML, parser) == [("Cantos", "5", "3"), ("Remates totais", "12", "9")]
+
+
+@pytest.mark.parametrize("attrs", ['id="__NEXT_DATA__" type="application/json"', "type='application/json' id='__NEXT_DATA__'"])
+def test_next_data_is_extracted(attrs):
+    payload = {"props": {"pageProps": {"event": {"id": 1}}}}
+    html = f"<html><head><script {attrs}>{json.dumps(payload)}</script></head></html>"
+    assert extract_next_data(html) == payload
+
+
+def test_missing_or_invalid_next_data():
+    assert extract_next_data("<html><body>nada</body></html>") is None
+    assert extract_next_data('<script id="__NEXT_DATA__">{invalido</script>') is None
@@ -0,0 +1,79 @@
+import pytest
+import requests
+
+from src.data_ingestion.http_cache import ResponseCache
+from src.data_ingestion.http_client import HttpClient
+
+URL = "https://example.com/jogo/1/"
+
+
+def _response(status: int, body: bytes = b"", headers=None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.headers.update(headers or {})
+    resp.encoding = "utf-8"
+    return resp
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """HttpClient com cache em disco; os pedidos enviados ficam em client.sent."""
+    client = HttpClient(cache=ResponseCache(tmp_path), requests_per_second=None)
+    client.sent = []
+    client.replies = []
+
+    def _fetch(url, headers, **kwargs):
+        client.sent.append(headers)
+        return client.replies.pop(0)
+
+    monkeypatch.setattr(client, "_fetch", _fetch)
+    return client
+
+
+def test_fresh_entries_are_served_without_requests(client):
+    client.replies = [_response(200, b"v1", {"ETag": '"1"'})]
+    assert client.get(URL, ttl=60).content == b"v1"
+    assert client.get(URL, ttl=60).content == b"v1"
+    assert len(client.sent) == 1
+
+
+def test_stale_entries_are_revalidated(client):
+    client.replies = [_response(200, b"v1", {"ETag": '"1"'}), _response(304)]
+    client.get(URL, ttl=0)
+
+    resp = client.get(URL, ttl=0)
+    assert client.sent[1]["If-None-Match"] == '"1"'
+    assert resp.status_code == 200 and resp.content == b"v1"
+
+    # Conteúdo novo substitui a entrada
+    client.replies = [_response(200, b"v2", {"ETag": '"2"'})]
+    assert client.get(URL, ttl=0).content == b"v2"
+    assert client.cache.get(URL).body == b"v2"
+
+
+def test_errors_are_not_cached(client):
+    client.replies = [_response(500), _response(200, b"ok")]
+    assert client.get(URL, ttl=60).status_code == 500
+    assert client.get(URL, ttl=60).content == b"ok"
+
+
+def test_offline_mode_uses_only_the_cache(client):
+    client.replies = [_response(200, b"v1")]
+    client.get(URL, ttl=0)
+
+    client.offline = True
+    assert client.get(URL, ttl=0).content == b"v1"
+    with pytest.raises(LookupError):
+        client.get(URL + "outro", ttl=0)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=10)
+    cache.put("a", b"12345", {}, None, float("inf"))
+    cache.put("b", b"12345", {}, None, float("inf"))
+    cache.get("a")
+    cache.put("c", b"12345", {}, None, float("inf"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"12345" and cache.get("c").body == b"12345"
@@ -0,0 +1,106 @@
+import json
+import multiprocessing
+import threading
+
+from src.data_ingestion.http_cache import ResponseCache
+from src.data_ingestion.http_client import HttpClient, fetch_concurrently
+
+
+class _Session:
+    """Conta os close() de cada sessão."""
+
+    def __init__(self, sessions):
+        self.closed = False
+        sessions.append(self)
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _track_sessions(monkeypatch):
+    sessions = []
+    monkeypatch.setattr("src.data_ingestion.http_client.requests.Session", lambda: _Session(sessions))
+    return sessions
+
+
+def test_pool_sessions_are_closed_when_pool_finishes(monkeypatch):
+    sessions = _track_sessions(monkeypatch)
+    http = HttpClient()
+    barrier = threading.Barrier(3)
+
+    def _work(item):
+        http._session()
+        barrier.wait()  # garante uma sessão por thread
+        return item
+
+    assert [r for _, r in fetch_concurrently(_work, range(3), max_workers=3, http=http)] == [0, 1, 2]
+    assert len(sessions) == 3
+    assert all(s.closed for s in sessions)
+
+
+def test_close_closes_live_sessions_and_client_stays_usable(monkeypatch):
+    sessions = _track_sessions(monkeypatch)
+    with HttpClient() as http:
+        first = http._session()
+        assert http._session() is first
+    assert first.closed
+
+    second = http._session()
+    assert second is not first and not second.closed
+
+
+def _put_many(cache_dir, tag, n):
+    cache = ResponseCache(cache_dir)
+    for i in range(n):
+        cache.put("http://x/shared", f"{tag}-{i}".encode() * 2000, {"ETag": f"{tag}-{i}"}, "utf-8", float("inf"))
+
+
+def test_cache_entries_stay_consistent_across_processes(tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    writers = [ctx.Process(target=_put_many, args=(tmp_path, tag, 50)) for tag in ("a", "b")]
+    for w in writers:
+        w.start()
+    for w in writers:
+        w.join()
+        assert w.exitcode == 0
+
+    # Sem temporários por limpar, e o par corpo/metadados nunca misturado
+    assert not list(tmp_path.glob("*/.*.tmp"))
+    entry = ResponseCache(tmp_path).get("http://x/shared")
+    if entry is not None:
+        assert entry.body == entry.headers["ETag"].encode() * 2000
+
+
+def test_cache_sees_entries_from_other_process_and_rejects_mismatch(tmp_path):
+    reader = ResponseCache(tmp_path)
+    writer = ResponseCache(tmp_path)
+    writer.put("http://x/a", b"corpo", {"ETag": "1"}, "utf-8", float("inf"))
+
+    # Criado antes da escrita: a entrada não estava no índice
+    assert reader.get("http://x/a").body == b"corpo"
+    assert reader._total == len(b"corpo")
+
+    # Corpo de outra escrita: conta como falha
+    body_path, meta_path = reader._paths(reader.key("http://x/a"))
+    body_path.write_bytes(b"outro")
+    assert reader.get("http://x/a") is None
+
+    # Removida por outro processo: sai do índice
+    body_path.unlink()
+    assert reader.get("http://x/a") is None
+    assert reader._total == 0
+    assert json.loads(meta_path.read_text())["sha256"]
+
+
+def test_fetch_concurrently_keeps_order_and_isolates_failures():
+    def _work(i):
+        if i == 3:
+            raise ValueError("falhou")
+        return i * 10
+
+    for workers in (1, 4):
+        results = fetch_concurrently(_work, range(6), max_workers=workers)
+        assert results == [(0, 0), (1, 10), (2, 20), (4, 40), (5, 50)]
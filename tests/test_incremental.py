@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.config.settings import INCREMENTAL_TREES_PER_UPDATE
+from src.features.feature_builder import FeatureBuilder
+from src.models import incremental
+from src.models.artifact_store import ArtifactStore
+from src.models.model_specs import design_matrix
+from src.models.train_pipeline import train_all_models
+
+from tests.conftest import FAST_SPECS, make_season, make_stats
+
+
+@pytest.fixture
+def features_train(tmp_path):
+    matches = make_season(n_teams=8, n_rounds=10)
+    builder = FeatureBuilder(matches, make_stats(matches), processed_dir=tmp_path / "processed")
+    df = builder.build_features(builder.df, point_in_time=True)
+    df["round_number"] = matches["round_number"].to_numpy()
+    return df
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ArtifactStore(tmp_path / "artifacts")
+    monkeypatch.setattr(incremental, "get_store", lambda: store)
+    return store
+
+
+def _update(monkeypatch, df, **kwargs):
+    monkeypatch.setattr(incremental, "read_table", lambda *args, **kw: df.drop(columns="round_number"))
+    incremental.update_models(specs=FAST_SPECS, **kwargs)
+
+
+def test_new_round_updates_models_incrementally(features_train, store, monkeypatch):
+    first = features_train[features_train["round_number"] <= 8].drop(columns="round_number")
+    train_all_models(n_jobs=1, specs=FAST_SPECS, mode="per_target", features_train=first,
+                     artifacts_dir=store.artifacts_dir)
+
+    _update(monkeypatch, features_train)
+    shots = store.load("shots_home")
+    assert shots.n_estimators == 5 + INCREMENTAL_TREES_PER_UPDATE
+    for spec in FAST_SPECS:
+        training = store.entry(spec.name)["training"]
+        assert training["updates_since_full"] == 1
+        assert len(training["match_ids"]) == len(features_train)
+
+    # GLM: o warm start converge para o mesmo fit que um treino de raiz
+    spec = next(s for s in FAST_SPECS if s.name == "corners_home")
+    X, y = design_matrix(features_train.drop(columns="round_number"), spec)
+    model = store.load("corners_home")
+    X = X[list(model.feature_names_in_)]
+    np.testing.assert_allclose(model.predict(X), spec.make_model(1).fit(X, y).predict(X), rtol=1e-3)
+
+    # Sem jogos novos nada muda
+    saved_at = store.entry("shots_home")["saved_at"]
+    _update(monkeypatch, features_train)
+    assert store.load("shots_home").n_estimators == shots.n_estimators
+    assert store.entry("shots_home")["saved_at"] == saved_at
+
+
+def test_full_refit_after_configured_number_of_updates(features_train, store, monkeypatch):
+    rounds = features_train["round_number"]
+    train_all_models(n_jobs=1, specs=FAST_SPECS, mode="per_target",
+                     features_train=features_train[rounds <= 8].drop(columns="round_number"),
+                     artifacts_dir=store.artifacts_dir)
+
+    _update(monkeypatch, features_train[rounds <= 9], full_refit_every=2)
+    _update(monkeypatch, features_train, full_refit_every=2)
+
+    assert store.load("shots_home").n_estimators == 5
+    assert store.entry("shots_home")["training"]["updates_since_full"] == 0
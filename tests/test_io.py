@@ -0,0 +1,110 @@
+import pandas as pd
+import pytest
+
+from src.utils import io
+from src.utils.io import append_table, parquet_path, read_table, read_table_page, table_version, write_table
+
+from tests.conftest import make_matches
+
+
+@pytest.fixture
+def matches() -> pd.DataFrame:
+    return pd.concat([
+        make_matches([("2023-01-01", "A", "B", 1, 0), ("2023-01-08", "B", "A", None, None)], "2022/2023"),
+        make_matches([("2024-01-01", "A", "C", 2, 2)], "2023/2024"),
+    ], ignore_index=True)
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(["season", "match_id"]).reset_index(drop=True)
+
+
+def test_parquet_and_csv_round_trip_with_same_dtypes(matches, tmp_path, monkeypatch):
+    write_table(matches, tmp_path, "matches")
+    from_parquet = read_table(tmp_path, "matches")
+
+    monkeypatch.setattr(io, "pq", None)
+    from_csv = read_table(tmp_path, "matches")
+
+    expected = io._with_dtypes(matches, "matches")
+    pd.testing.assert_frame_equal(_sorted(from_parquet[expected.columns]), _sorted(expected))
+    pd.testing.assert_frame_equal(_sorted(from_csv[expected.columns]), _sorted(expected))
+    assert from_parquet["home_score"].isna().sum() == 1
+
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_columns_and_filters(matches, tmp_path, monkeypatch, parquet):
+    write_table(matches, tmp_path, "matches")
+    if not parquet:
+        monkeypatch.setattr(io, "pq", None)
+
+    df = read_table(tmp_path, "matches", columns=["match_id", "home_team"], filters=[("season", "==", "2022/2023")])
+    assert list(df.columns) == ["match_id", "home_team"]
+    assert sorted(df["home_team"]) == ["A", "B"]
+
+
+def test_append_adds_rows_and_changes_version(matches, tmp_path):
+    write_table(matches.iloc[:2], tmp_path, "matches")
+    before = table_version(tmp_path, "matches")
+
+    # Tabela particionada por época: as linhas novas vão para a partição delas
+    append_table(matches.iloc[2:], tmp_path, "matches")
+    assert table_version(tmp_path, "matches") != before
+    df = read_table(tmp_path, "matches")
+    assert sorted(df["season"]) == ["2022/2023", "2022/2023", "2023/2024"]
+    assert len(read_table(tmp_path, "matches", filters=[("season", "==", "2023/2024")])) == 1
+
+
+def test_rewrite_swaps_versions_atomically(matches, tmp_path):
+    write_table(matches, tmp_path, "matches")
+    first = parquet_path(tmp_path, "matches").resolve()
+
+    write_table(matches.iloc[:1], tmp_path, "matches")
+    # A versão anterior continua legível durante o período de graça
+    assert parquet_path(tmp_path, "matches").resolve() != first
+    assert first.exists()
+    assert len(read_table(tmp_path, "matches")) == 1
+
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_table_version_changes_only_when_the_table_is_written(matches, tmp_path, monkeypatch, parquet):
+    if not parquet:
+        monkeypatch.setattr(io, "pq", None)
+    write_table(matches, tmp_path, "matches")
+    version = table_version(tmp_path, "matches")
+
+    read_table(tmp_path, "matches")
+    assert table_version(tmp_path, "matches") == version
+
+    write_table(matches, tmp_path, "matches")
+    assert table_version(tmp_path, "matches") != version
+
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_pages_are_filtered_and_counted(tmp_path, monkeypatch, parquet):
+    rows = [("2024-01-01", f"T{i % 4}", f"T{(i + 1) % 4}", i % 3, 0) for i in range(30)]
+    matches = pd.concat([make_matches(rows[:15], "2022/2023"), make_matches(rows[15:], "2023/2024")],
+                        ignore_index=True)
+    matches["match_id"] = [str(i) for i in range(30)]
+    write_table(matches, tmp_path, "matches")
+    if not parquet:
+        monkeypatch.setattr(io, "pq", None)
+        monkeypatch.setattr(io, "ds", None)
+
+    season = [("season", "==", "2023/2024")]
+    team = [("home_team", "==", "T1"), ("away_team", "==", "T1")]
+    expected = matches[(matches["season"] == "2023/2024")
+                       & ((matches["home_team"] == "T1") | (matches["away_team"] == "T1"))]
+
+    pages, offset = [], 0
+    while True:
+        page, total = read_table_page(tmp_path, "matches", columns=["match_id", "home_team"],
+                                      filters=season, any_of=team, offset=offset, limit=3)
+        assert total == len(expected)
+        if page.empty:
+            break
+        assert len(page) <= 3 and list(page.columns) == ["match_id", "home_team"]
+        pages.append(page)
+        offset += 3
+
+    assert sorted(pd.concat(pages)["match_id"]) == sorted(expected["match_id"])
@@ -0,0 +1,40 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import PoissonRegressor
+
+from src.models import model_specs, train_multi_output
+from src.models.multi_poisson import MultiOutputPoissonRegressor
+from src.models.train_multi_output import TARGET_FIELDS, make_multi_output_model
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, 5)), columns=[f"f{i}" for i in range(5)])
+    rates = np.exp(0.3 * X.to_numpy() @ rng.normal(size=(5, 3)) + np.log([2.0, 5.0, 10.0]))
+    return X, pd.DataFrame(rng.poisson(rates), columns=["a", "b", "c"])
+
+
+def test_single_fit_matches_one_poisson_regressor_per_target(data):
+    X, Y = data
+    alphas = [0.0, 0.1, 1.0]
+    model = MultiOutputPoissonRegressor(alpha=alphas, tol=1e-8).fit(X, Y)
+
+    for i, (target, alpha) in enumerate(zip(Y.columns, alphas)):
+        reference = PoissonRegressor(alpha=alpha, max_iter=1000, tol=1e-10).fit(X, Y[target])
+        np.testing.assert_allclose(model.coef_[i], reference.coef_, rtol=1e-5, atol=1e-7)
+        np.testing.assert_allclose(model.predict(X)[:, i], reference.predict(X), rtol=1e-6)
+
+
+def test_uses_tuned_params_per_family(tmp_path, monkeypatch):
+    path = tmp_path / "best_params.json"
+    path.write_text(json.dumps({"corners": {"params": {"alpha": 0.5}}, "cards": {"params": {"alpha": 2.0}}}))
+    monkeypatch.setattr(train_multi_output, "tuned_params", lambda family: model_specs.tuned_params(family, path))
+
+    alphas = dict(zip(TARGET_FIELDS, make_multi_output_model().alpha))
+    assert alphas["home_avg_corners"] == alphas["away_avg_corners"] == 0.5
+    assert alphas["home_avg_yellow_cards"] == 2.0
+    assert alphas["home_avg_shots"] == 0.1
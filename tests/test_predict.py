@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import PoissonRegressor
+
+from src.models import predict
+from src.models.artifact_store import ArtifactStore
+from src.models.predict import MODEL_FIELDS, ModelRegistry, generate_predictions, predict_batch, predict_match
+from src.models.simulation import simulate_matches
+from src.utils.io import read_table, write_table
+
+
+class ConstantModel:
+    def __init__(self, rate: float):
+        self.rate = rate
+
+    def predict(self, X):
+        return np.full(len(X), self.rate)
+
+
+class ConstantRegistry:
+    def get(self, name: str):
+        return ConstantModel(2.0 + list(MODEL_FIELDS).index(name))
+
+
+def test_intervals_and_tables_come_from_one_simulation(tmp_path, monkeypatch):
+    features = pd.DataFrame({
+        "match_id": ["1", "2"],
+        "home_team": ["A", "C"],
+        "away_team": ["B", "D"],
+        "home_avg_xg": [1.4, 0.8],
+        "away_avg_xg": [1.1, 1.6],
+    })
+    write_table(features, tmp_path, "features_next_round")
+
+    simulations = []
+
+    def recording_simulate(*args, **kwargs):
+        simulations.append(simulate_matches(*args, **kwargs))
+        return simulations[-1]
+
+    monkeypatch.setattr(predict, "simulate_matches", recording_simulate)
+    pred_df = generate_predictions(tmp_path, tmp_path, ConstantRegistry(), "per_target")
+
+    assert len(simulations) == 1
+    intervals = simulations[0].intervals
+    for row in pred_df.itertuples():
+        expected = intervals[intervals["match_id"] == row.match_id]
+        assert row.confidence_low == dict(zip(expected["stat"], expected["low"]))
+        assert row.confidence_high == dict(zip(expected["stat"], expected["high"]))
+
+    pd.testing.assert_frame_equal(read_table(tmp_path, "outcomes_next_round"), simulations[0].outcomes,
+                                  check_dtype=False)
+
+
+def _features(n: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "match_id": [str(i) for i in range(n)],
+        "home_team": [f"H{i}" for i in range(n)],
+        "away_team": [f"A{i}" for i in range(n)],
+        "home_avg_xg": rng.uniform(0.5, 2, n),
+        "away_avg_xg": rng.uniform(0.5, 2, n),
+    })
+
+
+def _save_models(artifacts_dir):
+    X = _features(40).drop(columns=["match_id", "home_team", "away_team"])
+    rng = np.random.default_rng(1)
+    store = ArtifactStore(artifacts_dir)
+    for name in MODEL_FIELDS:
+        store.save(PoissonRegressor().fit(X, rng.poisson(4, len(X))), name)
+
+
+def test_registry_reuses_models_until_the_file_changes(tmp_path):
+    _save_models(tmp_path)
+    registry = ModelRegistry(tmp_path)
+
+    model = registry.get("shots_home")
+    assert registry.get("shots_home") is model
+
+    path = registry.store.path("shots_home")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert registry.get("shots_home") is not model
+
+
+def test_predict_batch_matches_one_match_at_a_time(tmp_path):
+    _save_models(tmp_path)
+    registry = ModelRegistry(tmp_path)
+    features = _features()
+
+    batch = predict_batch(features, registry, mode="per_target")
+    single = [predict_match(row, registry) for _, row in features.iterrows()]
+    for b, s in zip(batch, single):
+        assert b.match_id == s.match_id
+        for field in MODEL_FIELDS.values():
+            assert np.isclose(getattr(b, field), getattr(s, field))
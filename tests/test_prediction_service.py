@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from src.features import feature_builder
+from src.models import prediction_service
+from src.models.prediction_service import PredictionService, parse_fixtures
+from src.utils.io import write_table
+
+from tests.conftest import make_stats
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, leak_matches):
+    write_table(leak_matches, tmp_path, "matches")
+    write_table(make_stats(leak_matches), tmp_path, "match_stats")
+    monkeypatch.setattr(prediction_service, "RAW_DIR", tmp_path)
+    monkeypatch.setattr(feature_builder, "RAW_DIR", tmp_path)
+    return PredictionService(registry=object())
+
+
+def test_form_ignores_unplayed_fixtures(service):
+    features = service._builder.build_features(
+        pd.DataFrame({"match_id": ["x"], "home_team": ["A"], "away_team": ["B"]})
+    )
+    # Só o jogo 1 (vitória) conta; os jogos por jogar não são derrotas
+    assert features["home_form_last5"].iloc[0] == 3.0
+    assert features["away_form_last5"].iloc[0] == 0.0
+
+
+def test_teams_come_from_played_matches(service):
+    assert service.teams == ["A", "B"]
+
+
+@pytest.mark.parametrize("payload", [[], {"fixtures": "A x B"}, {"fixtures": [{"home_team": "A"}]}])
+def test_parse_fixtures_rejects_bad_payloads(payload):
+    with pytest.raises(ValueError):
+        parse_fixtures(payload)
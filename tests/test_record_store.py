@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.domain.record_store import RecordStore
+from src.domain.schemas import TABLE_DTYPES, MatchInfo
+
+DTYPES = {"match_id": "string", "corners_home": "Int16", "corners_away": "Int16", "xg_home": "float32",
+          "xg_away": "float32"}
+
+
+def test_frame_has_table_dtypes_and_nulls_across_growth():
+    store = RecordStore(DTYPES, capacity=2)
+    for i in range(5):
+        store.append({"match_id": str(i), "corners_home": None if i == 3 else i, "corners_away": 2 * i,
+                      "xg_home": 0.5 * i, "xg_away": float("nan"), "ignored": "x"})
+
+    df = store.to_frame()
+    expected = pd.DataFrame({
+        "match_id": [str(i) for i in range(5)],
+        "corners_home": [0, 1, 2, None, 4],
+        "corners_away": [0, 2, 4, 6, 8],
+        "xg_home": [0.5 * i for i in range(5)],
+        "xg_away": [np.nan] * 5,
+    }).astype(DTYPES)
+    pd.testing.assert_frame_equal(df, expected)
+    assert store.mask("corners_home").tolist() == [False, False, False, True, False]
+
+
+def test_later_fields_override_and_dataclasses_are_accepted():
+    store = RecordStore(TABLE_DTYPES["matches"])
+    store.append(MatchInfo("1", "2023/2024", 1, "2024-01-01", "A", "B"), {"home_score": 2})
+
+    row = store.to_frame().iloc[0]
+    assert row["home_team"] == "A" and row["home_score"] == 2 and pd.isna(row["away_score"])
+
+
+def test_to_numpy_is_a_view_for_contiguous_columns():
+    store = RecordStore(DTYPES)
+    store.append({"match_id": "1", "xg_home": 1.5, "xg_away": 0.5, "corners_home": 3, "corners_away": None})
+
+    matrix = store.to_numpy(["xg_home", "xg_away"])
+    assert np.shares_memory(matrix, store.column("xg_home"))
+    assert matrix.dtype == np.float32 and matrix.tolist() == [[1.5, 0.5]]
+
+    # Int16 com nulos: float32 com NaN
+    assert np.isnan(store.to_numpy(["corners_home", "corners_away"])[0, 1])
+    with pytest.raises(ValueError):
+        store.to_numpy(["xg_home", "corners_home"])
+
+
+def test_unknown_dtypes_are_rejected():
+    with pytest.raises(ValueError):
+        RecordStore({"a": "int64"})
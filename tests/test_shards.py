@@ -0,0 +1,54 @@
+import pandas as pd
+
+from src.pipeline.shards import features_shard, make_shards, run_shards
+from src.utils.io import read_table, write_table
+
+from tests.conftest import make_matches, make_stats
+
+
+def _shards(tmp_path, seasons):
+    return make_shards({"Liga Teste": 1}, seasons, tmp_path)
+
+
+def _write_raw(shard, matches):
+    write_table(matches, shard.raw_dir, "matches")
+    write_table(make_stats(matches), shard.raw_dir, "match_stats")
+
+
+def test_unplayed_fixtures_do_not_count_as_losses(tmp_path, leak_matches):
+    [shard] = _shards(tmp_path, ["2023-2024"])
+    _write_raw(shard, leak_matches.assign(season=shard.season))
+
+    features_shard(shard, [shard], "per_target", 1)
+
+    train = read_table(shard.processed_dir, "features_train")
+    upcoming = read_table(shard.processed_dir, "features_next_round").set_index("match_id")
+    assert list(train["match_id"]) == ["1"]
+    assert list(upcoming.index) == ["2", "3"]
+    # A só tem a vitória do jogo 1; o jogo 2 (por jogar) não conta como derrota
+    assert upcoming.loc["3", "home_form_last5"] == 3.0
+    assert upcoming.loc["2", "away_form_last5"] == 3.0
+
+
+def test_history_comes_from_earlier_seasons_of_the_league(tmp_path):
+    previous, current = _shards(tmp_path, ["2022-2023", "2023-2024"])
+    _write_raw(previous, make_matches([("2023-05-01", "A", "B", 0, 1)], season=previous.season))
+    _write_raw(current, make_matches([("2023-09-01", "B", "A", None, None)], season=current.season))
+
+    features_shard(current, [previous, current], "per_target", 1)
+
+    upcoming = read_table(current.processed_dir, "features_next_round")
+    assert upcoming[["home_form_last5", "away_form_last5"]].iloc[0].tolist() == [3.0, 0.0]
+    assert not pd.isna(upcoming["home_avg_shots"].iloc[0])
+
+
+def test_failed_shards_stay_in_the_report(tmp_path, leak_matches):
+    broken = make_shards({"Sem Dados": 2}, ["2023-2024"], tmp_path)[0]
+    [shard] = _shards(tmp_path, ["2023-2024"])
+    _write_raw(shard, leak_matches.assign(season=shard.season))
+
+    report = run_shards([broken, shard], stages=["features"], max_workers=1)
+
+    assert list(report.index) == [broken.key, shard.key]
+    assert pd.isna(report.loc[broken.key, "features"])
+    assert report.loc[shard.key, "features"] >= 0
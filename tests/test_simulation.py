@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import poisson, skellam
+
+from src.domain.business_rules import poisson_over_under
+from src.models.simulation import simulate_matches
+
+
+def _predictions() -> pd.DataFrame:
+    return pd.DataFrame({
+        "match_id": ["1", "2", "3"],
+        "predicted_corners_home": [5.0, 3.0, np.nan],
+        "predicted_corners_away": [4.0, 6.0, 4.0],
+        "predicted_shots_home": [12.0, 9.0, 10.0],
+        "predicted_shots_away": [10.0, 14.0, 10.0],
+        "predicted_yellow_cards_home": [2.0, 1.5, 2.0],
+        "predicted_yellow_cards_away": [2.5, 2.0, 2.0],
+        "predicted_xg_home": [1.6, 0.8, 1.2],
+        "predicted_xg_away": [1.0, 1.4, 1.2],
+    })
+
+
+def test_probabilities_converge_to_poisson():
+    sim = simulate_matches(_predictions().iloc[:2], n_samples=200_000, lines={"corners": [8.5, 9.5]}, seed=0)
+
+    ou = sim.over_under.set_index(["match_id", "line"])
+    p_over, p_under = poisson_over_under(np.array([9.0, 9.0]), [8.5, 9.5])
+    np.testing.assert_allclose(ou["p_over"].to_numpy(), p_over.ravel(), atol=5e-3)
+    np.testing.assert_allclose(ou["p_under"].to_numpy(), p_under.ravel(), atol=5e-3)
+
+    outcomes = sim.outcomes.set_index("match_id")
+    np.testing.assert_allclose(outcomes.sum(axis=1), 1.0)
+    np.testing.assert_allclose(outcomes.loc["1", "p_home_win"], skellam.sf(0, 1.6, 1.0), atol=5e-3)
+
+    # Resultados exatos até max_goals: probabilidade de cada um ≈ produto das Poisson
+    scores = sim.scores[sim.scores["match_id"] == "1"].set_index(["home_goals", "away_goals"])["probability"]
+    assert abs(scores.loc[(1, 1)] - poisson.pmf(1, 1.6) * poisson.pmf(1, 1.0)) < 5e-3
+
+
+def test_intervals_cover_the_level_and_seed_is_reproducible():
+    first = simulate_matches(_predictions(), n_samples=20_000, level=0.8, seed=1)
+    second = simulate_matches(_predictions(), n_samples=20_000, level=0.8, seed=1)
+    pd.testing.assert_frame_equal(first.intervals, second.intervals)
+
+    total = first.intervals.set_index(["match_id", "stat"]).loc[("1", "shots_total")]
+    assert abs(total["low"] - poisson.ppf(0.1, 22.0)) <= 1
+    assert abs(total["high"] - poisson.ppf(0.9, 22.0)) <= 1
+
+    # Previsão em falta: intervalos e probabilidades ficam NaN só nesse mercado
+    missing = first.intervals[first.intervals["match_id"] == "3"].set_index("stat")
+    assert missing.loc["corners_total", ["low", "high"]].isna().all()
+    assert missing.loc["shots_total", ["low", "high"]].notna().all()
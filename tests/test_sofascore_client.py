@@ -0,0 +1,63 @@
+import json
+
+import pytest
+import requests
+
+from src.data_ingestion.sofascore_client import SofascoreClient
+
+
+def _response(status: int, body=None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body.encode() if isinstance(body, str) else json.dumps(body or {}).encode()
+    return resp
+
+
+class FakeHttp:
+    """Respostas por sufixo do URL; URLs sem resposta devolvem 404."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.urls = []
+
+    def get(self, url, headers=None, ttl=None):
+        self.urls.append(url)
+        for suffix, resp in self.responses.items():
+            if url.endswith(suffix):
+                return resp
+        return _response(404)
+
+
+def _event(event_id: int, finished: bool = True) -> dict:
+    return {
+        "id": event_id,
+        "startTimestamp": 1_700_000_000 + event_id,
+        "roundInfo": {"round": 1},
+        "homeTeam": {"name": "A"},
+        "awayTeam": {"name": "B"},
+        "homeScore": {"current": 1},
+        "awayScore": {"current": 0},
+        "status": {"type": "finished" if finished else "notstarted"},
+    }
+
+
+def test_pages_until_has_next_page_is_false_or_404():
+    http = FakeHttp({
+        "/events/last/0": _response(200, {"events": [_event(1)], "hasNextPage": True}),
+        "/events/last/1": _response(200, {"events": [_event(2)], "hasNextPage": False}),
+        "/events/next/0": _response(200, {"events": [_event(3, False)], "hasNextPage": True}),
+    })
+    client = SofascoreClient(http=http)
+
+    assert [e["id"] for e in client._events(1, 7, "last")] == [1, 2]
+    assert [e["id"] for e in client._events(1, 7, "next")] == [3]  # página 1 dá 404
+
+
+@pytest.mark.parametrize("failure", [_response(500), _response(200, "<html>bloqueado</html>")])
+def test_other_errors_are_raised_instead_of_truncating(failure):
+    http = FakeHttp({
+        "/events/last/0": _response(200, {"events": [_event(1)], "hasNextPage": True}),
+        "/events/last/1": failure,
+    })
+    with pytest.raises((requests.HTTPError, ValueError)):
+        SofascoreClient(http=http)._events(1, 7, "last")
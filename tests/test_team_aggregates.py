@@ -0,0 +1,37 @@
+import pytest
+
+from src.features.feature_builder import merge_match_frames
+from src.features.team_aggregates import build_team_season_aggregates
+
+from tests.conftest import make_matches, make_stats
+
+
+@pytest.fixture
+def table():
+    matches = make_matches([
+        ("2024-01-01", "A", "B", 2, 0),
+        ("2024-01-08", "B", "A", 1, 1),
+        ("2024-01-15", "A", "C", 0, 3),
+        ("2024-01-22", "C", "A", None, None),
+    ])
+    stats = make_stats(matches)
+    stats[["corners_home", "corners_away"]] = [[5, 1], [4, 6], [7, 2]]
+    return build_team_season_aggregates(merge_match_frames(matches, stats)).set_index(["team", "venue"])
+
+
+def test_splits_home_away_and_total(table):
+    home, away, total = (table.loc[("A", venue)] for venue in ("home", "away", "all"))
+    assert (home["matches"], away["matches"], total["matches"]) == (2, 1, 3)
+
+    # Em casa A teve 5 e 7 cantos (contra 1 e 2); fora teve 6 (contra 4)
+    assert (home["corners_for"], home["corners_against"]) == (6.0, 1.5)
+    assert (away["corners_for"], away["corners_against"]) == (6.0, 4.0)
+    assert total["corners_for"] == pytest.approx(6.0)
+    assert total["points"] == pytest.approx(4 / 3)
+
+
+def test_unplayed_matches_are_ignored(table):
+    # C só jogou (e ganhou) fora; o jogo em casa contra A ainda não se jogou
+    assert ("C", "home") not in table.index
+    assert table.loc[("C", "all"), "matches"] == 1
+    assert table.loc[("C", "all"), "points"] == 3.0
@@ -0,0 +1,54 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from src.features.feature_builder import FeatureBuilder
+from src.models.artifact_store import ArtifactStore
+from src.models.model_specs import design_matrix, feature_frame
+from src.models.train_pipeline import ALL_SPECS, shared_layout, train_all_models
+
+from tests.conftest import FAST_SPECS, make_season, make_stats
+
+
+@pytest.fixture(scope="module")
+def features_train(tmp_path_factory):
+    matches = make_season(n_teams=8, n_rounds=10)
+    builder = FeatureBuilder(matches, make_stats(matches), processed_dir=tmp_path_factory.mktemp("processed"))
+    return builder.build_features(builder.df, point_in_time=True)
+
+
+def test_shared_layout_windows_hold_each_models_columns(features_train):
+    columns = list(feature_frame(features_train).columns)
+    layout, windows = shared_layout(columns, ALL_SPECS)
+
+    assert sorted(set(layout)) == sorted(columns)
+    for spec in ALL_SPECS:
+        start, end = windows[spec.name]  # grupos disjuntos: blocos contíguos
+        X, _ = design_matrix(features_train, spec)
+        assert sorted(layout[start:end]) == sorted(X.columns)
+
+
+def test_shared_layout_falls_back_to_positions_for_overlapping_groups():
+    columns = ["a", "b", "c", "d"]
+    specs = [dataclasses.replace(ALL_SPECS[0], name="x", drop_columns=["a", "b"]),
+             dataclasses.replace(ALL_SPECS[0], name="y", drop_columns=["b", "c"])]
+    layout, windows = shared_layout(columns, specs)
+    assert layout == columns
+    assert windows == {"x": [2, 3], "y": [0, 3]}
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_parallel_training_matches_sequential_fits(features_train, tmp_path, n_jobs):
+    train_all_models(n_jobs=n_jobs, specs=FAST_SPECS, mode="per_target",
+                     features_train=features_train, artifacts_dir=tmp_path)
+
+    store = ArtifactStore(tmp_path)
+    for spec in FAST_SPECS:
+        model = store.load(spec.name)
+        X, y = design_matrix(features_train, spec)
+        # Mesma ordem de colunas da matriz partilhada (a floresta depende dela)
+        X = X[list(model.feature_names_in_)]
+        expected = spec.make_model(1).fit(X, y).predict(X)
+        np.testing.assert_allclose(model.predict(X), expected, rtol=1e-5)
+        assert store.entry(spec.name)["training"]["updates_since_full"] == 0
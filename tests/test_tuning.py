@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.feature_builder import FeatureBuilder
+from src.models import tuning
+from src.models.tuning import FAMILIES, build_feature_cache, save_best_params, search_family, time_series_folds
+
+from tests.conftest import make_season, make_stats
+
+
+@pytest.fixture
+def frame(tmp_path, monkeypatch):
+    """Frame do backtest (features point-in-time + AUX_COLUMNS), com a pasta de tuning em tmp_path."""
+    monkeypatch.setattr(tuning, "TUNING_DIR", tmp_path / "tuning")
+    matches = make_season(n_teams=8, n_rounds=12)
+    builder = FeatureBuilder(matches, make_stats(matches), processed_dir=tmp_path / "processed")
+    df = builder.build_features(builder.df, point_in_time=True)
+    df["season"] = matches["season"].to_numpy()
+    df["round_number"] = matches["round_number"].to_numpy()
+    df["kickoff"] = pd.to_datetime(matches["date"]).to_numpy()
+    df["actual_corners"] = (builder.df["corners_home"] + builder.df["corners_away"]).to_numpy()
+    return df
+
+
+def test_folds_grow_and_never_split_a_day():
+    kickoff = pd.Series(pd.to_datetime(np.repeat(pd.date_range("2024-01-01", periods=10, freq="D"), 3)))
+    folds = time_series_folds(kickoff, n_splits=3)
+
+    assert len(folds) == 3
+    assert all(a[0] < b[0] for a, b in zip(folds, folds[1:]))
+    for train_end, test_end in folds:
+        assert train_end % 3 == 0 and test_end % 3 == 0
+        assert kickoff[train_end - 1] < kickoff[train_end]
+
+
+def test_budgets_grow_by_eta_up_to_the_maximum():
+    assert tuning._budgets(FAMILIES["corners"], eta=3) == [33, 100, 300]
+
+
+def test_halving_keeps_best_third_and_resumes_from_journal(frame, tmp_path):
+    cache_path = build_feature_cache(n_splits=2, df=frame)
+    assert build_feature_cache(n_splits=2, df=frame) == cache_path
+
+    family = FAMILIES["corners"]
+    results = search_family(family, cache_path, n_candidates=9, eta=3, n_jobs=1)
+    assert results.groupby("rung").size().tolist() == [9, 3, 1]
+    # Quem passa à ronda seguinte são os melhores da ronda anterior
+    first = results[results["rung"] == 0].sort_values("mae", kind="stable")
+    assert [p for p in results[results["rung"] == 1]["params"]] == list(first["params"][:3])
+
+    journal = tmp_path / "tuning" / "corners_trials.jsonl"
+    n_trials = len(journal.read_text().splitlines())
+    again = search_family(family, cache_path, n_candidates=9, eta=3, n_jobs=1)
+    assert len(journal.read_text().splitlines()) == n_trials
+    pd.testing.assert_frame_equal(again, results)
+
+    best = save_best_params(family, results, tmp_path / "best_params.json")
+    assert best["params"]["max_iter"] == 300
+    assert json.loads((tmp_path / "best_params.json").read_text())["corners"] == best
@@ -0,0 +1,79 @@
+from dataclasses import fields
+
+import pytest
+
+from src.data_ingestion import update_pipeline
+from src.data_ingestion.journal import IngestionJournal
+from src.domain.schemas import MatchInfo, MatchStats
+from src.utils.io import read_table
+
+
+class FakeClient:
+    """Três jogos terminados e um por jogar; os match_id em `failing` falham."""
+
+    failing = set()
+    requested = []
+
+    def __init__(self):
+        self.http = None
+        self.resolver = type("Resolver", (), {"report": lambda self: None})()
+
+    def get_matches_by_season(self, season, league_id):
+        return [
+            MatchInfo(str(i), season, 1, f"2024-01-0{i}", f"H{i}", f"A{i}", *((1, 0) if i < 4 else (None, None)))
+            for i in range(1, 5)
+        ]
+
+    def get_match_stats(self, match_id, finished=True):
+        FakeClient.requested.append(match_id)
+        if match_id in FakeClient.failing:
+            raise ConnectionError("timeout")
+        return MatchStats(**{f.name: int(match_id) for f in fields(MatchStats)})
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    monkeypatch.setattr(update_pipeline, "SofascoreClient", FakeClient)
+    FakeClient.failing = set()
+    FakeClient.requested = []
+    return FakeClient
+
+
+def _run(tmp_path, **kwargs):
+    update_pipeline.update_data_for_league(
+        1, max_workers=1, seasons=["2023/2024"],
+        raw_dir=tmp_path / "raw", processed_dir=tmp_path / "processed", **kwargs,
+    )
+
+
+def test_resume_fetches_only_missing_finished_matches(fake_client, tmp_path):
+    fake_client.failing = {"2"}
+    _run(tmp_path)
+    assert sorted(read_table(tmp_path / "raw", "match_stats")["match_id"]) == ["1", "3", "4"]
+
+    fake_client.failing = set()
+    fake_client.requested = []
+    _run(tmp_path)
+    # O jogo por jogar volta a ser pedido (as stats ainda mudam); os terminados não
+    assert sorted(fake_client.requested) == ["2", "4"]
+    stats = read_table(tmp_path / "raw", "match_stats")
+    assert sorted(stats["match_id"]) == ["1", "2", "3", "4"]
+    assert len(read_table(tmp_path / "raw", "matches")) == 4
+
+    fake_client.requested = []
+    _run(tmp_path, resume=False)
+    assert sorted(fake_client.requested) == ["1", "2", "3", "4"]
+
+
+def test_journal_skips_truncated_last_line_and_keeps_latest(tmp_path):
+    journal = IngestionJournal(tmp_path / "j.jsonl")
+    journal.append({"match_id": "1", "v": 1})
+    journal.append({"match_id": "1", "v": 2})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"match_id": "2", "v"')
+
+    assert journal.done_ids() == {"1"}
+    assert journal.to_frame().to_dict("records") == [{"match_id": "1", "v": 2}]
+
+    journal.compact()
+    assert journal.path.read_text(encoding="utf-8").count("\n") == 1